@@ -0,0 +1,77 @@
+"""
+Import-Time Benchmark
+Measures entry-point import cost with `python -X importtime` and guards against heavy eager imports
+
+Usage:
+    python bench_import_time.py                       # report for the scraper and scheduler
+    python bench_import_time.py --max-ms 400          # exit 1 if any module is slower (for CI)
+    python bench_import_time.py enhanced_news_scraper --top 20
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MODULES = ["enhanced_news_scraper", "news_scheduler"]
+
+# Backends that must only load on first use
+LAZY_BACKENDS = ["playwright", "yt_dlp", "newspaper", "snscrape", "fake_useragent", "bs4", "feedparser", "aiohttp"]
+
+def measure_import(module: str, env: Optional[Dict[str, str]] = None,
+                   cwd: str = SCRIPTS_DIR) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """Import module in a fresh interpreter; returns (total ms, [(name, self ms, cumulative ms)])"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    total = next((cumulative for name, _, cumulative in entries if name == module), 0.0)
+    return total, entries
+
+def eager_backends(entries: List[Tuple[str, float, float]]) -> List[str]:
+    """LAZY_BACKENDS that were imported along with the entry point"""
+    loaded = {name for name, _, _ in entries}
+    return [backend for backend in LAZY_BACKENDS if backend in loaded]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of scraper entry points")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="Show the slowest N imports by self time")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N fresh interpreters")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if an entry point takes longer")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        runs = [measure_import(module) for _ in range(args.repeat)]
+        total, entries = min(runs, key=lambda run: run[0])
+
+        print(f"{module}: {total:.1f} ms ({len(entries)} modules)")
+        for name, self_ms, cumulative_ms in sorted(entries, key=lambda entry: -entry[1])[:args.top]:
+            print(f"    {self_ms:8.1f} ms self  {cumulative_ms:8.1f} ms cumulative  {name}")
+
+        eager = eager_backends(entries)
+        if eager:
+            failures.append(f"{module} eagerly imports {', '.join(eager)}")
+        if args.max_ms is not None and total > args.max_ms:
+            failures.append(f"{module} took {total:.1f} ms (limit {args.max_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Media URL Matcher Benchmark
+Compares the media URL matcher with the previous per-pattern YouTube scan
+
+The legacy scan only finds YouTube links, so compare it with the YouTube-only
+row; the all-kinds row runs every pattern (YouTube, Vimeo, Twitter/X, CDN).
+
+Usage:
+    python bench_media_urls.py --corpus tests/fixtures/media_pages   # committed sample pages (*.html)
+    python bench_media_urls.py --corpus ./data/pages                 # your own recorded article pages
+    python bench_media_urls.py --synthetic 500                       # generated article-sized pages
+"""
+
+import os
+import re
+import glob
+import time
+import random
+import argparse
+from typing import List
+
+from media_urls import find_media_urls, find_media_urls_batch
+
+LEGACY_PATTERNS = [
+    r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
+    r'youtu\.be/([a-zA-Z0-9_-]+)',
+    r'youtube\.com/embed/([a-zA-Z0-9_-]+)'
+]
+
+def legacy_youtube_urls(text: str) -> List[str]:
+    """The previous extract_youtube_videos text scan, kept for comparison"""
+    youtube_urls = []
+    for pattern in LEGACY_PATTERNS:
+        for video_id in re.findall(pattern, text):
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            if url not in youtube_urls:
+                youtube_urls.append(url)
+    return youtube_urls[:3]
+
+def load_corpus(corpus_dir: str) -> List[str]:
+    documents = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "**", "*.htm*"), recursive=True)):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            documents.append(f.read())
+    return documents
+
+def synthetic_corpus(count: int, seed: int = 7) -> List[str]:
+    """Article-sized pages with a sprinkling of embeds and media links"""
+    rng = random.Random(seed)
+    filler = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "</p>\n"
+    embeds = [
+        '<iframe src="https://www.youtube.com/embed/{yt}?rel=0"></iframe>',
+        '<a href="https://youtu.be/{yt}">watch</a>',
+        '<iframe src="https://player.vimeo.com/video/{vimeo}"></iframe>',
+        '<a href="https://twitter.com/news/status/{tweet}/video/1">clip</a>',
+        '<video src="https://cdn.example.com/media/{tweet}.mp4"></video>',
+        '<img src="https://static.example.com/img/{tweet}.jpg">',
+    ]
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+    documents = []
+    for _ in range(count):
+        parts = [filler] * rng.randint(10, 40)
+        for _ in range(rng.randint(0, 6)):
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(embeds).format(
+                yt="".join(rng.choice(alphabet) for _ in range(11)),
+                vimeo=rng.randint(100000, 999999999),
+                tweet=rng.randint(10 ** 17, 10 ** 18)
+            ))
+        documents.append("".join(parts))
+    return documents
+
+def timed(label: str, func, documents: List[str], repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(documents)
+        best = min(best, time.perf_counter() - start)
+    size_mb = sum(len(document) for document in documents) / 1e6
+    print(f"{label:<40} {best * 1000:9.1f} ms  {size_mb / best:8.1f} MB/s")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark media URL extraction")
+    parser.add_argument("--corpus", default=None, help="Directory of recorded article pages")
+    parser.add_argument("--synthetic", type=int, default=300, help="Generated page count when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.synthetic)
+    if not documents:
+        parser.error(f"No pages found under {args.corpus}")
+    print(f"{len(documents)} documents, {sum(map(len, documents)) / 1e6:.1f} MB")
+
+    timed("legacy: 3 patterns, list dedup (YouTube)", lambda docs: [legacy_youtube_urls(d) for d in docs],
+          documents, args.repeat)
+    timed("media matcher (YouTube only)",
+          lambda docs: [find_media_urls(d, kinds=("youtube",), limit=3) for d in docs], documents, args.repeat)
+    timed("media matcher (all kinds)", lambda docs: [find_media_urls(d) for d in docs], documents, args.repeat)
+    if args.workers > 1:
+        timed(f"batch, {args.workers} processes (all kinds)",
+              lambda docs: find_media_urls_batch(docs, workers=args.workers), documents, args.repeat)
+
+if __name__ == "__main__":
+    main()
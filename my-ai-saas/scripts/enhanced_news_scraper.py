@@ -4,38 +4,83 @@ Implements comprehensive news aggregation with global sources and multimedia ext
 """
 
 import os
+import sys
+import argparse
 import json
 import asyncio
-import aiohttp
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set, Tuple, AsyncIterator
 import time
 import logging
-from dataclasses import dataclass, asdict
-import feedparser
-from bs4 import BeautifulSoup
+from dataclasses import dataclass, asdict, fields
 import uuid
-import re
 import sqlite3
 from urllib.parse import urljoin, urlparse
-import yt_dlp
-from newspaper import Article
 import hashlib
-from playwright.async_api import async_playwright
-from fake_useragent import UserAgent
-import snscrape.modules.twitter as sntwitter
-from apscheduler.schedulers.blocking import BlockingScheduler
+import threading
+import importlib.util
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor
+from scrape_journal import ScrapeRunJournal
+from video_enrichment import YouTubeEnricher
+from media_urls import find_media_urls, is_high_quality_image, youtube_video_id
+from raw_page_cache import RawPageCache
+from feed_stream import StreamReader, stream_feed_entries
+from page_fetch import HEAD_BYTE_BUDGET, fetch_page
+from user_agents import get_user_agent_pool
 import warnings
 warnings.filterwarnings("ignore")
 
+# Heavy parsing/browser/scraping backends (bs4, newspaper, playwright, snscrape) are imported
+# where they are first used, so the scheduler and one-off CLIs start quickly
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Columns exposed to the web tier and exports, in table order
+ARTICLE_COLUMNS = [
+    "id", "title", "summary", "url", "image_url", "video_url", "youtube_url",
+    "category", "source", "published_at", "quality_score"
+]
+
+TWITTER_SEARCH_TERMS = ["breaking news", "just in", "developing"]
+
+# Runs in a child process per search term: argv is (query, since_id); prints one JSON line per tweet
+TWITTER_SEARCH_SCRIPT = """
+import json, sys
+import snscrape.modules.twitter as sntwitter
+query, since_id = sys.argv[1], int(sys.argv[2])
+for tweet in sntwitter.TwitterSearchScraper(query).get_items():
+    if since_id and tweet.id <= since_id:
+        break
+    print(json.dumps({"id": tweet.id, "content": tweet.rawContent,
+                      "date": tweet.date.isoformat() if tweet.date else None}), flush=True)
+"""
+
+def new_article_id() -> bytes:
+    """Random 16-byte article id (a UUID4 without its 36-char text form)"""
+    return uuid.uuid4().bytes
+
+def utc_now_naive() -> datetime:
+    """Current UTC time without tzinfo, the format feed dates are stored in"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def with_slots(cls):
+    """Rebuild a dataclass with __slots__ for its fields (dataclass(slots=True) needs Python 3.10)"""
+    names = tuple(field.name for field in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@with_slots
 @dataclass
 class EnhancedNewsArticle:
-    id: str
+    id: bytes
     title: str
     summary: str
     url: str
@@ -47,45 +92,32 @@ class EnhancedNewsArticle:
     published_at: str = None
     quality_score: int = 0
     content_hash: str = None
+    video_ids: tuple = ()
+    
+    def __post_init__(self):
+        # A run holds many articles from few sources/categories: share those strings
+        self.category = sys.intern(self.category or "General")
+        self.source = sys.intern(self.source or "Unknown")
+    
+    @property
+    def id_text(self) -> str:
+        """Canonical UUID text stored in news_articles.id"""
+        return str(uuid.UUID(bytes=self.id)) if isinstance(self.id, bytes) else self.id
 
 class EnhancedMultimediaExtractor:
     """Advanced multimedia extraction with multiple sources"""
     
     def __init__(self):
-        self.ua = UserAgent()
+        self.ua = get_user_agent_pool()
         
-    def extract_youtube_videos(self, soup: BeautifulSoup, text: str) -> List[str]:
+    def extract_youtube_videos(self, soup: "BeautifulSoup", text: str) -> List[str]:
         """Extract YouTube video URLs from HTML and text"""
-        youtube_urls = []
-        
-        # YouTube patterns
-        patterns = [
-            r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-            r'youtu\.be/([a-zA-Z0-9_-]+)',
-            r'youtube\.com/embed/([a-zA-Z0-9_-]+)'
-        ]
-        
-        # Check iframes
-        for iframe in soup.find_all('iframe'):
-            src = iframe.get('src', '')
-            for pattern in patterns:
-                match = re.search(pattern, src)
-                if match:
-                    video_id = match.group(1)
-                    youtube_urls.append(f"https://www.youtube.com/watch?v={video_id}")
-                    break
-        
-        # Check text content
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for video_id in matches:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                if url not in youtube_urls:
-                    youtube_urls.append(url)
-        
-        return youtube_urls[:3]  # Limit to 3 videos
+        # Iframe embeds first, then links in the text, in a single scan
+        iframe_srcs = [iframe.get('src', '') for iframe in soup.find_all('iframe')]
+        document = "\n".join(iframe_srcs + [text or ''])
+        return find_media_urls(document, kinds=("youtube",), limit=3)["youtube"]  # Limit to 3 videos
     
-    def extract_best_image(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
+    def extract_best_image(self, soup: "BeautifulSoup", base_url: str) -> Optional[str]:
         """Extract the best quality image from article"""
         
         # Priority order for image extraction
@@ -110,7 +142,7 @@ class EnhancedMultimediaExtractor:
         
         return None
     
-    def extract_videos(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
+    def extract_videos(self, soup: "BeautifulSoup", base_url: str) -> Optional[str]:
         """Extract video URLs (non-YouTube)"""
         
         # Look for video tags
@@ -125,22 +157,24 @@ class EnhancedMultimediaExtractor:
                 if src:
                     return self._resolve_url(src, base_url)
         
+        # Fall back to embedded Vimeo/Twitter players and direct media files
+        iframe_srcs = "\n".join(iframe.get('src', '') for iframe in soup.find_all('iframe'))
+        found = find_media_urls(iframe_srcs, kinds=("vimeo", "twitter", "cdn"), limit=1)
+        for kind in ("vimeo", "twitter", "cdn"):
+            if found[kind]:
+                return found[kind][0]
+        
         return None
     
+    def extract_head_media(self, soup: "BeautifulSoup") -> Dict[str, List[str]]:
+        """Video URLs advertised in og:video / twitter:player meta tags"""
+        meta = soup.select('meta[property^="og:video"], meta[name^="twitter:player"]')
+        return find_media_urls("\n".join(tag.get('content', '') for tag in meta), limit=3)
+    
     def _is_high_quality_image(self, url: str) -> bool:
         """Check if image URL is high quality"""
-        if not url or url.startswith('data:'):
-            return False
-        
-        # Skip tracking pixels and small images
-        skip_patterns = ['1x1', 'pixel', 'tracking', 'blank', 'spacer']
-        for pattern in skip_patterns:
-            if pattern in url.lower():
-                return False
-        
-        # Check for image extensions
-        image_exts = ['.jpg', '.jpeg', '.png', '.webp', '.gif']
-        return any(ext in url.lower() for ext in image_exts) or 'image' in url.lower()
+        # Skips tracking pixels/spacers, then looks for an image extension or path hint
+        return is_high_quality_image(url)
     
     def _resolve_url(self, url: str, base_url: str) -> str:
         """Resolve relative URLs"""
@@ -151,14 +185,24 @@ class EnhancedMultimediaExtractor:
 class EnhancedNewsScraper:
     """Main scraper class with multiple source support"""
     
-    def __init__(self, cache_dir: str = "./data"):
+    def __init__(self, cache_dir: str = "./data", enrich_videos: bool = False,
+                 metadata_mode: bool = True, head_byte_budget: int = HEAD_BYTE_BUDGET):
         self.cache_dir = cache_dir
         self.db_path = os.path.join(cache_dir, "enhanced_news.db")
         self.multimedia_extractor = EnhancedMultimediaExtractor()
-        self.ua = UserAgent()
+        self.ua = get_user_agent_pool()
         self.session = None
+        self.stop_requested = threading.Event()
         self.ensure_cache_dir()
         self.init_database()
+        self.journal = ScrapeRunJournal(self.db_path)
+        # Raw HTML/feed bodies, so extraction changes can be re-applied without refetching
+        self.page_cache = RawPageCache(os.path.join(cache_dir, "raw_pages"))
+        # Metadata mode reads only the page <head> unless it has no usable image or video
+        self.metadata_mode = metadata_mode
+        self.head_byte_budget = head_byte_budget
+        # Optional stage: resolve YouTube ids to title/duration/thumbnail
+        self.video_enricher = YouTubeEnricher(self.db_path) if enrich_videos else None
         
         # Browser headers
         self.headers = {
@@ -250,6 +294,58 @@ class EnhancedNewsScraper:
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_news_published ON news_articles(published_at DESC)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_news_source ON news_articles(source)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_news_hash ON news_articles(content_hash)')
+                # Keyset pagination for the read API (news_api.py)
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_news_published_id ON news_articles(published_at DESC, id DESC)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_news_category_published ON news_articles(category, published_at DESC, id DESC)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_news_source_published ON news_articles(source, published_at DESC, id DESC)')
+                
+                # Change log consumed by downstream sync stages (see news_pg_sync.py)
+                changelog_exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_changes'"
+                ).fetchone() is not None
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS news_changes (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        url TEXT NOT NULL,
+                        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_news_articles_insert AFTER INSERT ON news_articles
+                    BEGIN
+                        INSERT INTO news_changes (url) VALUES (NEW.url);
+                    END
+                ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_news_articles_update AFTER UPDATE ON news_articles
+                    BEGIN
+                        INSERT INTO news_changes (url) VALUES (NEW.url);
+                    END
+                ''')
+                # A logged url with no row left is a tombstone (e.g. cleanup_old_articles)
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_news_articles_delete AFTER DELETE ON news_articles
+                    BEGIN
+                        INSERT INTO news_changes (url) VALUES (OLD.url);
+                    END
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS twitter_since_ids (
+                        term TEXT PRIMARY KEY,
+                        since_id INTEGER NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        target TEXT PRIMARY KEY,
+                        last_seq INTEGER NOT NULL DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                if not changelog_exists:
+                    # Rows written before the change log existed still need one sync
+                    conn.execute('INSERT INTO news_changes (url) SELECT url FROM news_articles')
                 
                 logger.info("Enhanced database initialized successfully")
                 
@@ -259,6 +355,7 @@ class EnhancedNewsScraper:
     async def fetch_with_playwright(self, url: str) -> Optional[str]:
         """Fetch content from JavaScript-heavy sites using Playwright"""
         try:
+            from playwright.async_api import async_playwright
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
                 page = await browser.new_page()
@@ -270,61 +367,111 @@ class EnhancedNewsScraper:
             logger.error(f"Playwright fetch failed for {url}: {e}")
             return None
     
-    def fetch_rss_feed(self, source_name: str, rss_url: str) -> List[EnhancedNewsArticle]:
-        """Fetch articles from RSS feed"""
-        articles = []
+    def fetch_feed_entries(self, source_name: str, rss_url: str, limit: int = 10) -> List[Any]:
+        """Download and parse a feed, returning its first entries"""
+        logger.info(f"Fetching RSS from {source_name}: {rss_url}")
+        
+        watermark = self.get_source_watermark(source_name)
+        
+        def is_seen(entry) -> bool:
+            # Only a stored URL means seen; dates alone never drop an entry
+            return self.article_exists_by_url(entry.link)
+        
+        def is_older(entry) -> bool:
+            published = getattr(entry, 'published_parsed', None)
+            return bool(watermark and published and datetime(*published[:6]) < watermark)
+        
+        # Stream the feed and stop reading once we have enough new entries
+        with requests.get(rss_url, headers=self.headers, timeout=20, stream=True) as response:
+            response.raise_for_status()
+            reader = StreamReader(response)
+            entries = list(stream_feed_entries(reader, limit=limit, is_seen=is_seen, is_older=is_older))  # Limit per source
+            
+            # Only complete bodies are worth keeping for reprocessing
+            if reader.complete:
+                self.page_cache.put(rss_url, reader.body(), kind="feed")
         
+        logger.debug(f"{source_name}: {len(entries)} new entries from {reader.size} bytes read")
+        return entries
+    
+    def get_source_watermark(self, source_name: str) -> Optional[datetime]:
+        """Publish time (naive UTC) of the newest stored article from this source
+
+        Used only as an early-stop hint. Rows dated in the future (e.g. written
+        with a local-time fallback on a host ahead of UTC) are ignored.
+        """
+        now = utc_now_naive()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    'SELECT MAX(published_at) FROM news_articles WHERE source = ? AND published_at <= ?',
+                    (source_name, now.isoformat())
+                ).fetchone()
+            if not row or not row[0]:
+                return None
+            watermark = datetime.fromisoformat(row[0])
+            if watermark.tzinfo:
+                watermark = watermark.astimezone(timezone.utc).replace(tzinfo=None)
+            return min(watermark, now)
+        except (sqlite3.Error, ValueError):
+            return None
+    
+    def build_article(self, source_name: str, entry) -> Optional[EnhancedNewsArticle]:
+        """Enrich a single feed entry into an article, or None if it is known or low quality"""
         try:
-            logger.info(f"Fetching RSS from {source_name}: {rss_url}")
+            url = getattr(entry, 'link', '')
+            title = getattr(entry, 'title', 'No Title')
             
-            # Parse RSS feed
-            feed = feedparser.parse(rss_url)
+            if not url or self.article_exists_by_url(url):
+                return None
             
-            if feed.bozo:
-                logger.warning(f"RSS parsing issues for {source_name}: {feed.bozo_exception}")
+            # Extract summary
+            summary = ''
+            if hasattr(entry, 'summary'):
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(entry.summary, 'html.parser')
+                summary = soup.get_text().strip()[:300]
             
-            for entry in feed.entries[:10]:  # Limit per source
-                try:
-                    url = getattr(entry, 'link', '')
-                    title = getattr(entry, 'title', 'No Title')
-                    
-                    if not url or self.article_exists_by_url(url):
-                        continue
-                    
-                    # Extract summary
-                    summary = ''
-                    if hasattr(entry, 'summary'):
-                        soup = BeautifulSoup(entry.summary, 'html.parser')
-                        summary = soup.get_text().strip()[:300]
-                    
-                    # Determine category
-                    category = self.determine_category(title + ' ' + summary)
-                    
-                    # Try to fetch full article
-                    article_data = self.fetch_full_article(url)
-                    
-                    # Create article object
-                    article = EnhancedNewsArticle(
-                        id=str(uuid.uuid4()),
-                        title=title,
-                        summary=summary or article_data.get('summary', ''),
-                        url=url,
-                        image_url=article_data.get('image_url'),
-                        video_url=article_data.get('video_url'),
-                        youtube_url=article_data.get('youtube_url'),
-                        category=category,
-                        source=source_name,
-                        published_at=self.parse_date(entry),
-                        quality_score=self.calculate_quality_score(title, summary, article_data),
-                        content_hash=self.generate_content_hash(title, url)
-                    )
-                    
-                    if article.quality_score >= 3:  # Quality threshold
-                        articles.append(article)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing article from {source_name}: {e}")
-                    continue
+            # Determine category
+            category = self.determine_category(title + ' ' + summary)
+            
+            # Try to fetch full article
+            article_data = self.fetch_full_article(url)
+            
+            # Create article object
+            article = EnhancedNewsArticle(
+                id=new_article_id(),
+                title=title,
+                summary=summary or article_data.get('summary', ''),
+                url=url,
+                image_url=article_data.get('image_url'),
+                video_url=article_data.get('video_url'),
+                youtube_url=article_data.get('youtube_url'),
+                category=category,
+                source=source_name,
+                published_at=self.parse_date(entry),
+                quality_score=self.calculate_quality_score(title, summary, article_data),
+                content_hash=self.generate_content_hash(title, url),
+                video_ids=tuple(filter(None, map(youtube_video_id, article_data.get('youtube_urls', []))))
+            )
+            
+            if article.quality_score >= 3:  # Quality threshold
+                return article
+            
+        except Exception as e:
+            logger.error(f"Error processing article from {source_name}: {e}")
+        
+        return None
+    
+    def fetch_rss_feed(self, source_name: str, rss_url: str) -> List[EnhancedNewsArticle]:
+        """Fetch articles from RSS feed"""
+        articles = []
+        
+        try:
+            for entry in self.fetch_feed_entries(source_name, rss_url):
+                article = self.build_article(source_name, entry)
+                if article:
+                    articles.append(article)
             
             logger.info(f"Fetched {len(articles)} quality articles from {source_name}")
             
@@ -333,12 +480,196 @@ class EnhancedNewsScraper:
         
         return articles
     
+    def request_stop(self):
+        """Ask a running scrape to stop after draining in-flight work (safe from signal handlers)"""
+        self.stop_requested.set()
+    
+    async def stream_articles(self, sources: Dict[str, str], enrich_workers: int = 4,
+                              queue_size: int = 50, run_id: Optional[int] = None,
+                              resume_entries: Optional[List[Any]] = None) -> AsyncIterator[EnhancedNewsArticle]:
+        """Yield enriched articles as soon as they are ready
+
+        Pipeline: feeds -> entries -> enriched articles, with bounded queues
+        between the stages so memory stays flat regardless of source count.
+        Blocking parsing and page fetches run on worker threads. With a run_id,
+        fetched entries are journaled so an interrupted run can resume, and
+        entries from resume_entries are processed before any new feed.
+        """
+        entry_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        article_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        stage_done = object()
+        
+        async def feed_stage():
+            cancelled = False
+            try:
+                for item in resume_entries or []:
+                    if self.stop_requested.is_set():
+                        return
+                    await entry_queue.put(item)
+                
+                for source_name, rss_url in sources.items():
+                    if self.stop_requested.is_set():
+                        return
+                    try:
+                        entries = await asyncio.to_thread(self.fetch_feed_entries, source_name, rss_url)
+                    except Exception as e:
+                        logger.error(f"Error fetching RSS from {source_name}: {e}")
+                        continue
+                    if run_id is not None:
+                        await asyncio.to_thread(self.journal.record_source_entries, run_id, source_name, entries)
+                    for entry in entries:
+                        await entry_queue.put((source_name, entry))
+                    
+                    # Rate limiting
+                    await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Once cancelled no worker is left to read: a put on a full queue would never return
+                if not cancelled:
+                    for _ in range(enrich_workers):
+                        await entry_queue.put(stage_done)
+        
+        async def enrich_stage():
+            cancelled = False
+            try:
+                while True:
+                    item = await entry_queue.get()
+                    if item is stage_done or self.stop_requested.is_set():
+                        # Entries left in the queue stay pending in the journal
+                        break
+                    article = await asyncio.to_thread(self.build_article, *item)
+                    if article:
+                        await article_queue.put(article)
+                    elif run_id is not None:
+                        url = getattr(item[1], 'link', '')
+                        await asyncio.to_thread(self.journal.resolve_entries, run_id, [url])
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    await article_queue.put(stage_done)
+        
+        tasks = [asyncio.create_task(feed_stage())]
+        tasks += [asyncio.create_task(enrich_stage()) for _ in range(enrich_workers)]
+        
+        finished = 0
+        try:
+            while finished < enrich_workers:
+                item = await article_queue.get()
+                if item is stage_done:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def sink_articles(self, articles: AsyncIterator[EnhancedNewsArticle], batch_size: int = 20,
+                            flush_interval: float = 15.0, run_id: Optional[int] = None) -> int:
+        """Persist streamed articles in micro-batches so partial progress is durable
+
+        A batch is written once it holds batch_size articles or flush_interval
+        seconds after the last write, even while the stream is waiting on a
+        slow source.
+        """
+        batch: List[EnhancedNewsArticle] = []
+        saved = 0
+        last_flush = time.monotonic()
+        
+        async def flush(batch: List[EnhancedNewsArticle]) -> int:
+            count = await asyncio.to_thread(self.save_articles, batch)
+            if run_id is not None:
+                await asyncio.to_thread(self.journal.resolve_entries, run_id, [a.url for a in batch])
+            return count
+        
+        stream = articles.__aiter__()
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(stream.__anext__())
+                timeout = max(0.0, flush_interval - (time.monotonic() - last_flush)) if batch else None
+                try:
+                    # shield: timing out must not cancel the stream mid-article
+                    article = await asyncio.wait_for(asyncio.shield(pending), timeout)
+                except asyncio.TimeoutError:
+                    saved += await flush(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+                    continue
+                except StopAsyncIteration:
+                    break
+                pending = None
+                
+                batch.append(article)
+                if len(batch) >= batch_size or time.monotonic() - last_flush >= flush_interval:
+                    saved += await flush(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+        
+        if batch:
+            saved += await flush(batch)
+        return saved
+    
     def fetch_full_article(self, url: str) -> Dict[str, Any]:
         """Fetch full article content with multimedia"""
         try:
-            # Use newspaper for content extraction
+            if self.metadata_mode:
+                head_html, complete = fetch_page(url, self.headers, head_only=True, head_budget=self.head_byte_budget)
+                if complete:
+                    # Small page: the whole document arrived within the budget
+                    self.page_cache.put(url, head_html.encode('utf-8'), kind="html")
+                    return self.extract_article_data(url, html=head_html)
+                head_data = self.extract_head_metadata(url, head_html)
+                if head_data.get('image_url') or head_data.get('video_url') or head_data.get('youtube_url'):
+                    self.page_cache.put(url, head_html.encode('utf-8'), kind="head")
+                    return head_data
+                logger.debug(f"No media in <head> of {url}; fetching the full page")
+            
+            # Size-capped full download, then newspaper for content extraction
+            html, _ = fetch_page(url, self.headers)
+            self.page_cache.put(url, html.encode('utf-8'), kind="html")
+            return self.extract_article_data(url, html=html)
+            
+        except Exception as e:
+            logger.debug(f"Error fetching full article from {url}: {e}")
+            return {}
+    
+    def extract_head_metadata(self, url: str, html: str) -> Dict[str, Any]:
+        """Image, video and description from a page's <head> meta tags"""
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'lxml')
+        media = self.multimedia_extractor.extract_head_media(soup)
+        youtube_urls = media.get("youtube", [])
+        video_url = next((urls[0] for kind, urls in media.items() if kind != "youtube" and urls), None)
+        
+        description = soup.select_one('meta[property="og:description"], meta[name="description"]')
+        summary = (description.get('content') or '').strip()[:300] if description else ''
+        
+        return {
+            'summary': summary,
+            'image_url': self.multimedia_extractor.extract_best_image(soup, url),
+            'video_url': video_url,
+            'youtube_url': youtube_urls[0] if youtube_urls else None,
+            'youtube_urls': youtube_urls
+        }
+    
+    def extract_article_data(self, url: str, html: str) -> Dict[str, Any]:
+        """Run content and multimedia extraction over downloaded (or cached) HTML"""
+        from bs4 import BeautifulSoup
+        from newspaper import Article
+        
+        try:
             article = Article(url)
-            article.download()
+            article.download(input_html=html)
             article.parse()
             
             # Parse HTML for multimedia
@@ -353,11 +684,12 @@ class EnhancedNewsScraper:
                 'summary': article.summary[:300] if article.summary else '',
                 'image_url': image_url or article.top_image,
                 'video_url': video_url,
-                'youtube_url': youtube_urls[0] if youtube_urls else None
+                'youtube_url': youtube_urls[0] if youtube_urls else None,
+                'youtube_urls': youtube_urls
             }
             
         except Exception as e:
-            logger.debug(f"Error fetching full article from {url}: {e}")
+            logger.debug(f"Error extracting article data from {url}: {e}")
             return {}
     
     def determine_category(self, text: str) -> str:
@@ -401,7 +733,8 @@ class EnhancedNewsScraper:
                 return datetime(*entry.published_parsed[:6]).isoformat()
             except:
                 pass
-        return datetime.now().isoformat()
+        # Feed dates are naive UTC, so undated entries must be too
+        return utc_now_naive().isoformat()
     
     def generate_content_hash(self, title: str, url: str) -> str:
         """Generate content hash for deduplication"""
@@ -426,11 +759,14 @@ class EnhancedNewsScraper:
         except:
             return False
     
-    def save_articles(self, articles: List[EnhancedNewsArticle]):
-        """Save articles to database"""
+    def save_articles(self, articles: List[EnhancedNewsArticle]) -> int:
+        """Save articles to database, returning how many were new
+
+        Errors are logged and re-raised: callers only mark work done once it is stored.
+        """
+        saved_count = 0
         try:
             with sqlite3.connect(self.db_path) as conn:
-                saved_count = 0
                 for article in articles:
                     # Skip duplicates
                     if self.article_exists_by_hash(article.content_hash):
@@ -442,11 +778,13 @@ class EnhancedNewsScraper:
                          category, source, published_at, quality_score, content_hash)
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ''', (
-                        article.id, article.title, article.summary, article.url,
+                        article.id_text, article.title, article.summary, article.url,
                         article.image_url, article.video_url, article.youtube_url,
                         article.category, article.source, article.published_at,
                         article.quality_score, article.content_hash
                     ))
+                    if self.video_enricher:
+                        self.video_enricher.record_article_videos(conn, article)
                     saved_count += 1
                 
                 conn.commit()
@@ -454,78 +792,160 @@ class EnhancedNewsScraper:
                 
         except Exception as e:
             logger.error(f"Error saving articles: {e}")
+            raise
+        
+        return saved_count
     
-    async def scrape_twitter_trending(self) -> List[EnhancedNewsArticle]:
-        """Scrape trending news from Twitter/X"""
-        articles = []
+    def get_twitter_since_ids(self) -> Dict[str, int]:
+        """Newest tweet id already seen per search term"""
         try:
-            # Get trending news tweets
-            search_terms = ["breaking news", "just in", "developing"]
-            
-            for term in search_terms:
-                tweets = sntwitter.TwitterSearchScraper(f"{term} -filter:retweets").get_items()
-                
-                count = 0
-                for tweet in tweets:
-                    if count >= 5:  # Limit per search term
-                        break
-                    
-                    if len(tweet.rawContent) > 50:  # Quality filter
-                        article = EnhancedNewsArticle(
-                            id=str(uuid.uuid4()),
-                            title=tweet.rawContent[:100] + "..." if len(tweet.rawContent) > 100 else tweet.rawContent,
-                            summary=tweet.rawContent,
-                            url=f"https://twitter.com/user/status/{tweet.id}",
-                            category="Breaking",
-                            source="Twitter",
-                            published_at=tweet.date.isoformat() if tweet.date else datetime.now().isoformat(),
-                            quality_score=5,
-                            content_hash=self.generate_content_hash(tweet.rawContent, str(tweet.id))
-                        )
-                        articles.append(article)
-                        count += 1
-            
-            logger.info(f"Scraped {len(articles)} trending tweets")
-            
+            with sqlite3.connect(self.db_path) as conn:
+                return dict(conn.execute('SELECT term, since_id FROM twitter_since_ids').fetchall())
         except Exception as e:
-            logger.error(f"Error scraping Twitter: {e}")
+            logger.warning(f"Could not read Twitter since-ids: {e}")
+            return {}
+    
+    def set_twitter_since_id(self, term: str, since_id: int):
+        """Advance the per-term high-water mark"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT INTO twitter_since_ids (term, since_id, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(term) DO UPDATE SET since_id = MAX(since_id, excluded.since_id), updated_at = CURRENT_TIMESTAMP
+            ''', (term, since_id))
+    
+    def twitter_search_available(self) -> bool:
+        return importlib.util.find_spec("snscrape") is not None
+    
+    def twitter_search_command(self, query: str, since_id: Optional[int]) -> List[str]:
+        """Child process that streams search results as JSON lines"""
+        return [sys.executable, "-c", TWITTER_SEARCH_SCRIPT, query, str(since_id or 0)]
+    
+    async def _collect_tweets(self, term: str, since_id: Optional[int], limit: int,
+                              timeout: float) -> Tuple[List[SimpleNamespace], Optional[int]]:
+        """Run one term's search in a child process; returns (quality tweets, newest id seen)
+
+        The child is killed at the limit or the timeout, so a stalled search
+        never outlives its run or keeps the process from exiting.
+        """
+        query = f"{term} -filter:retweets"
+        if since_id:
+            query += f" since_id:{since_id}"
+        
+        process = await asyncio.create_subprocess_exec(
+            *self.twitter_search_command(query, since_id),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        tweets = []
+        newest_id = None
+        try:
+            while len(tweets) < limit:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                line = await asyncio.wait_for(process.stdout.readline(), remaining)
+                if not line:
+                    break
+                data = json.loads(line)
+                tweet = SimpleNamespace(id=int(data["id"]), rawContent=data.get("content") or "", date=data.get("date"))
+                newest_id = max(newest_id or 0, tweet.id)
+                if len(tweet.rawContent) > 50:  # Quality filter
+                    tweets.append(tweet)
+        except asyncio.TimeoutError:
+            logger.warning(f"Twitter search for '{term}' timed out after {timeout}s with {len(tweets)} tweets")
+        finally:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+        return tweets, newest_id
+    
+    async def stream_twitter_articles(self, per_term_limit: int = 5, term_timeout: float = 20.0,
+                                      since_ids_seen: Optional[Dict[str, int]] = None) -> AsyncIterator[EnhancedNewsArticle]:
+        """Yield articles from trending tweets, fanning out across search terms in parallel
+
+        Each term's search runs in its own child process with a timeout, so a
+        stalled upstream can no longer hang the scrape or hold a worker. Only
+        tweets newer than the term's stored since-id are pulled; the newest id
+        per term is reported in since_ids_seen for the caller to store once the
+        articles are persisted (see ingest_twitter_articles).
+        """
+        if not self.twitter_search_available():
+            raise RuntimeError("snscrape is not installed")
+        since_ids = self.get_twitter_since_ids()
+        
+        async def run_term(term: str):
+            try:
+                tweets, newest_id = await self._collect_tweets(term, since_ids.get(term), per_term_limit, term_timeout)
+                return term, tweets, newest_id
+            except Exception as e:
+                logger.error(f"Error scraping Twitter for '{term}': {e}")
+            return term, [], None
         
+        seen_ids: Set[int] = set()
+        for next_term in asyncio.as_completed([run_term(term) for term in TWITTER_SEARCH_TERMS]):
+            term, tweets, newest_id = await next_term
+            if newest_id and since_ids_seen is not None:
+                since_ids_seen[term] = newest_id
+            for tweet in tweets:
+                # The same tweet often matches several terms
+                if tweet.id in seen_ids:
+                    continue
+                seen_ids.add(tweet.id)
+                url = f"https://twitter.com/user/status/{tweet.id}"
+                if self.article_exists_by_url(url):
+                    continue
+                
+                yield EnhancedNewsArticle(
+                    id=new_article_id(),
+                    title=tweet.rawContent[:100] + "..." if len(tweet.rawContent) > 100 else tweet.rawContent,
+                    summary=tweet.rawContent,
+                    url=url,
+                    category="Breaking",
+                    source="Twitter",
+                    published_at=tweet.date or utc_now_naive().isoformat(),
+                    quality_score=5,
+                    content_hash=self.generate_content_hash(tweet.rawContent, str(tweet.id))
+                )
+    
+    async def ingest_twitter_articles(self) -> int:
+        """Stream trending tweets into storage, then advance the per-term since-ids"""
+        since_ids_seen: Dict[str, int] = {}
+        saved = await self.sink_articles(self.stream_twitter_articles(since_ids_seen=since_ids_seen))
+        # Only after the batches are stored: a crash before this re-pulls the same tweets next run
+        for term, since_id in since_ids_seen.items():
+            self.set_twitter_since_id(term, since_id)
+        return saved
+    
+    async def scrape_twitter_trending(self) -> List[EnhancedNewsArticle]:
+        """Scrape trending news from Twitter/X"""
+        articles = [article async for article in self.stream_twitter_articles()]
+        logger.info(f"Scraped {len(articles)} trending tweets")
         return articles
     
     def get_daily_briefing(self) -> Dict[str, Any]:
         """Generate daily briefing from database"""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
                 # Get recent high-quality articles
                 cursor = conn.execute('''
-                    SELECT * FROM news_articles 
+                    SELECT {columns} FROM news_articles 
                     WHERE published_at >= date('now', '-1 day')
                     ORDER BY quality_score DESC, published_at DESC
                     LIMIT 100
-                ''')
+                '''.format(columns=", ".join(ARTICLE_COLUMNS)))
                 
                 articles = []
                 categories = set()
                 sources = set()
                 
                 for row in cursor.fetchall():
-                    article_data = {
-                        'id': row[0],
-                        'title': row[1],
-                        'summary': row[2],
-                        'url': row[3],
-                        'image_url': row[4],
-                        'video_url': row[5],
-                        'youtube_url': row[6],
-                        'category': row[7],
-                        'source': row[8],
-                        'published_at': row[9],
-                        'quality_score': row[10]
-                    }
+                    article_data = dict(row)
                     
                     articles.append(article_data)
-                    categories.add(row[7] or "General")
-                    sources.add(row[8] or "Unknown")
+                    categories.add(row['category'] or "General")
+                    sources.add(row['source'] or "Unknown")
                 
                 briefing = {
                     "date": datetime.now().strftime("%Y-%m-%d"),
@@ -551,50 +971,128 @@ class EnhancedNewsScraper:
         """Remove old articles"""
         try:
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
+                cursor = conn.execute('''
                     DELETE FROM news_articles 
                     WHERE published_at < date('now', '-{} day')
                 '''.format(days_to_keep))
                 
-                deleted = conn.total_changes
+                deleted = cursor.rowcount
                 logger.info(f"Cleaned up {deleted} old articles")
                 
+                # Only news_pg_sync reads the change log; with no sync target registered
+                # nothing else trims it (a target's first sync backfills every row)
+                conn.execute('''
+                    DELETE FROM news_changes WHERE seq <= (
+                        SELECT COALESCE(MIN(last_seq), (SELECT MAX(seq) FROM news_changes)) FROM sync_state
+                    )
+                ''')
+                
         except Exception as e:
             logger.error(f"Error cleaning up: {e}")
     
+    def rescore_cached_article(self, url: str, title: str, summary: str, kind: str = "html") -> Optional[tuple]:
+        """Re-run extraction and scoring for one article from its cached page"""
+        body = self.page_cache.get(url)
+        if body is None:
+            return None
+        html = body.decode('utf-8', errors='replace')
+        if kind == "head":
+            article_data = self.extract_head_metadata(url, html)
+        else:
+            article_data = self.extract_article_data(url, html=html)
+        if not article_data:
+            return None
+        return (
+            article_data.get('image_url'), article_data.get('video_url'), article_data.get('youtube_url'),
+            self.determine_category(title + ' ' + (summary or '')),
+            self.calculate_quality_score(title, summary or '', article_data),
+            url
+        )
+    
+    def reprocess_cached_articles(self, workers: int = os.cpu_count() or 1, batch_size: int = 200) -> Dict[str, int]:
+        """Apply current extraction/scoring rules to stored articles using cached pages only"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('SELECT url, title, summary FROM news_articles').fetchall()
+        cached = dict(self.page_cache.iter_urls(kinds=("html", "head")))
+        tasks = [(url, title, summary, cached[url]) for url, title, summary in rows if url in cached]
+        stats = {"articles": len(rows), "cached": len(tasks), "updated": 0}
+        logger.info(f"Reprocessing {len(tasks)} of {len(rows)} articles from the raw page cache")
+        
+        # Only touch rows whose values change, so the sync change log stays quiet
+        update_sql = '''
+            UPDATE news_articles
+            SET image_url = ?, video_url = ?, youtube_url = ?, category = ?, quality_score = ?
+            WHERE url = ?
+              AND (image_url, video_url, youtube_url, category, quality_score)
+                  IS NOT (?, ?, ?, ?, ?)
+        '''
+        
+        def write(batch: List[tuple]):
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.executemany(update_sql, [values + values[:5] for values in batch])
+                stats["updated"] += cursor.rowcount
+        
+        batch: List[tuple] = []
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_reprocess_worker,
+                                           initargs=(self.cache_dir,))
+            results = executor.map(_reprocess_worker, tasks, chunksize=16)
+        else:
+            executor = None
+            results = (self.rescore_cached_article(*task) for task in tasks)
+        try:
+            for values in results:
+                if values:
+                    batch.append(values)
+                if len(batch) >= batch_size:
+                    write(batch)
+                    batch = []
+            if batch:
+                write(batch)
+        finally:
+            if executor:
+                executor.shutdown()
+        
+        logger.info(f"Reprocessing complete: {stats['updated']} articles updated")
+        return stats
+    
     async def run_full_scrape(self):
         """Run complete scraping process"""
         logger.info("Starting enhanced news scraping...")
+        # A stop request only applies to the run it interrupted
+        self.stop_requested.clear()
         
         try:
             # Clean up old articles
             self.cleanup_old_articles()
             
-            all_articles = []
+            # Resume an interrupted run where it stopped
+            run_id, resumed = self.journal.start_run()
+            resume_entries = self.journal.pending_entries(run_id) if resumed else []
+            done_sources = self.journal.fetched_sources(run_id) if resumed else set()
+            sources = {name: url for name, url in self.rss_sources.items() if name not in done_sources}
+            if resumed:
+                logger.info(f"Resuming run {run_id}: {len(done_sources)} sources done, {len(resume_entries)} pending entries")
             
-            # Scrape RSS sources
-            for source_name, rss_url in self.rss_sources.items():
-                try:
-                    articles = self.fetch_rss_feed(source_name, rss_url)
-                    all_articles.extend(articles)
-                    
-                    # Rate limiting
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {source_name}: {e}")
-                    continue
+            # Stream RSS articles into storage as they are enriched
+            articles = self.stream_articles(sources, run_id=run_id, resume_entries=resume_entries)
+            if self.video_enricher:
+                articles = self.video_enricher.enrich_stream(articles)
+            saved = await self.sink_articles(articles, run_id=run_id)
+            logger.info(f"Streamed {saved} new RSS articles into storage")
+            
+            if self.stop_requested.is_set():
+                self.journal.mark_interrupted(run_id)
+                logger.info(f"Scrape interrupted, progress saved: {self.journal.get_run_status(run_id)}")
+                return
             
             # Scrape Twitter trending (if available)
             try:
-                twitter_articles = await self.scrape_twitter_trending()
-                all_articles.extend(twitter_articles)
+                twitter_saved = await self.ingest_twitter_articles()
+                logger.info(f"Saved {twitter_saved} new trending tweets")
             except Exception as e:
                 logger.warning(f"Twitter scraping unavailable: {e}")
             
-            # Save all articles
-            self.save_articles(all_articles)
-            
             # Generate daily briefing
             briefing = self.get_daily_briefing()
             
@@ -603,20 +1101,54 @@ class EnhancedNewsScraper:
             with open(cache_file, 'w', encoding='utf-8') as f:
                 json.dump(briefing, f, indent=2, ensure_ascii=False)
             
+            self.journal.finish_run(run_id)
+            
             logger.info(f"Enhanced scraping completed!")
             logger.info(f"Total articles: {briefing['total_articles']}")
             logger.info(f"With images: {briefing['multimedia_stats']['with_images']}")
             logger.info(f"With videos: {briefing['multimedia_stats']['with_videos']}")
             logger.info(f"With YouTube: {briefing['multimedia_stats']['with_youtube']}")
+            if self.video_enricher:
+                logger.info(f"Video lookups: {self.video_enricher.stats}")
             
         except Exception as e:
             logger.error(f"Enhanced scraping failed: {e}")
             raise
 
+_reprocess_scraper: Optional[EnhancedNewsScraper] = None
+
+def _init_reprocess_worker(cache_dir: str):
+    global _reprocess_scraper
+    _reprocess_scraper = EnhancedNewsScraper(cache_dir)
+
+def _reprocess_worker(task: tuple) -> Optional[tuple]:
+    return _reprocess_scraper.rescore_cached_article(*task)
+
 def main():
     """Main function to run enhanced scraper"""
-    scraper = EnhancedNewsScraper()
-    asyncio.run(scraper.run_full_scrape())
+    parser = argparse.ArgumentParser(description="Enhanced news scraper")
+    parser.add_argument("command", nargs="?", choices=["scrape", "reprocess"], default="scrape",
+                        help="reprocess re-runs extraction and scoring over cached pages without fetching")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    scraper = EnhancedNewsScraper(
+        enrich_videos=os.getenv("ENRICH_VIDEOS", "").lower() in ("1", "true", "yes"),
+        metadata_mode=os.getenv("METADATA_MODE", "1").lower() not in ("0", "false", "no")
+    )
+    if args.command == "reprocess":
+        scraper.reprocess_cached_articles(workers=args.workers)
+    else:
+        asyncio.run(scraper.run_full_scrape())
+    
+    # Push new/changed rows upstream when a Postgres target is configured
+    if os.getenv("SUPABASE_DB_URL") or os.getenv("DATABASE_URL"):
+        from news_pg_sync import PostgresNewsSync, get_sync_dsn
+        syncer = PostgresNewsSync(scraper.db_path, get_sync_dsn())
+        try:
+            syncer.sync()
+        finally:
+            syncer.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+"""
+Streaming Feed Reader
+Incremental RSS/Atom parsing with lxml iterparse that stops reading once enough entries are found
+
+Entries are yielded as they are parsed, with the same attribute access as
+feedparser entries (link, title, summary, published_parsed). Reading stops at
+the per-source limit or after a run of already-seen entries, so the rest of a
+large aggregator feed is never downloaded. Malformed feeds fall back to
+feedparser over the full body.
+"""
+
+import email.utils
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, List, Optional
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+FEED_MAX_BYTES = 10 * 1024 * 1024
+FEED_READ_CHUNK = 16 * 1024
+
+ENTRY_TAGS = {"item", "entry"}
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+DATE_TAGS = ("pubDate", "published", "date", "issued", "updated")
+
+class StreamReader:
+    """File-like view of a streamed HTTP body that keeps what was read and enforces a size cap"""
+
+    def __init__(self, response: Any, max_bytes: int = FEED_MAX_BYTES):
+        self.response = response
+        self.max_bytes = max_bytes
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.complete = False
+        self.truncated = False
+        self._iter = response.iter_content(chunk_size=FEED_READ_CHUNK)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.complete or self.truncated:
+            return b""
+        try:
+            chunk = next(self._iter)
+        except StopIteration:
+            self.complete = True
+            return b""
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.truncated = True
+            return b""
+        self.chunks.append(chunk)
+        return chunk
+
+    def body(self) -> bytes:
+        """Everything read so far"""
+        return b"".join(self.chunks)
+
+    def read_all(self) -> bytes:
+        """Drain the rest of the stream (up to the cap) and return the whole body"""
+        while self.read():
+            pass
+        return self.body()
+
+def parse_feed_date(value: Optional[str]):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as a UTC struct_time, like feedparser"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.timetuple()
+
+def element_to_entry(element: Any) -> SimpleNamespace:
+    """Map an RSS <item> or Atom <entry> to a feedparser-style entry"""
+    fields = {}
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        name = etree.QName(child).localname
+        if name == "link":
+            href = child.get("href")
+            if href is None:
+                fields.setdefault("link", (child.text or "").strip())
+            elif child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+        elif name == "guid" and child.get("isPermaLink", "true") == "true":
+            fields.setdefault("guid", (child.text or "").strip())
+        elif name == "title":
+            fields.setdefault("title", (child.text or "").strip())
+        elif name in SUMMARY_TAGS:
+            fields.setdefault(name, child.text or "")
+        elif name in DATE_TAGS:
+            fields.setdefault(name, child.text)
+
+    entry = SimpleNamespace(
+        link=fields.get("link") or fields.get("guid", ""),
+        title=fields.get("title", "No Title"),
+        published_parsed=next(
+            (parsed for parsed in (parse_feed_date(fields.get(tag)) for tag in DATE_TAGS) if parsed), None
+        )
+    )
+    summary = next((fields[tag] for tag in SUMMARY_TAGS if fields.get(tag)), None)
+    if summary is not None:
+        entry.summary = summary
+    return entry
+
+def stream_feed_entries(reader: StreamReader, limit: int = 10,
+                        is_seen: Optional[Callable[[Any], bool]] = None,
+                        stop_after_seen: int = 3,
+                        is_older: Optional[Callable[[Any], bool]] = None) -> Iterator[Any]:
+    """Yield new entries until limit is reached or stop_after_seen seen entries arrive in a row
+
+    is_seen decides what is skipped and should be exact (e.g. the URL is stored).
+    is_older is only an early-stop hint: a seen entry older than the newest one
+    already stored ends the read at once, but an unseen entry is never skipped
+    for its date.
+    """
+    yielded = set()
+    seen_streak = 0
+    entries_found = 0
+
+    def accept(entry: Any) -> Optional[bool]:
+        """True to yield, False to skip, None to stop"""
+        nonlocal seen_streak
+        link = getattr(entry, 'link', '')
+        if not link or link in yielded:
+            return False
+        if is_seen and is_seen(entry):
+            if is_older and is_older(entry):
+                return None
+            # Feeds are mostly newest-first; a short streak tolerates slightly unordered aggregators
+            seen_streak += 1
+            return None if seen_streak >= stop_after_seen else False
+        seen_streak = 0
+        return True
+
+    try:
+        context = etree.iterparse(reader, events=("end",), resolve_entities=False, no_network=True, huge_tree=False)
+        for _, element in context:
+            if etree.QName(element).localname not in ENTRY_TAGS:
+                continue
+            entries_found += 1
+            entry = element_to_entry(element)
+            # Free parsed entries as we go
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+            verdict = accept(entry)
+            if verdict is None:
+                return
+            if verdict:
+                yielded.add(entry.link)
+                yield entry
+                if len(yielded) >= limit:
+                    return
+        if entries_found:
+            return
+    except etree.XMLSyntaxError as e:
+        if reader.truncated:
+            logger.warning(f"Feed exceeded {reader.max_bytes} bytes; stopped after {len(yielded)} entries")
+            return
+        logger.debug(f"Streaming parse failed ({e}); falling back to feedparser")
+
+    # Malformed or unrecognised feed: let feedparser's lenient parser have the whole body
+    import feedparser
+    feed = feedparser.parse(reader.read_all())
+    if feed.bozo:
+        logger.debug(f"Feed parsed with issues: {feed.bozo_exception}")
+    for entry in feed.entries:
+        verdict = accept(entry)
+        if verdict is None:
+            return
+        if verdict:
+            yielded.add(entry.link)
+            yield entry
+            if len(yielded) >= limit:
+                return
@@ -0,0 +1,292 @@
+"""
+Recycling Job Worker
+Runs scheduled jobs in a child process that is replaced after N jobs or once its RSS passes a watermark
+
+Parsers and browsers (newspaper, BeautifulSoup trees, lxml, Playwright) leave
+memory behind that a long-lived process never hands back to the OS. Jobs run
+one at a time in a spawned worker that keeps its state (e.g. an
+EnhancedNewsScraper) between jobs; the parent retires the worker after
+max_jobs_per_worker jobs, when the RSS left after a job exceeds the watermark,
+or when a job crashes or times out. Every run reports its peak RSS, and with
+trace_memory the worker diffs tracemalloc snapshots between runs to show which
+code allocated the memory that was retained.
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+import tracemalloc
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_JOBS_PER_WORKER = int(os.getenv("WORKER_MAX_JOBS", "20"))
+RSS_WATERMARK_MB = float(os.getenv("WORKER_RSS_WATERMARK_MB", "1024"))
+TRACE_TOP = 10
+STOP_GRACE_SECONDS = 120  # Time a signalled worker gets to drain before it is killed
+
+def _read_status_kb(field: str) -> Optional[int]:
+    """A VmRSS/VmHWM value from /proc/self/status (Linux only)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark so VmHWM covers only the next job"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _peak_rss_mb(reset: bool) -> Optional[float]:
+    peak_kb = _read_status_kb("VmHWM") if reset else None
+    if peak_kb is None:
+        # Lifetime peak of the worker instead of this run's; recycling still bounds it
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_kb //= 1024  # Reported in bytes on macOS
+    return round(peak_kb / 1024, 1)
+
+def _memory_growth(snapshot: tracemalloc.Snapshot, previous: tracemalloc.Snapshot,
+                   top: int) -> List[Tuple[str, int, int]]:
+    """(location, bytes, blocks) with the largest growth since the previous snapshot"""
+    stats = snapshot.compare_to(previous, "lineno")
+    return [(str(stat.traceback), stat.size_diff, stat.count_diff) for stat in stats[:top] if stat.size_diff > 0]
+
+def _worker_main(conn, factory: Callable[..., Any], factory_kwargs: Dict[str, Any],
+                 trace_memory: bool, trace_top: int):
+    """Worker loop: build the state once, then run (job_id, func, args) requests until told to stop"""
+    if trace_memory:
+        tracemalloc.start()
+    state = factory(**factory_kwargs)
+
+    # The parent signals a running job to stop; let it drain like the in-process scheduler does
+    request_stop = getattr(state, "request_stop", None)
+    def handle_stop(signum, frame):
+        if request_stop:
+            request_stop()
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+    previous = tracemalloc.take_snapshot().filter_traces(ignore) if trace_memory else None
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        job_id, func, args = request
+
+        reset = _reset_peak_rss()
+        if trace_memory:
+            tracemalloc.reset_peak()
+        started = time.monotonic()
+        report: Dict[str, Any] = {"job_id": job_id, "pid": os.getpid(), "ok": True, "error": None, "result": None}
+        try:
+            report["result"] = func(state, *args)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed in worker")
+            report["ok"] = False
+            report["error"] = f"{type(e).__name__}: {e}"
+
+        report["seconds"] = round(time.monotonic() - started, 2)
+        report["peak_rss_mb"] = _peak_rss_mb(reset)
+        rss_kb = _read_status_kb("VmRSS")
+        report["rss_mb"] = round(rss_kb / 1024, 1) if rss_kb is not None else None
+        if trace_memory:
+            report["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+            report["memory_growth"] = _memory_growth(snapshot, previous, trace_top)
+            previous = snapshot
+
+        try:
+            conn.send(report)
+        except Exception as e:
+            # e.g. an unpicklable job result; the run itself is still reported
+            report["result"] = None
+            report["error"] = report["error"] or f"Could not return result: {e}"
+            conn.send(report)
+
+class RecyclingJobRunner:
+    """Runs jobs one at a time in a worker process that is replaced when it has grown or aged"""
+
+    def __init__(self, factory: Callable[..., Any], factory_kwargs: Optional[Dict[str, Any]] = None,
+                 max_jobs_per_worker: int = MAX_JOBS_PER_WORKER, rss_watermark_mb: float = RSS_WATERMARK_MB,
+                 trace_memory: bool = False, trace_top: int = TRACE_TOP, job_timeout: Optional[float] = None):
+        self.factory = factory
+        self.factory_kwargs = factory_kwargs or {}
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.rss_watermark_mb = rss_watermark_mb
+        self.trace_memory = trace_memory
+        self.trace_top = trace_top
+        self.job_timeout = job_timeout
+        # spawn: the parent runs scheduler threads, which fork() would copy in an unknown state
+        self.context = multiprocessing.get_context("spawn")
+        self.lock = threading.Lock()
+        self.process = None
+        self.conn = None
+        self.jobs_done = 0
+        self.owner: Optional[int] = None  # Thread currently waiting on a job
+        self.stop_requested = threading.Event()
+        self.stats = {"workers_started": 0, "recycled_max_jobs": 0, "recycled_watermark": 0, "crashed": 0, "timed_out": 0}
+
+    def _start_worker(self):
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.factory, self.factory_kwargs, self.trace_memory, self.trace_top),
+            name="job-worker",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.jobs_done = 0
+        self.stats["workers_started"] += 1
+        logger.info(f"Started job worker (pid {self.process.pid})")
+
+    def _stop_worker(self, reason: str):
+        if self.process is None:
+            return
+        pid = self.process.pid
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=30)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+        logger.info(f"Stopped job worker (pid {pid}): {reason}")
+
+    def _wait_for_report(self, job_id: str) -> Dict[str, Any]:
+        deadline = time.monotonic() + self.job_timeout if self.job_timeout else None
+        signalled = False
+        while True:
+            if self.conn.poll(1.0):
+                try:
+                    report = self.conn.recv()
+                except EOFError:
+                    break  # The worker died before reporting
+                # A worker that was told to stop keeps its stop flag set; never reuse it
+                report["stopped"] = signalled
+                return report
+            if not self.process.is_alive():
+                break
+            if deadline and time.monotonic() > deadline:
+                if signalled:
+                    logger.error(f"Job {job_id} did not stop after SIGTERM; killing worker")
+                    self.process.kill()
+                    break
+                logger.error(f"Job {job_id} exceeded {self.job_timeout:.0f}s; asking worker to stop")
+                self.stats["timed_out"] += 1
+                self.process.terminate()
+                signalled = True
+                deadline = time.monotonic() + STOP_GRACE_SECONDS
+
+        self.process.join()
+        exitcode = self.process.exitcode
+        if not signalled:
+            self.stats["crashed"] += 1
+        self._stop_worker(f"exited with code {exitcode} during {job_id}")
+        return {"job_id": job_id, "pid": None, "ok": False, "error": f"Worker exited with code {exitcode}",
+                "result": None, "seconds": None, "peak_rss_mb": None, "rss_mb": None}
+
+    def run(self, job_id: str, func: Callable[..., Any], *args: Any, blocking: bool = True) -> Optional[Dict[str, Any]]:
+        """Run func(state, *args) in the worker and return its run report
+
+        func must be a module-level function (it is pickled by reference).
+        Returns None without running when blocking is False and another job
+        holds the worker, or when the runner is shutting down.
+        """
+        if not self.lock.acquire(blocking=blocking):
+            return None
+        self.owner = threading.get_ident()
+        try:
+            if self.stop_requested.is_set():
+                return None
+            if self.process is None or not self.process.is_alive():
+                self._start_worker()
+            self.conn.send((job_id, func, args))
+            report = self._wait_for_report(job_id)
+            if self.process is not None:
+                self.jobs_done += 1
+            report["worker_jobs"] = self.jobs_done
+            self.log_report(report)
+            self._maybe_recycle(report)
+            return report
+        finally:
+            self.owner = None
+            self.lock.release()
+
+    def _maybe_recycle(self, report: Dict[str, Any]):
+        if self.process is None:
+            return
+        if report.get("stopped"):
+            self._stop_worker(f"stopped during {report['job_id']}")
+        elif self.jobs_done >= self.max_jobs_per_worker:
+            self.stats["recycled_max_jobs"] += 1
+            self._stop_worker(f"ran {self.jobs_done} jobs")
+        elif report["rss_mb"] is not None and report["rss_mb"] >= self.rss_watermark_mb:
+            self.stats["recycled_watermark"] += 1
+            self._stop_worker(f"RSS {report['rss_mb']} MiB over {self.rss_watermark_mb:.0f} MiB watermark")
+
+    def log_report(self, report: Dict[str, Any]):
+        """One job-log line per run, plus the top retained allocations when tracing"""
+        if report["pid"] is None:
+            logger.error(f"Job {report['job_id']} failed: {report['error']}")
+            return
+        outcome = "finished" if report["ok"] else f"failed ({report['error']})"
+        heap = f", peak heap {report['peak_heap_mb']} MiB" if "peak_heap_mb" in report else ""
+        log = logger.info if report["ok"] else logger.error
+        log(
+            f"Job {report['job_id']} {outcome} in {report['seconds']}s on worker {report['pid']} "
+            f"(job {report['worker_jobs']}/{self.max_jobs_per_worker}): "
+            f"peak RSS {report['peak_rss_mb']} MiB, RSS after {report['rss_mb']} MiB{heap}"
+        )
+        growth = report.get("memory_growth")
+        if growth:
+            lines = [f"  +{size / 1024:.1f} KiB ({count:+d} blocks) {location}" for location, size, count in growth]
+            logger.info(f"Memory retained by worker {report['pid']} since its previous run:\n" + "\n".join(lines))
+
+    def request_stop(self):
+        """Ask a running job to drain and stop; no new jobs are started (safe from signal handlers)"""
+        self.stop_requested.set()
+        process = self.process
+        if process is not None and process.is_alive() and self.lock.locked():
+            process.terminate()
+
+    def close(self):
+        """Wait for the running job (if any) and stop the worker"""
+        if self.owner == threading.get_ident():
+            # A signal handler interrupted run() on this thread, so nobody else will read the report
+            try:
+                if self.conn is not None and self.conn.poll(STOP_GRACE_SECONDS):
+                    self.log_report({**self.conn.recv(), "worker_jobs": self.jobs_done + 1})
+            except (EOFError, OSError):
+                pass
+            self._stop_worker("shutdown")
+            return
+        with self.lock:
+            self._stop_worker("shutdown")
@@ -0,0 +1,224 @@
+"""
+News Read API
+Async FastAPI endpoints over the scraper's enhanced_news.db for the web tier
+
+Mount the router on an existing app, or run it standalone:
+
+    python news_api.py --port 8010
+
+Listings use keyset pagination on (published_at, id): the response carries an
+opaque next_cursor instead of an offset, so deep pages cost the same as the
+first. Encoded responses are kept in an in-process LRU with a short TTL; every
+cached entry is tagged with the news_changes sequence it was built from, so
+ingestion (from any process) invalidates it. ETag/If-None-Match answers 304s.
+"""
+
+import os
+import json
+import time
+import base64
+import asyncio
+import sqlite3
+import hashlib
+import argparse
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import Response
+
+# Configuration
+NEWS_DB_PATH = os.getenv("NEWS_DB_PATH", os.path.join("./data", "enhanced_news.db"))
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_SECONDS = 30
+GENERATION_CHECK_SECONDS = 1.0  # How often to poll the change log for new ingestion
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+CACHE_CONTROL = "no-cache"  # Clients revalidate and get 304s via ETag
+
+API_COLUMNS = [
+    "id", "title", "summary", "url", "image_url", "video_url", "youtube_url",
+    "category", "source", "published_at", "quality_score"
+]
+
+router = APIRouter()
+
+# key -> (generation, expires_at, body, etag)
+_response_cache: "OrderedDict[Tuple, Tuple[int, float, bytes, str]]" = OrderedDict()
+_inflight: Dict[Tuple, asyncio.Future] = {}
+_generation: Tuple[float, int] = (0.0, -1)
+
+async def _run_blocking(func, *args):
+    """Run blocking SQLite work on the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(f"file:{NEWS_DB_PATH}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _read_generation() -> int:
+    """Last change-log sequence handed out; moves whenever an article is inserted, updated or deleted
+
+    Read from sqlite_sequence rather than MAX(seq), which drops back once the
+    sync prunes the log.
+    """
+    with _connect() as conn:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'news_changes'").fetchone()
+    return row[0] if row else 0
+
+async def current_generation() -> int:
+    global _generation
+    checked_at, generation = _generation
+    if time.monotonic() - checked_at >= GENERATION_CHECK_SECONDS:
+        generation = await _run_blocking(_read_generation)
+        _generation = (time.monotonic(), generation)
+    return generation
+
+def invalidate_cache():
+    """Drop every cached response (for ingestion running in this process)"""
+    global _generation
+    _response_cache.clear()
+    _generation = (0.0, -1)
+
+def encode_cursor(published_at: str, article_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([published_at, article_id]).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        published_at, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(published_at), str(article_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _encode(payload: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Serialize once and derive the ETag from the body"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def _query_page(field: Optional[str], value: Optional[str], limit: int,
+                cursor: Optional[Tuple[str, str]]) -> Tuple[bytes, str]:
+    """One page of articles, newest first, optionally filtered by category or source"""
+    conditions = []
+    params: List[Any] = []
+    if field:
+        conditions.append(f"{field} = ?")
+        params.append(value)
+    if cursor:
+        conditions.append("(published_at, id) < (?, ?)")
+        params.extend(cursor)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    with _connect() as conn:
+        rows = conn.execute(f'''
+            SELECT {", ".join(API_COLUMNS)} FROM news_articles
+            {where}
+            ORDER BY published_at DESC, id DESC
+            LIMIT ?
+        ''', (*params, limit + 1)).fetchall()
+
+    articles = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = articles[-1]
+        next_cursor = encode_cursor(last["published_at"], last["id"])
+    return _encode({"success": True, "articles": articles, "count": len(articles), "next_cursor": next_cursor})
+
+def _query_article(article_id: str) -> Optional[Tuple[bytes, str]]:
+    with _connect() as conn:
+        row = conn.execute(
+            f'SELECT {", ".join(API_COLUMNS)} FROM news_articles WHERE id = ?', (article_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    return _encode({"success": True, "article": dict(row)})
+
+async def cached_response(key: Tuple, func, *args) -> Optional[Tuple[bytes, str]]:
+    """Serve from the response cache, coalescing concurrent misses for the same key"""
+    generation = await current_generation()
+    entry = _response_cache.get(key)
+    if entry and entry[0] == generation and entry[1] > time.monotonic():
+        _response_cache.move_to_end(key)
+        return entry[2], entry[3]
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_run_blocking(func, *args))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so a disconnecting client does not cancel the query others are awaiting
+    result = await asyncio.shield(future)
+
+    if result is not None:
+        _response_cache[key] = (generation, time.monotonic() + RESPONSE_CACHE_SECONDS, *result)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return result
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+def _respond(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _page(request: Request, field: Optional[str], value: Optional[str],
+                limit: int, cursor: Optional[str]) -> Response:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    position = decode_cursor(cursor) if cursor else None
+    try:
+        body, etag = await cached_response(("page", field, value, limit, position), _query_page,
+                                           field, value, limit, position)
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=503, detail=f"News store unavailable: {e}")
+    return _respond(request, body, etag)
+
+@router.get("/api/news/latest")
+async def get_latest_news(request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """Newest articles across all sources"""
+    return await _page(request, None, None, limit, cursor)
+
+@router.get("/api/news/category/{category}")
+async def get_news_by_category(request: Request, category: str, limit: int = DEFAULT_PAGE_SIZE,
+                               cursor: Optional[str] = None):
+    """Newest articles in one category (e.g. Technology)"""
+    return await _page(request, "category", category, limit, cursor)
+
+@router.get("/api/news/source/{source}")
+async def get_news_by_source(request: Request, source: str, limit: int = DEFAULT_PAGE_SIZE,
+                             cursor: Optional[str] = None):
+    """Newest articles from one source (e.g. BBC World)"""
+    return await _page(request, "source", source, limit, cursor)
+
+@router.get("/api/news/article/{article_id}")
+async def get_news_article(request: Request, article_id: str):
+    """A single article by id"""
+    try:
+        result = await cached_response(("article", article_id), _query_article, article_id)
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=503, detail=f"News store unavailable: {e}")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return _respond(request, *result)
+
+app = FastAPI(title="News Read API")
+app.include_router(router)
+
+def main():
+    global NEWS_DB_PATH
+    parser = argparse.ArgumentParser(description="Serve news_articles over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--db", default=NEWS_DB_PATH)
+    args = parser.parse_args()
+    NEWS_DB_PATH = args.db
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Columnar News Export
+Streams news_articles straight from enhanced_news.db into Parquet, Arrow IPC or NDJSON
+
+Rows are read in fixed-size batches with fetchmany, so memory stays bounded no
+matter how large the table is. category and source are dictionary-encoded in
+the Arrow formats, mirroring the interned strings used by the scraper.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    "id", "title", "summary", "url", "image_url", "video_url", "youtube_url",
+    "category", "source", "published_at", "quality_score", "content_hash", "created_at"
+]
+
+def iter_article_batches(db_path: str, since: Optional[str] = None,
+                         batch_size: int = 5000) -> Iterator[List[Tuple[Any, ...]]]:
+    """Yield lists of raw rows from news_articles, oldest first"""
+    query = 'SELECT {columns} FROM news_articles'.format(columns=", ".join(EXPORT_COLUMNS))
+    params: Tuple[Any, ...] = ()
+    if since:
+        query += ' WHERE published_at >= ?'
+        params = (since,)
+    query += ' ORDER BY published_at, id'
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+def export_ndjson(db_path: str, out_path: str, since: Optional[str] = None) -> int:
+    """One JSON object per line; '-' writes to stdout"""
+    count = 0
+    out = sys.stdout if out_path == "-" else open(out_path, 'w', encoding='utf-8')
+    try:
+        for rows in iter_article_batches(db_path, since):
+            out.write("".join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows
+            ))
+            count += len(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return count
+
+def arrow_schema():
+    """Arrow schema for exported articles"""
+    import pyarrow as pa
+
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("summary", pa.string()),
+        ("url", pa.string()),
+        ("image_url", pa.string()),
+        ("video_url", pa.string()),
+        ("youtube_url", pa.string()),
+        ("category", dict_string),
+        ("source", dict_string),
+        ("published_at", pa.string()),
+        ("quality_score", pa.int32()),
+        ("content_hash", pa.string()),
+        ("created_at", pa.string()),
+    ])
+
+def iter_record_batches(db_path: str, since: Optional[str] = None):
+    """Convert row batches into Arrow record batches column by column"""
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    for rows in iter_article_batches(db_path, since):
+        columns = list(zip(*rows))
+        arrays = []
+        for field, values in zip(schema, columns):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def export_parquet(db_path: str, out_path: str, since: Optional[str] = None) -> int:
+    """Parquet file with one row group per batch"""
+    import pyarrow.parquet as pq
+
+    count = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(db_path, since):
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, batch.schema, compression="zstd")
+            writer.write_batch(batch)
+            count += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def export_arrow(db_path: str, out_path: str, since: Optional[str] = None) -> int:
+    """Arrow IPC stream; readers can consume batches as they arrive"""
+    import pyarrow as pa
+
+    count = 0
+    sink = sys.stdout.buffer if out_path == "-" else pa.OSFile(out_path, 'wb')
+    try:
+        with pa.ipc.new_stream(sink, arrow_schema()) as writer:
+            for batch in iter_record_batches(db_path, since):
+                writer.write_batch(batch)
+                count += batch.num_rows
+    finally:
+        if out_path != "-":
+            sink.close()
+    return count
+
+EXPORTERS = {
+    "ndjson": export_ndjson,
+    "parquet": export_parquet,
+    "arrow": export_arrow,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Export news_articles in a columnar or line-delimited format")
+    parser.add_argument("--format", choices=sorted(EXPORTERS), default="ndjson")
+    parser.add_argument("--out", default="-", help="Output path ('-' for stdout; not supported for parquet)")
+    parser.add_argument("--db", default=os.path.join("./data", "enhanced_news.db"))
+    parser.add_argument("--since", default=None, help="Only articles published at or after this ISO date")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and args.out == "-":
+        parser.error("--out is required for parquet")
+
+    count = EXPORTERS[args.format](args.db, args.out, args.since)
+    logger.info(f"Exported {count} articles as {args.format}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Incremental News Sync to Postgres/Supabase
+Pushes only new, changed or deleted rows from enhanced_news.db upstream using the change log
+
+psycopg2 is optional for the scraper and only imported when a sync runs.
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SYNC_COLUMNS = [
+    "title", "summary", "url", "image_url", "video_url", "youtube_url",
+    "category", "source", "published_at", "quality_score", "content_hash"
+]
+
+UPSERT_SQL = '''
+    INSERT INTO news_articles ({columns})
+    VALUES %s
+    ON CONFLICT (url) DO UPDATE SET {updates}
+    WHERE ({target_columns}) IS DISTINCT FROM ({excluded_columns})
+'''.format(
+    columns=", ".join(SYNC_COLUMNS),
+    updates=", ".join(f"{col} = EXCLUDED.{col}" for col in SYNC_COLUMNS if col != "url"),
+    target_columns=", ".join(f"news_articles.{col}" for col in SYNC_COLUMNS if col != "url"),
+    excluded_columns=", ".join(f"EXCLUDED.{col}" for col in SYNC_COLUMNS if col != "url"),
+)
+
+DELETE_SQL = 'DELETE FROM news_articles WHERE url = ANY(%s)'
+
+class PostgresNewsSync:
+    """Change-log based sync from the scraper's SQLite cache to a Postgres news_articles table"""
+
+    def __init__(self, db_path: str, dsn: Optional[str] = None, target: str = "supabase",
+                 batch_size: int = 500, connection_pool: Optional[Any] = None):
+        self.db_path = db_path
+        self.target = target
+        self.batch_size = batch_size
+        if connection_pool is None:
+            from psycopg2 import pool
+            # Any Postgres works, so a local instance can stand in for Supabase
+            connection_pool = pool.SimpleConnectionPool(1, 2, dsn)
+        self.pool = connection_pool
+
+    def close(self):
+        """Close pooled upstream connections"""
+        self.pool.closeall()
+
+    def get_high_water_mark(self, conn: sqlite3.Connection) -> Optional[int]:
+        """Last change-log sequence number confirmed upstream (None before the first sync)"""
+        row = conn.execute('SELECT last_seq FROM sync_state WHERE target = ?', (self.target,)).fetchone()
+        return row[0] if row else None
+
+    def set_high_water_mark(self, conn: sqlite3.Connection, last_seq: int):
+        conn.execute('''
+            INSERT INTO sync_state (target, last_seq, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(target) DO UPDATE SET last_seq = excluded.last_seq, updated_at = CURRENT_TIMESTAMP
+        ''', (self.target, last_seq))
+        conn.commit()
+
+    def backfill_changes(self, conn: sqlite3.Connection) -> int:
+        """First sync of a target: log every stored article and start reading after the old entries
+
+        cleanup_old_articles trims the log while no target is registered, so
+        the existing entries do not cover every row.
+        """
+        start = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM news_changes').fetchone()[0]
+        conn.execute('INSERT INTO news_changes (url) SELECT url FROM news_articles')
+        self.set_high_water_mark(conn, start)
+        return start
+
+    def fetch_changes(self, conn: sqlite3.Connection, after_seq: int) -> Tuple[int, List[Tuple[Any, ...]], List[str]]:
+        """Read the next batch of changes; returns (max seq in batch, rows to upsert, urls to delete)
+
+        Rows are read as they are now, so a url logged several times is sent
+        once with its latest state, and one whose row is gone is deleted.
+        """
+        cursor = conn.execute('''
+            SELECT c.seq, c.url, {columns}
+            FROM news_changes c
+            LEFT JOIN news_articles a ON a.url = c.url
+            WHERE c.seq > ?
+            ORDER BY c.seq
+            LIMIT ?
+        '''.format(columns=", ".join(
+            f"COALESCE(a.{col}, 'General')" if col == "category" else f"a.{col}" for col in SYNC_COLUMNS
+        )), (after_seq, self.batch_size))
+
+        max_seq = after_seq
+        rows_by_url: Dict[str, Tuple[Any, ...]] = {}
+        deleted_urls = set()
+        for row in cursor.fetchall():
+            max_seq = row[0]
+            url = row[1]
+            values = row[2:]
+            if values[SYNC_COLUMNS.index("url")] is None:
+                # Row was deleted locally since it was logged
+                deleted_urls.add(url)
+                continue
+            # One row per url: ON CONFLICT cannot touch the same row twice in a statement
+            rows_by_url[url] = values
+        return max_seq, list(rows_by_url.values()), sorted(deleted_urls)
+
+    def apply_batch(self, rows: List[Tuple[Any, ...]], deleted_urls: List[str]) -> Tuple[int, int]:
+        """Upsert and delete in one upstream transaction; returns (upserted, deleted)"""
+        if not rows and not deleted_urls:
+            return 0, 0
+        from psycopg2.extras import execute_values
+
+        upserted = deleted = 0
+        pg_conn = self.pool.getconn()
+        try:
+            with pg_conn:
+                with pg_conn.cursor() as cursor:
+                    if rows:
+                        # Multi-row INSERT ... ON CONFLICT (url)
+                        execute_values(cursor, UPSERT_SQL, rows, page_size=len(rows))
+                        upserted = cursor.rowcount
+                    if deleted_urls:
+                        cursor.execute(DELETE_SQL, (deleted_urls,))
+                        deleted = cursor.rowcount
+        finally:
+            self.pool.putconn(pg_conn)
+        return upserted, deleted
+
+    def prune_changes(self, conn: sqlite3.Connection):
+        """Drop change-log entries every sync target has already consumed"""
+        conn.execute('DELETE FROM news_changes WHERE seq <= (SELECT COALESCE(MIN(last_seq), 0) FROM sync_state)')
+        conn.commit()
+
+    def sync(self) -> Dict[str, int]:
+        """Push all pending changes upstream, advancing the high-water mark per batch"""
+        stats = {"batches": 0, "rows": 0, "upserted": 0, "deleted": 0}
+        with sqlite3.connect(self.db_path) as conn:
+            last_seq = self.get_high_water_mark(conn)
+            if last_seq is None:
+                last_seq = self.backfill_changes(conn)
+            while True:
+                max_seq, rows, deleted_urls = self.fetch_changes(conn, last_seq)
+                if max_seq == last_seq:
+                    break
+
+                upserted, deleted = self.apply_batch(rows, deleted_urls)
+                # Only advance once the upstream transaction has committed
+                self.set_high_water_mark(conn, max_seq)
+                last_seq = max_seq
+
+                stats["batches"] += 1
+                stats["rows"] += len(rows)
+                stats["upserted"] += upserted
+                stats["deleted"] += deleted
+                logger.info(f"Synced batch {stats['batches']}: {len(rows)} rows, {upserted} inserted/updated, "
+                            f"{deleted} deleted upstream")
+
+            self.prune_changes(conn)
+
+        logger.info(f"Sync to {self.target} complete: {stats['rows']} changed rows, {stats['upserted']} written, "
+                    f"{stats['deleted']} deleted upstream")
+        return stats
+
+def get_sync_dsn() -> Optional[str]:
+    """Postgres connection string for the upstream news table"""
+    return os.getenv("SUPABASE_DB_URL") or os.getenv("DATABASE_URL")
+
+def main():
+    """Run one incremental sync of data/enhanced_news.db"""
+    dsn = get_sync_dsn()
+    if not dsn:
+        logger.error("Set SUPABASE_DB_URL (or DATABASE_URL) to the Postgres connection string")
+        sys.exit(1)
+
+    db_path = os.path.join("./data", "enhanced_news.db")
+    syncer = PostgresNewsSync(db_path, dsn)
+    try:
+        syncer.sync()
+    finally:
+        syncer.close()
+
+if __name__ == "__main__":
+    main()
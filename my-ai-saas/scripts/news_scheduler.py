@@ -4,10 +4,14 @@ Handles automated daily news scraping with APScheduler
 """
 
 import asyncio
+import argparse
+import functools
+import json
 import logging
 from datetime import datetime
-from apscheduler.schedulers.blocking import BlockingScheduler
+from typing import Any, Dict, Optional, Set
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 import signal
 import sys
 import os
@@ -16,6 +20,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from enhanced_news_scraper import EnhancedNewsScraper
+from job_worker import MAX_JOBS_PER_WORKER, RSS_WATERMARK_MB, RecyclingJobRunner
 
 # Configure logging
 logging.basicConfig(
@@ -28,13 +33,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# One instance per job; missed runs are merged into a single catch-up run
+JOB_DEFAULTS = {
+    "max_instances": 1,
+    "coalesce": True,
+    "misfire_grace_time": 300
+}
+
+# Sample top sources for hourly updates
+PRIORITY_SOURCES = {
+    "BBC Breaking": "http://feeds.bbci.co.uk/news/rss.xml",
+    "Reuters Breaking": "https://feeds.reuters.com/reuters/breakingviews",
+    "CNN Breaking": "http://rss.cnn.com/rss/edition.rss",
+    "AP Breaking": "https://feeds.apnews.com/rss/apf-topnews"
+}
+
+# Jobs for process mode run inside the worker; module-level so they pickle by reference
+def _full_scrape_job(scraper: EnhancedNewsScraper):
+    asyncio.run(scraper.run_full_scrape())
+
+def _hourly_update_job(scraper: EnhancedNewsScraper) -> int:
+    return asyncio.run(scraper.sink_articles(scraper.stream_articles(PRIORITY_SOURCES)))
+
+def _cleanup_job(scraper: EnhancedNewsScraper):
+    scraper.cleanup_old_articles()
+
+def _track_job(coro_func):
+    """Register a coroutine job's task so shutdown can drain it"""
+    @functools.wraps(coro_func)
+    async def wrapper(self, *args, **kwargs):
+        task = asyncio.current_task()
+        self.running_jobs.add(task)
+        try:
+            return await coro_func(self, *args, **kwargs)
+        finally:
+            self.running_jobs.discard(task)
+    return wrapper
+
 class NewsScraperScheduler:
     """Scheduler for automated news scraping"""
     
-    def __init__(self):
-        self.scheduler = BlockingScheduler()
-        self.scraper = EnhancedNewsScraper()
-        self.setup_signal_handlers()
+    def __init__(self, mode: str = "asyncio", cache_dir: str = "./data",
+                 max_jobs_per_worker: int = MAX_JOBS_PER_WORKER, rss_watermark_mb: float = RSS_WATERMARK_MB,
+                 trace_memory: bool = False, job_timeout: Optional[float] = None):
+        self.mode = mode
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.metrics_file = os.path.join(cache_dir, "scheduler-metrics.json")
+        self.running_jobs: Set[asyncio.Task] = set()
+        self.db_lock = None
+        self.job_runner = None
+        if mode == "process":
+            # The scraper lives in a recycled child process; this one only schedules
+            self.scraper = None
+            os.makedirs(cache_dir, exist_ok=True)
+            self.job_runner = RecyclingJobRunner(
+                EnhancedNewsScraper, {"cache_dir": cache_dir},
+                max_jobs_per_worker=max_jobs_per_worker, rss_watermark_mb=rss_watermark_mb,
+                trace_memory=trace_memory, job_timeout=job_timeout
+            )
+        else:
+            self.scraper = EnhancedNewsScraper(cache_dir=cache_dir)
+        if mode in ("blocking", "process"):
+            from apscheduler.schedulers.blocking import BlockingScheduler
+            self.scheduler = BlockingScheduler(job_defaults=JOB_DEFAULTS)
+            self.setup_signal_handlers()
+        else:
+            # Created inside the event loop by run_async()
+            self.scheduler = None
     
     def setup_signal_handlers(self):
         """Setup graceful shutdown"""
@@ -42,9 +107,17 @@ class NewsScraperScheduler:
         signal.signal(signal.SIGTERM, self.shutdown)
     
     def shutdown(self, signum, frame):
-        """Graceful shutdown"""
+        """Graceful shutdown: drain in-flight fetches and flush pending batches"""
         logger.info("Shutting down scheduler...")
-        self.scheduler.shutdown()
+        if self.job_runner:
+            self.job_runner.request_stop()
+        else:
+            self.scraper.request_stop()
+        # wait=True lets a running scrape finish draining; its run stays resumable
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=True)
+        if self.job_runner:
+            self.job_runner.close()
         sys.exit(0)
     
     def run_scrape_job(self):
@@ -63,15 +136,7 @@ class NewsScraperScheduler:
             # Run a lighter version - just RSS feeds, no Twitter
             all_articles = []
             
-            # Sample top sources for hourly updates
-            priority_sources = {
-                "BBC Breaking": "http://feeds.bbci.co.uk/news/rss.xml",
-                "Reuters Breaking": "https://feeds.reuters.com/reuters/breakingviews",
-                "CNN Breaking": "http://rss.cnn.com/rss/edition.rss",
-                "AP Breaking": "https://feeds.apnews.com/rss/apf-topnews"
-            }
-            
-            for source_name, rss_url in priority_sources.items():
+            for source_name, rss_url in PRIORITY_SOURCES.items():
                 try:
                     articles = self.scraper.fetch_rss_feed(source_name, rss_url)
                     all_articles.extend(articles)
@@ -86,13 +151,185 @@ class NewsScraperScheduler:
         except Exception as e:
             logger.error(f"Hourly update failed: {e}")
     
+    def run_in_worker(self, job_id: str, func, blocking: bool = True):
+        """Run a job in the recycled worker process and record its memory use"""
+        report = self.job_runner.run(job_id, func, blocking=blocking)
+        if report is None:
+            if not self.job_runner.stop_requested.is_set():
+                logger.info(f"{job_id} skipped: another job is running in the worker")
+                self.job_metrics(job_id)["skipped_busy"] += 1
+                self.write_metrics()
+            return
+        
+        job_metrics = self.job_metrics(job_id)
+        job_metrics["last_peak_rss_mb"] = report["peak_rss_mb"]
+        job_metrics["last_rss_mb"] = report["rss_mb"]
+        if report["peak_rss_mb"] is not None:
+            job_metrics["max_peak_rss_mb"] = max(job_metrics.get("max_peak_rss_mb") or 0, report["peak_rss_mb"])
+        if not report["ok"]:
+            job_metrics["failed_in_worker"] = job_metrics.get("failed_in_worker", 0) + 1
+        self.write_metrics()
+    
+    def run_scrape_job_in_worker(self):
+        self.run_in_worker("daily_full_scrape", _full_scrape_job)
+    
+    def run_hourly_update_in_worker(self):
+        # Skipped while a full scrape (a superset of it) or cleanup holds the worker
+        self.run_in_worker("hourly_update", _hourly_update_job, blocking=False)
+    
+    def run_cleanup_in_worker(self):
+        self.run_in_worker("weekly_cleanup", _cleanup_job)
+    
+    def job_metrics(self, job_id: str) -> Dict[str, Any]:
+        """Metrics record for one job"""
+        return self.metrics.setdefault(job_id, {
+            "executed": 0, "errors": 0, "missed": 0, "skipped_overlap": 0, "skipped_busy": 0,
+            "last_run": None, "last_missed": None
+        })
+    
+    def record_job_event(self, event):
+        """Track per-job run, error and missed-run counts"""
+        job_metrics = self.job_metrics(event.job_id)
+        if event.code == EVENT_JOB_EXECUTED:
+            job_metrics["executed"] += 1
+            job_metrics["last_run"] = datetime.now().isoformat()
+        elif event.code == EVENT_JOB_ERROR:
+            job_metrics["errors"] += 1
+        elif event.code == EVENT_JOB_MISSED:
+            job_metrics["missed"] += 1
+            job_metrics["last_missed"] = event.scheduled_run_time.isoformat()
+            logger.warning(f"Job {event.job_id} missed its run at {event.scheduled_run_time}")
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            job_metrics["skipped_overlap"] += 1
+            logger.warning(f"Job {event.job_id} skipped: previous run still in progress")
+        self.write_metrics()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Scheduler metrics snapshot"""
+        metrics = {"updated_at": datetime.now().isoformat(), "mode": self.mode, "jobs": self.metrics}
+        if self.job_runner:
+            metrics["workers"] = self.job_runner.stats
+        return metrics
+    
+    def write_metrics(self):
+        """Expose metrics as JSON next to the scraper cache"""
+        try:
+            with open(self.metrics_file, 'w', encoding='utf-8') as f:
+                json.dump(self.get_metrics(), f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write scheduler metrics: {e}")
+    
+    @_track_job
+    async def run_scrape_job_async(self):
+        """Full scrape on the shared event loop; holds the DB lock so cleanup never overlaps"""
+        async with self.db_lock:
+            try:
+                logger.info("Starting scheduled news scrape...")
+                await self.scraper.run_full_scrape()
+                logger.info("Scheduled scrape completed successfully")
+            except Exception as e:
+                logger.error(f"Scheduled scrape failed: {e}")
+    
+    @_track_job
+    async def run_hourly_update_async(self):
+        """Hourly RSS update; skipped while a full scrape (a superset of it) is running"""
+        if self.db_lock.locked():
+            logger.info("Hourly update skipped: another ingest or cleanup job holds the database")
+            self.job_metrics("hourly_update")["skipped_busy"] += 1
+            self.write_metrics()
+            return
+        async with self.db_lock:
+            try:
+                logger.info("Running hourly news update...")
+                saved = await self.scraper.sink_articles(self.scraper.stream_articles(PRIORITY_SOURCES))
+                logger.info(f"Hourly update: saved {saved} new articles")
+            except Exception as e:
+                logger.error(f"Hourly update failed: {e}")
+    
+    @_track_job
+    async def run_cleanup_async(self):
+        """Weekly cleanup, serialized with ingest jobs"""
+        async with self.db_lock:
+            await asyncio.to_thread(self.scraper.cleanup_old_articles)
+    
+    async def shutdown_async(self, stop_event: asyncio.Event):
+        """Graceful shutdown: stop scheduling, drain running jobs, then exit the loop"""
+        logger.info("Shutting down scheduler...")
+        self.scraper.request_stop()
+        self.scheduler.shutdown(wait=False)
+        if self.running_jobs:
+            await asyncio.gather(*self.running_jobs, return_exceptions=True)
+        self.write_metrics()
+        stop_event.set()
+    
+    async def run_async(self):
+        """Asyncio-native scheduler: one event loop and one scraper shared by every job"""
+        logger.info("Starting News Scraper Scheduler (asyncio mode)...")
+        self.db_lock = asyncio.Lock()
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        self.scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
+        self.scheduler.add_listener(
+            self.record_job_event,
+            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+        
+        # Initial scrape runs as a scheduled job instead of blocking startup
+        self.scheduler.add_job(
+            func=self.run_scrape_job_async,
+            trigger=CronTrigger(hour=7, minute=0),
+            id='daily_full_scrape',
+            name='Daily Full News Scrape',
+            next_run_time=datetime.now(),
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            func=self.run_hourly_update_async,
+            trigger=CronTrigger(minute=0),
+            id='hourly_update',
+            name='Hourly News Update',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            func=self.run_cleanup_async,
+            trigger=CronTrigger(day_of_week='sun', hour=6, minute=0),
+            id='weekly_cleanup',
+            name='Weekly Database Cleanup',
+            replace_existing=True
+        )
+        
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: asyncio.ensure_future(self.shutdown_async(stop_event)))
+        
+        self.scheduler.start()
+        logger.info("Scheduler started. Jobs scheduled:")
+        for job in self.scheduler.get_jobs():
+            logger.info(f"  - {job.name}: {job.trigger}")
+        
+        await stop_event.wait()
+    
     def start(self):
         """Start the scheduler"""
-        logger.info("Starting News Scraper Scheduler...")
+        if self.mode == "asyncio":
+            asyncio.run(self.run_async())
+            return
+        
+        logger.info(f"Starting News Scraper Scheduler ({self.mode} mode)...")
+        if self.job_runner:
+            run_scrape, run_hourly, run_cleanup = (
+                self.run_scrape_job_in_worker, self.run_hourly_update_in_worker, self.run_cleanup_in_worker
+            )
+        else:
+            run_scrape, run_hourly, run_cleanup = self.run_scrape_job, self.run_hourly_update, self.scraper.cleanup_old_articles
+        self.scheduler.add_listener(
+            self.record_job_event,
+            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
         
         # Schedule full scrape daily at 7 AM
         self.scheduler.add_job(
-            func=self.run_scrape_job,
+            func=run_scrape,
             trigger=CronTrigger(hour=7, minute=0),
             id='daily_full_scrape',
             name='Daily Full News Scrape',
@@ -101,7 +338,7 @@ class NewsScraperScheduler:
         
         # Schedule hourly updates for breaking news
         self.scheduler.add_job(
-            func=self.run_hourly_update,
+            func=run_hourly,
             trigger=CronTrigger(minute=0),  # Every hour at minute 0
             id='hourly_update',
             name='Hourly News Update',
@@ -110,7 +347,7 @@ class NewsScraperScheduler:
         
         # Schedule cleanup weekly
         self.scheduler.add_job(
-            func=self.scraper.cleanup_old_articles,
+            func=run_cleanup,
             trigger=CronTrigger(day_of_week='sun', hour=6, minute=0),
             id='weekly_cleanup',
             name='Weekly Database Cleanup',
@@ -119,7 +356,7 @@ class NewsScraperScheduler:
         
         # Run initial scrape
         logger.info("Running initial news scrape...")
-        self.run_scrape_job()
+        run_scrape()
         
         # Start scheduler
         logger.info("Scheduler started. Jobs scheduled:")
@@ -133,7 +370,24 @@ class NewsScraperScheduler:
 
 def main():
     """Main function"""
-    scheduler = NewsScraperScheduler()
+    parser = argparse.ArgumentParser(description="Automated news scraping scheduler")
+    parser.add_argument("--mode", choices=["asyncio", "blocking", "process"], default="asyncio",
+                        help="asyncio: shared event loop and scraper (default); blocking: legacy BlockingScheduler; "
+                             "process: each job runs in a worker process that is recycled to release memory")
+    parser.add_argument("--max-jobs-per-worker", type=int, default=MAX_JOBS_PER_WORKER,
+                        help="process mode: replace the worker after this many jobs")
+    parser.add_argument("--rss-watermark-mb", type=float, default=RSS_WATERMARK_MB,
+                        help="process mode: replace the worker when its RSS after a job exceeds this")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="process mode: log tracemalloc growth between runs (slows jobs down)")
+    parser.add_argument("--job-timeout", type=float, default=None,
+                        help="process mode: stop a job that runs longer than this many seconds")
+    args = parser.parse_args()
+    
+    scheduler = NewsScraperScheduler(
+        mode=args.mode, max_jobs_per_worker=args.max_jobs_per_worker, rss_watermark_mb=args.rss_watermark_mb,
+        trace_memory=args.trace_memory, job_timeout=args.job_timeout
+    )
     scheduler.start()
 
 if __name__ == "__main__":
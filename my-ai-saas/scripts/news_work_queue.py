@@ -0,0 +1,425 @@
+"""
+Distributed News Scraping Work Queue
+Coordinator/worker mode: feeds and article URLs become leased tasks in a shared queue
+
+Backends:
+- SQLiteTaskQueue: a local file shared by worker processes on one box
+- RedisTaskQueue: any Redis-compatible client (redis-py, fakeredis as a local stand-in)
+
+Usage:
+    python news_work_queue.py coordinator            # enqueue one feed task per source
+    python news_work_queue.py worker --processes 4   # pull and process tasks
+
+Article tasks are keyed by URL, so each article is enriched by exactly one
+worker; each worker still saves through EnhancedNewsScraper.save_articles and
+its url/content-hash checks. Workers renew the leases of tasks they hold while
+a batch fills, so slow fetches are not handed to a second worker. Workers on other nodes write to their own cache
+DB, which news_pg_sync.py pushes upstream.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import socket
+import logging
+import argparse
+import multiprocessing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_HOST_INTERVAL = 1.0  # Minimum seconds between requests to one host, across all workers
+MAX_ATTEMPTS = 3
+
+@dataclass
+class WorkTask:
+    id: str
+    kind: str  # "feed" or "article"
+    payload: Dict[str, Any]
+    attempts: int = 0
+    lease_expires: float = 0.0
+
+class SQLiteTaskQueue:
+    """Leased task queue and global host rate limiter in a shared SQLite file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS work_tasks (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedup_key TEXT UNIQUE NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_work_status ON work_tasks(status, lease_expires)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS host_slots (
+                    host TEXT PRIMARY KEY,
+                    next_allowed REAL NOT NULL
+                )
+            ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedup_key: str) -> bool:
+        """Add a task unless one with the same dedup key was ever queued"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO work_tasks (id, kind, payload, dedup_key) VALUES (?, ?, ?, ?)',
+                (uuid.uuid4().hex, kind, json.dumps(payload), dedup_key)
+            )
+            return cursor.rowcount > 0
+
+    def lease(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[WorkTask]:
+        """Claim the oldest pending task, or one whose lease has expired"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('''
+                SELECT id, kind, payload, attempts FROM work_tasks
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY created_at LIMIT 1
+            ''', (now,)).fetchone()
+            if not row:
+                conn.execute('COMMIT')
+                return None
+            conn.execute('''
+                UPDATE work_tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE id = ?
+            ''', (worker_id, now + lease_seconds, row[0]))
+            conn.execute('COMMIT')
+            return WorkTask(id=row[0], kind=row[1], payload=json.loads(row[2]), attempts=row[3] + 1,
+                            lease_expires=now + lease_seconds)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, task: WorkTask, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a held lease; False if the lease already ran out and was taken over"""
+        expires = time.time() + lease_seconds
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE work_tasks SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (expires, task.id, worker_id)
+            )
+        if cursor.rowcount:
+            task.lease_expires = expires
+        return cursor.rowcount > 0
+
+    def complete(self, task: WorkTask):
+        """Mark a task done; its dedup key stays so it is never queued again"""
+        with self._connect() as conn:
+            conn.execute("UPDATE work_tasks SET status = 'done', lease_owner = NULL WHERE id = ?", (task.id,))
+
+    def fail(self, task: WorkTask):
+        """Return a task to the queue, or park it after MAX_ATTEMPTS"""
+        status = 'failed' if task.attempts >= MAX_ATTEMPTS else 'pending'
+        with self._connect() as conn:
+            conn.execute("UPDATE work_tasks SET status = ?, lease_owner = NULL WHERE id = ?", (status, task.id))
+
+    def acquire_host_slot(self, host: str, interval: float = DEFAULT_HOST_INTERVAL) -> float:
+        """Reserve the next request slot for a host; returns seconds to wait before using it"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT next_allowed FROM host_slots WHERE host = ?', (host,)).fetchone()
+            now = time.time()
+            slot = max(now, row[0] if row else 0)
+            conn.execute(
+                'INSERT OR REPLACE INTO host_slots (host, next_allowed) VALUES (?, ?)', (host, slot + interval)
+            )
+            conn.execute('COMMIT')
+            return slot - now
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM work_tasks GROUP BY status').fetchall())
+
+    def prune(self, days: int = 7):
+        """Forget finished tasks (and their dedup keys) older than the article retention window"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM work_tasks WHERE status IN ('done', 'failed') AND created_at < datetime('now', ?)",
+                (f'-{days} day',)
+            )
+
+class RedisTaskQueue:
+    """The same queue on a Redis-compatible server, for workers on several nodes"""
+
+    def __init__(self, client, prefix: str = "news"):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedup_key: str) -> bool:
+        # Dedup keys are scored by when they were first queued, so prune can age them out
+        if not self.client.zadd(self._key("seen_at"), {dedup_key: time.time()}, nx=True):
+            return False
+        task_id = uuid.uuid4().hex
+        self.client.hset(self._key("tasks"), task_id, json.dumps({"kind": kind, "payload": payload, "attempts": 0}))
+        self.client.lpush(self._key("pending"), task_id)
+        return True
+
+    def _requeue_expired(self):
+        """Move tasks whose lease ran out back to pending"""
+        now = time.time()
+        for raw_id in self.client.lrange(self._key("processing"), 0, -1):
+            task_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+            expires = self.client.zscore(self._key("leases"), task_id)
+            if expires is None:
+                # A worker died between pop and lease; give it a full lease before reclaiming
+                self.client.zadd(self._key("leases"), {task_id: now + DEFAULT_LEASE_SECONDS}, nx=True)
+            elif expires < now and self.client.lrem(self._key("processing"), 1, task_id):
+                self.client.zrem(self._key("leases"), task_id)
+                self.client.hdel(self._key("owners"), task_id)
+                self.client.lpush(self._key("pending"), task_id)
+
+    def lease(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[WorkTask]:
+        self._requeue_expired()
+        raw_id = self.client.rpoplpush(self._key("pending"), self._key("processing"))
+        if raw_id is None:
+            return None
+        task_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+        self.client.zadd(self._key("leases"), {task_id: time.time() + lease_seconds})
+        self.client.hset(self._key("owners"), task_id, worker_id)
+
+        raw = self.client.hget(self._key("tasks"), task_id)
+        if raw is None:
+            self._forget(task_id)
+            return None
+        data = json.loads(raw)
+        data["attempts"] += 1
+        self.client.hset(self._key("tasks"), task_id, json.dumps(data))
+        return WorkTask(id=task_id, kind=data["kind"], payload=data["payload"], attempts=data["attempts"],
+                        lease_expires=time.time() + lease_seconds)
+
+    def renew(self, task: WorkTask, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a held lease; False if it already ran out and went back to pending"""
+        owner = self.client.hget(self._key("owners"), task.id)
+        if (owner.decode() if isinstance(owner, bytes) else owner) != worker_id:
+            return False
+        expires = time.time() + lease_seconds
+        # XX: only update a lease that still exists; CH makes the reply count the update
+        if not self.client.zadd(self._key("leases"), {task.id: expires}, xx=True, ch=True):
+            return False
+        task.lease_expires = expires
+        return True
+
+    def _forget(self, task_id: str):
+        self.client.lrem(self._key("processing"), 1, task_id)
+        self.client.zrem(self._key("leases"), task_id)
+        self.client.hdel(self._key("owners"), task_id)
+        self.client.hdel(self._key("tasks"), task_id)
+
+    def complete(self, task: WorkTask):
+        self._forget(task.id)
+
+    def fail(self, task: WorkTask):
+        if task.attempts >= MAX_ATTEMPTS:
+            logger.warning(f"Giving up on {task.kind} task {task.id} after {task.attempts} attempts")
+            self._forget(task.id)
+            return
+        self.client.lrem(self._key("processing"), 1, task.id)
+        self.client.zrem(self._key("leases"), task.id)
+        self.client.hdel(self._key("owners"), task.id)
+        self.client.lpush(self._key("pending"), task.id)
+
+    def acquire_host_slot(self, host: str, interval: float = DEFAULT_HOST_INTERVAL) -> float:
+        """Block until this worker holds the host's rate-limit slot (SET NX PX)"""
+        key = self._key(f"host:{host}")
+        while not self.client.set(key, "1", nx=True, px=max(1, int(interval * 1000))):
+            ttl = self.client.pttl(key)
+            time.sleep(max(ttl, 10) / 1000.0 if ttl and ttl > 0 else 0.01)
+        return 0.0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.client.llen(self._key("pending")),
+            "leased": self.client.llen(self._key("processing"))
+        }
+
+    def prune(self, days: int = 7):
+        """Finished tasks are deleted on completion; forget dedup keys queued more than `days` ago"""
+        self.client.zremrangebyscore(self._key("seen_at"), "-inf", time.time() - days * 86400)
+
+def open_queue(backend: str, sqlite_path: str, redis_url: Optional[str] = None):
+    """Build the configured queue backend"""
+    if backend == "redis":
+        import redis
+        return RedisTaskQueue(redis.Redis.from_url(redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+    return SQLiteTaskQueue(sqlite_path)
+
+def enqueue_cycle(queue, sources: Dict[str, str], cycle: Optional[str] = None) -> int:
+    """Coordinator: queue one feed task per source for this scrape cycle"""
+    cycle = cycle or time.strftime("%Y%m%d%H")
+    queued = 0
+    for source_name, rss_url in sources.items():
+        if queue.enqueue("feed", {"source": source_name, "url": rss_url}, f"feed:{source_name}:{cycle}"):
+            queued += 1
+    logger.info(f"Queued {queued} feed tasks for cycle {cycle}")
+    return queued
+
+def wait_for_host(queue, url: str, interval: float):
+    """Honour the global per-host rate limit before fetching url"""
+    host = urlparse(url).netloc.lower()
+    if host:
+        delay = queue.acquire_host_slot(host, interval)
+        if delay > 0:
+            time.sleep(delay)
+
+def process_task(scraper, queue, task: WorkTask, host_interval: float, batch: List[Any],
+                 worker_id: Optional[str] = None):
+    """Run one leased task with the scraper's existing fetch/enrich/dedup logic"""
+    from scrape_journal import ScrapeRunJournal
+
+    if task.kind == "feed":
+        wait_for_host(queue, task.payload["url"], host_interval)
+        entries = scraper.fetch_feed_entries(task.payload["source"], task.payload["url"])
+        for entry in entries:
+            url = getattr(entry, 'link', '')
+            if not url or scraper.article_exists_by_url(url):
+                continue
+            # The URL is the dedup key, so an article is handed to exactly one worker
+            queue.enqueue("article", {
+                "source": task.payload["source"],
+                "entry": ScrapeRunJournal.serialize_entry(entry)
+            }, f"article:{url}")
+    elif task.kind == "article":
+        entry = ScrapeRunJournal.deserialize_entry(task.payload["entry"])
+        wait_for_host(queue, entry.link, host_interval)
+        if worker_id:
+            # The host wait can be long; restart the lease clock before the slow fetch
+            queue.renew(task, worker_id)
+        article = scraper.build_article(task.payload["source"], entry)
+        if article:
+            batch.append(article)
+    else:
+        logger.warning(f"Unknown task kind {task.kind}")
+
+def run_worker(backend: str, sqlite_path: str, redis_url: Optional[str], cache_dir: str,
+               host_interval: float = DEFAULT_HOST_INTERVAL, batch_size: int = 10, idle_exit: Optional[float] = None):
+    """Worker loop: lease tasks, process them, save articles in small batches"""
+    from enhanced_news_scraper import EnhancedNewsScraper
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = open_queue(backend, sqlite_path, redis_url)
+    scraper = EnhancedNewsScraper(cache_dir=cache_dir)
+    batch: List[Any] = []
+    leased: List[WorkTask] = []
+    idle_since = time.monotonic()
+    logger.info(f"Worker {worker_id} started ({backend} queue)")
+
+    def renew_held():
+        """Keep leases on tasks waiting for the batch to be saved"""
+        threshold = time.time() + DEFAULT_LEASE_SECONDS / 2
+        for held in list(leased):
+            if held.lease_expires < threshold and not queue.renew(held, worker_id):
+                logger.warning(f"Lease on task {held.id} expired before its batch was saved")
+
+    def flush():
+        try:
+            if batch:
+                scraper.save_articles(batch)
+        except Exception as e:
+            # Article tasks are only complete once their article is stored; retry them
+            logger.error(f"Saving {len(batch)} articles failed, returning their tasks to the queue: {e}")
+            for held in leased:
+                if held.kind == "article":
+                    queue.fail(held)
+                else:
+                    queue.complete(held)
+        else:
+            for done in leased:
+                queue.complete(done)
+        finally:
+            batch.clear()
+            leased.clear()
+
+    try:
+        while not scraper.stop_requested.is_set():
+            task = queue.lease(worker_id)
+            if task is None:
+                flush()
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    break
+                time.sleep(1)
+                continue
+
+            idle_since = time.monotonic()
+            renew_held()
+            try:
+                process_task(scraper, queue, task, host_interval, batch, worker_id)
+                leased.append(task)
+            except Exception as e:
+                logger.error(f"Task {task.id} ({task.kind}) failed: {e}")
+                queue.fail(task)
+
+            if len(batch) >= batch_size or len(leased) >= batch_size:
+                flush()
+            else:
+                renew_held()
+    finally:
+        flush()
+        logger.info(f"Worker {worker_id} stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed news scraping (coordinator/worker)")
+    parser.add_argument("role", choices=["coordinator", "worker"])
+    parser.add_argument("--backend", choices=["sqlite", "redis"], default="sqlite")
+    parser.add_argument("--queue-db", default="./data/work_queue.db", help="SQLite queue file")
+    parser.add_argument("--redis-url", default=None, help="Redis-compatible server (or REDIS_URL)")
+    parser.add_argument("--cache-dir", default="./data")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes on this node")
+    parser.add_argument("--host-interval", type=float, default=DEFAULT_HOST_INTERVAL)
+    parser.add_argument("--idle-exit", type=float, default=None, help="Exit after this many idle seconds")
+    args = parser.parse_args()
+
+    if args.role == "coordinator":
+        from enhanced_news_scraper import EnhancedNewsScraper
+        queue = open_queue(args.backend, args.queue_db, args.redis_url)
+        enqueue_cycle(queue, EnhancedNewsScraper(cache_dir=args.cache_dir).rss_sources)
+        queue.prune()
+        logger.info(f"Queue status: {queue.stats()}")
+        return
+
+    worker_args = (args.backend, args.queue_db, args.redis_url, args.cache_dir, args.host_interval, 10, args.idle_exit)
+    if args.processes <= 1:
+        run_worker(*worker_args)
+        return
+
+    processes = [multiprocessing.Process(target=run_worker, args=worker_args) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
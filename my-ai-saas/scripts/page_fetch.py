@@ -0,0 +1,81 @@
+"""
+Bounded Page Fetching
+Streams article pages with size caps, optionally stopping once the <head> has been read
+
+requests decodes gzip/deflate incrementally while streaming, so caps apply to
+decompressed bytes and an oversized or compressed-bomb page is cut off instead
+of being buffered whole.
+"""
+
+import re
+import logging
+from typing import Dict, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+PAGE_MAX_BYTES = 5 * 1024 * 1024
+HEAD_BYTE_BUDGET = 128 * 1024
+PAGE_READ_CHUNK = 16 * 1024
+
+HEAD_END_PATTERN = re.compile(rb'</head\s*>|<body[\s>]', re.IGNORECASE)
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+class PageTooLarge(Exception):
+    """The page declared or streamed more bytes than allowed"""
+
+def decode_html(body: bytes, response: requests.Response) -> str:
+    """Decode with the declared charset, then a <meta charset>, then UTF-8"""
+    encoding = None
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    if not encoding:
+        match = CHARSET_PATTERN.search(body[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return body.decode(encoding, errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+def fetch_page(url: str, headers: Dict[str, str], head_only: bool = False,
+               head_budget: int = HEAD_BYTE_BUDGET, max_bytes: int = PAGE_MAX_BYTES,
+               timeout: float = 20, session: Optional[requests.Session] = None) -> Tuple[str, bool]:
+    """Fetch a page as text; returns (html, complete)
+
+    complete is False when a head-only read stopped before the end of the page.
+    """
+    getter = session or requests
+    with getter.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type.lower():
+            raise ValueError(f"Not an HTML page ({content_type})")
+        declared = response.headers.get('Content-Length')
+        # A head-only read stops long before max_bytes, so a large page keeps its og:image
+        if not head_only and declared and declared.isdigit() and int(declared) > max_bytes:
+            raise PageTooLarge(f"{url} declares {declared} bytes")
+
+        limit = min(head_budget, max_bytes) if head_only else max_bytes
+        chunks = []
+        size = 0
+        body = response.iter_content(chunk_size=PAGE_READ_CHUNK)
+        for chunk in body:
+            chunks.append(chunk)
+            size += len(chunk)
+            if head_only:
+                # Search only the new chunk plus a small overlap for a tag split across chunks
+                window = b"".join(chunks[-2:])
+                if HEAD_END_PATTERN.search(window):
+                    # A small page usually ends in the chunk holding the marker; then it is complete
+                    rest = next((more for more in body if more), None)
+                    if rest is not None:
+                        chunks.append(rest)
+                    return decode_html(b"".join(chunks), response), rest is None
+                if size >= limit:
+                    logger.debug(f"Head of {url} exceeded {limit} bytes; using what was read")
+                    return decode_html(b"".join(chunks), response), False
+            elif size > limit:
+                raise PageTooLarge(f"{url} exceeded {limit} bytes")
+
+        return decode_html(b"".join(chunks), response), True
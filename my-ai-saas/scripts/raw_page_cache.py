@@ -0,0 +1,149 @@
+"""
+Raw Page Cache
+Content-addressed, gzip-compressed store of fetched article HTML and feed XML
+
+Bodies are stored once per SHA-256 under objects/<2 hex>/<hash>.gz; an SQLite
+index maps URLs to content hashes. When the compressed total exceeds the size
+budget, the least recently used bodies are evicted. The cache lets extraction
+and scoring changes be re-applied to stored articles without refetching them.
+"""
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import tempfile
+import logging
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RAW_CACHE_MAX_BYTES = int(os.getenv("RAW_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+class RawPageCache:
+    """URL -> compressed raw body, deduplicated by content hash"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = RAW_CACHE_MAX_BYTES, compress_level: int = 6):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.db")
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.init_index()
+
+    def init_index(self):
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    content_hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    raw_size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash)')
+
+    def blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.gz")
+
+    def put(self, url: str, body: bytes, kind: str = "html") -> str:
+        """Store a fetched body for url and return its content hash"""
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(content_hash)
+        now = time.time()
+
+        with sqlite3.connect(self.index_path) as conn:
+            known = conn.execute('SELECT 1 FROM blobs WHERE content_hash = ?', (content_hash,)).fetchone()
+            if known:
+                conn.execute('UPDATE blobs SET last_access = ? WHERE content_hash = ?', (now, content_hash))
+            else:
+                compressed = gzip.compress(body, compresslevel=self.compress_level, mtime=0)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Unique temp file: enrich threads may store the same body concurrently
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(compressed)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+                conn.execute(
+                    'INSERT OR REPLACE INTO blobs (content_hash, size, raw_size, last_access) VALUES (?, ?, ?, ?)',
+                    (content_hash, len(compressed), len(body), now)
+                )
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (url, content_hash, kind, fetched_at) VALUES (?, ?, ?, ?)',
+                (url, content_hash, kind, now)
+            )
+            if not known:
+                self.evict(conn)
+
+        return content_hash
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Cached body for url, or None"""
+        with sqlite3.connect(self.index_path) as conn:
+            row = conn.execute('SELECT content_hash FROM pages WHERE url = ?', (url,)).fetchone()
+            if not row:
+                return None
+            try:
+                with open(self.blob_path(row[0]), 'rb') as f:
+                    body = gzip.decompress(f.read())
+            except (OSError, EOFError):
+                conn.execute('DELETE FROM pages WHERE content_hash = ?', (row[0],))
+                conn.execute('DELETE FROM blobs WHERE content_hash = ?', (row[0],))
+                return None
+            conn.execute('UPDATE blobs SET last_access = ? WHERE content_hash = ?', (time.time(), row[0]))
+        return body
+
+    def iter_urls(self, kinds: Sequence[str] = ("html",)) -> Iterator[Tuple[str, str]]:
+        """(url, kind) for every cached page of the given kinds"""
+        placeholders = ", ".join("?" for _ in kinds)
+        with sqlite3.connect(self.index_path) as conn:
+            yield from conn.execute(f'SELECT url, kind FROM pages WHERE kind IN ({placeholders})', tuple(kinds)).fetchall()
+
+    def evict(self, conn: sqlite3.Connection) -> int:
+        """Drop least recently used bodies until the cache fits its budget"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for content_hash, size in conn.execute('SELECT content_hash, size FROM blobs ORDER BY last_access').fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self.blob_path(content_hash))
+            except FileNotFoundError:
+                pass
+            conn.execute('DELETE FROM pages WHERE content_hash = ?', (content_hash,))
+            conn.execute('DELETE FROM blobs WHERE content_hash = ?', (content_hash,))
+            total -= size
+            evicted += 1
+
+        logger.info(f"Evicted {evicted} cached pages to stay under {self.max_bytes} bytes")
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        with sqlite3.connect(self.index_path) as conn:
+            pages = conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            blobs, size, raw_size = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM blobs'
+            ).fetchone()
+        return {"pages": pages, "blobs": blobs, "bytes": size, "raw_bytes": raw_size}
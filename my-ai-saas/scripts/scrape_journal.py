@@ -0,0 +1,223 @@
+"""
+Scrape Run Journal
+Records per-source progress and pending article URLs so interrupted scrape runs can resume
+"""
+
+import os
+import json
+import socket
+import sqlite3
+import logging
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ScrapeRunJournal:
+    """SQLite-backed journal of scrape runs, stored next to news_articles"""
+
+    def __init__(self, db_path: str, max_resume_age_hours: int = 24, stale_after_seconds: int = 300):
+        self.db_path = db_path
+        self.max_resume_age_hours = max_resume_age_hours
+        # A 'running' run whose owner has not written for this long is treated as dead
+        self.stale_after_seconds = stale_after_seconds
+        self.host = socket.gethostname()
+        self.init_tables()
+
+    def init_tables(self):
+        """Create journal tables"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    owner_host TEXT,
+                    owner_pid INTEGER,
+                    heartbeat_at TIMESTAMP
+                )
+            ''')
+            # Journals created before runs had owners
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(scrape_runs)')}
+            for column, kind in (("owner_host", "TEXT"), ("owner_pid", "INTEGER"), ("heartbeat_at", "TIMESTAMP")):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE scrape_runs ADD COLUMN {column} {kind}')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_run_sources (
+                    run_id INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                    entries INTEGER DEFAULT 0,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (run_id, source)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_run_pending (
+                    run_id INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    entry TEXT NOT NULL,
+                    PRIMARY KEY (run_id, url)
+                )
+            ''')
+
+    def owner_alive(self, host: str, pid: int) -> bool:
+        """Whether a run's owner may still be working on it (only checkable on this host)"""
+        if host != self.host or not pid:
+            return True
+        if pid == os.getpid():
+            # This process only starts a new run once its previous one has returned
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def start_run(self) -> Tuple[int, bool]:
+        """Resume the latest resumable run, or start a new one; returns (run_id, resumed)
+
+        Interrupted runs are always resumable. A 'running' run is only taken
+        over once its owner is gone: its process has exited (same host) or it
+        has not sent a heartbeat for stale_after_seconds. Runs still owned by a
+        live process are left alone.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            # Serialize takeovers between processes sharing the journal
+            conn.execute('BEGIN IMMEDIATE')
+            # Runs that are too old are not worth resuming: their feeds have moved on
+            conn.execute('''
+                UPDATE scrape_runs SET status = 'abandoned', finished_at = CURRENT_TIMESTAMP
+                WHERE status IN ('running', 'interrupted')
+                  AND started_at < datetime('now', ?)
+            ''', (f'-{self.max_resume_age_hours} hours',))
+            conn.execute('''
+                DELETE FROM scrape_run_pending
+                WHERE run_id IN (SELECT run_id FROM scrape_runs WHERE status = 'abandoned')
+            ''')
+
+            rows = conn.execute('''
+                SELECT run_id, status, owner_host, owner_pid,
+                       COALESCE(heartbeat_at, started_at) < datetime('now', ?) AS stale
+                FROM scrape_runs
+                WHERE status IN ('running', 'interrupted')
+                ORDER BY run_id DESC
+            ''', (f'-{self.stale_after_seconds} seconds',)).fetchall()
+            for run_id, status, host, pid, stale in rows:
+                if status == 'running' and not stale and self.owner_alive(host, pid):
+                    logger.info(f"Scrape run {run_id} is still owned by {host}:{pid}; not resuming it")
+                    continue
+                self.claim(conn, run_id)
+                logger.info(f"Resuming {status} scrape run {run_id}")
+                return run_id, True
+
+            cursor = conn.execute("INSERT INTO scrape_runs (status) VALUES ('running')")
+            self.claim(conn, cursor.lastrowid)
+            return cursor.lastrowid, False
+
+    def claim(self, conn: sqlite3.Connection, run_id: int):
+        conn.execute('''
+            UPDATE scrape_runs SET status = 'running', owner_host = ?, owner_pid = ?, heartbeat_at = CURRENT_TIMESTAMP
+            WHERE run_id = ?
+        ''', (self.host, os.getpid(), run_id))
+
+    def heartbeat(self, run_id: int):
+        """Show other processes that this run's owner is still working on it"""
+        with sqlite3.connect(self.db_path) as conn:
+            self.touch(conn, run_id)
+
+    def touch(self, conn: sqlite3.Connection, run_id: int):
+        conn.execute('UPDATE scrape_runs SET heartbeat_at = CURRENT_TIMESTAMP WHERE run_id = ?', (run_id,))
+
+    def fetched_sources(self, run_id: int) -> Set[str]:
+        """Sources whose feed was already fetched in this run"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('SELECT source FROM scrape_run_sources WHERE run_id = ?', (run_id,))
+            return {row[0] for row in rows}
+
+    def record_source_entries(self, run_id: int, source: str, entries: Iterable[Any]):
+        """Mark a source fetched and journal its entries as pending"""
+        rows = []
+        for entry in entries:
+            url = getattr(entry, 'link', '')
+            if url:
+                rows.append((run_id, url, source, json.dumps(self.serialize_entry(entry))))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO scrape_run_pending (run_id, url, source, entry) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO scrape_run_sources (run_id, source, entries) VALUES (?, ?, ?)',
+                (run_id, source, len(rows))
+            )
+            self.touch(conn, run_id)
+
+    def pending_entries(self, run_id: int) -> List[Tuple[str, Any]]:
+        """Entries fetched in this run that were never saved or rejected"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT source, entry FROM scrape_run_pending WHERE run_id = ? ORDER BY rowid', (run_id,)
+            ).fetchall()
+        return [(source, self.deserialize_entry(json.loads(entry))) for source, entry in rows]
+
+    def resolve_entries(self, run_id: int, urls: List[str]):
+        """Drop entries that have been saved or rejected"""
+        if not urls:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'DELETE FROM scrape_run_pending WHERE run_id = ? AND url = ?',
+                [(run_id, url) for url in urls]
+            )
+            self.touch(conn, run_id)
+
+    def mark_interrupted(self, run_id: int):
+        """Leave the run resumable after a graceful shutdown"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE scrape_runs SET status = 'interrupted' WHERE run_id = ?", (run_id,))
+
+    def finish_run(self, run_id: int):
+        """Mark the run complete and drop its journal entries"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE scrape_runs SET status = 'completed', finished_at = CURRENT_TIMESTAMP WHERE run_id = ?",
+                (run_id,)
+            )
+            conn.execute('DELETE FROM scrape_run_pending WHERE run_id = ?', (run_id,))
+
+    def get_run_status(self, run_id: int) -> Dict[str, Any]:
+        """Progress summary for logging"""
+        with sqlite3.connect(self.db_path) as conn:
+            status = conn.execute('SELECT status FROM scrape_runs WHERE run_id = ?', (run_id,)).fetchone()
+            sources = conn.execute('SELECT COUNT(*) FROM scrape_run_sources WHERE run_id = ?', (run_id,)).fetchone()
+            pending = conn.execute('SELECT COUNT(*) FROM scrape_run_pending WHERE run_id = ?', (run_id,)).fetchone()
+        return {
+            "run_id": run_id,
+            "status": status[0] if status else None,
+            "sources_fetched": sources[0],
+            "pending_entries": pending[0]
+        }
+
+    @staticmethod
+    def serialize_entry(entry: Any) -> Dict[str, Any]:
+        """Keep only the entry fields the scraper reads"""
+        published = getattr(entry, 'published_parsed', None)
+        data = {
+            "link": getattr(entry, 'link', ''),
+            "title": getattr(entry, 'title', 'No Title'),
+            "published_parsed": list(published)[:9] if published else None
+        }
+        if hasattr(entry, 'summary'):
+            data["summary"] = entry.summary
+        return data
+
+    @staticmethod
+    def deserialize_entry(data: Dict[str, Any]) -> Any:
+        """Rebuild an object with the same attribute access as a feedparser entry"""
+        if data.get("published_parsed"):
+            data["published_parsed"] = tuple(data["published_parsed"])
+        return SimpleNamespace(**data)
@@ -0,0 +1,152 @@
+"""EnhancedNewsScraper storage behaviour that does not need the network"""
+
+import sys
+import time
+import pickle
+import asyncio
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+from enhanced_news_scraper import EnhancedNewsArticle, EnhancedNewsScraper, new_article_id, utc_now_naive
+
+@pytest.fixture
+def scraper(tmp_path):
+    return EnhancedNewsScraper(cache_dir=str(tmp_path))
+
+def insert_article(scraper, url: str, published_at: str, source: str = "Test"):
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute(
+            'INSERT INTO news_articles (id, title, url, category, source, published_at, quality_score, content_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, url, url, "World", source, published_at, 5, url)
+        )
+
+def test_undated_entries_are_stamped_in_utc(scraper):
+    stamped = datetime.fromisoformat(scraper.parse_date(SimpleNamespace(published_parsed=None)))
+    assert abs((stamped - utc_now_naive()).total_seconds()) < 5
+
+def test_watermark_ignores_future_dates(scraper):
+    past = utc_now_naive() - timedelta(hours=2)
+    insert_article(scraper, "https://example.com/a", past.isoformat())
+    insert_article(scraper, "https://example.com/b", (utc_now_naive() + timedelta(hours=3)).isoformat())
+    assert scraper.get_source_watermark("Test") == past
+
+def fake_search(scraper, monkeypatch, script: str):
+    monkeypatch.setattr(scraper, "twitter_search_available", lambda: True)
+    monkeypatch.setattr(scraper, "twitter_search_command", lambda query, since_id: [sys.executable, "-c", script])
+
+TWEETS_SCRIPT = """
+import json
+for tweet_id in (101, 102):
+    print(json.dumps({"id": tweet_id, "content": "x" * 80 + str(tweet_id), "date": None}), flush=True)
+"""
+
+def test_stalled_twitter_search_is_killed_at_timeout(scraper, monkeypatch):
+    fake_search(scraper, monkeypatch, "import time; time.sleep(60)")
+
+    async def drain():
+        return [article async for article in scraper.stream_twitter_articles(term_timeout=0.5)]
+
+    started = time.monotonic()
+    assert asyncio.run(drain()) == []
+    assert time.monotonic() - started < 10
+    assert scraper.get_twitter_since_ids() == {}
+
+def test_twitter_since_ids_advance_only_after_save(scraper, monkeypatch):
+    fake_search(scraper, monkeypatch, TWEETS_SCRIPT)
+
+    def failing_save(articles):
+        raise sqlite3.OperationalError("disk I/O error")
+    monkeypatch.setattr(scraper, "save_articles", failing_save)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(scraper.ingest_twitter_articles())
+    assert scraper.get_twitter_since_ids() == {}
+
+    monkeypatch.undo()
+    fake_search(scraper, monkeypatch, TWEETS_SCRIPT)
+    assert asyncio.run(scraper.ingest_twitter_articles()) == 2
+    assert set(scraper.get_twitter_since_ids().values()) == {102}
+
+def test_stop_request_does_not_outlive_its_run(scraper, monkeypatch):
+    async def no_tweets():
+        return 0
+    monkeypatch.setattr(scraper, "ingest_twitter_articles", no_tweets)
+    scraper.rss_sources = {}
+
+    scraper.request_stop()
+    asyncio.run(scraper.run_full_scrape())
+    run_id, resumed = scraper.journal.start_run()
+    assert resumed is False
+    assert scraper.journal.get_run_status(run_id - 1)["status"] == "completed"
+
+def test_sink_flushes_on_interval_while_stream_is_idle(scraper, monkeypatch):
+    batches = []
+    def record_save(articles):
+        batches.append([article.url for article in articles])
+        return len(articles)
+    monkeypatch.setattr(scraper, "save_articles", record_save)
+
+    async def slow_stream():
+        yield EnhancedNewsArticle(id=new_article_id(), title="First", summary="", url="https://example.com/first")
+        # A slow source: the first article should be written while we wait on it
+        for _ in range(50):
+            if batches:
+                break
+            await asyncio.sleep(0.1)
+        yield EnhancedNewsArticle(id=new_article_id(), title="Second", summary="", url="https://example.com/second")
+
+    saved = asyncio.run(scraper.sink_articles(slow_stream(), batch_size=20, flush_interval=0.2))
+    assert saved == 2
+    assert batches == [["https://example.com/first"], ["https://example.com/second"]]
+
+def test_articles_are_slotted():
+    article = EnhancedNewsArticle(id=new_article_id(), title="T", summary="", url="https://example.com/s",
+                                  category="World")
+    assert not hasattr(article, "__dict__")
+    with pytest.raises(AttributeError):
+        article.unknown = 1
+    assert article.source == "Unknown" and article.video_ids == ()
+    assert asdict(pickle.loads(pickle.dumps(article))) == asdict(article)
+
+def test_stop_with_a_full_entry_queue_finishes(scraper, monkeypatch):
+    entries = [SimpleNamespace(link=f"https://example.com/{i}") for i in range(50)]
+    monkeypatch.setattr(scraper, "fetch_feed_entries", lambda source_name, rss_url: entries)
+
+    def build_article(source_name, entry):
+        if entry.link.endswith("/3"):
+            scraper.request_stop()
+        return EnhancedNewsArticle(id=new_article_id(), title=entry.link, summary="", url=entry.link)
+    monkeypatch.setattr(scraper, "build_article", build_article)
+
+    async def drain():
+        stream = scraper.stream_articles({"Test": "https://example.com/feed"}, enrich_workers=2, queue_size=2)
+        return [article async for article in stream]
+
+    articles = asyncio.run(asyncio.wait_for(drain(), timeout=10))
+    assert 0 < len(articles) < len(entries)
+
+def change_log_urls(scraper):
+    with sqlite3.connect(scraper.db_path) as conn:
+        return [row[0] for row in conn.execute('SELECT url FROM news_changes ORDER BY seq')]
+
+def test_cleanup_trims_change_log_without_sync_target(scraper):
+    now = utc_now_naive()
+    insert_article(scraper, "https://example.com/old", (now - timedelta(days=30)).isoformat())
+    insert_article(scraper, "https://example.com/new", now.isoformat())
+    scraper.cleanup_old_articles(days_to_keep=7)
+    assert change_log_urls(scraper) == []
+
+def test_cleanup_keeps_changes_a_sync_target_has_not_read(scraper):
+    insert_article(scraper, "https://example.com/synced", utc_now_naive().isoformat())
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute("INSERT INTO sync_state (target, last_seq) SELECT 'supabase', MAX(seq) FROM news_changes")
+    insert_article(scraper, "https://example.com/pending", utc_now_naive().isoformat())
+    scraper.cleanup_old_articles(days_to_keep=7)
+    assert change_log_urls(scraper) == ["https://example.com/pending"]
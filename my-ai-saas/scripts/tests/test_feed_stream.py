@@ -0,0 +1,54 @@
+"""Streaming feed reader: skipping is by stored URL only, dates are just a stop hint"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("lxml")
+
+from feed_stream import StreamReader, stream_feed_entries
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk: int = 64):
+        self.body = body
+        self.chunk = chunk
+
+    def iter_content(self, chunk_size: int = 1024):
+        for start in range(0, len(self.body), self.chunk):
+            yield self.body[start:start + self.chunk]
+
+def rss(*items):
+    body = "".join(
+        f"<item><title>{link}</title><link>https://example.com/{link}</link>"
+        f"<pubDate>{date}</pubDate></item>"
+        for link, date in items
+    )
+    return f'<?xml version="1.0"?><rss><channel>{body}</channel></rss>'.encode()
+
+WATERMARK = datetime(2024, 1, 10, 12, 0)
+
+def older(entry) -> bool:
+    return datetime(*entry.published_parsed[:6]) < WATERMARK
+
+def test_unseen_entry_older_than_watermark_is_kept():
+    feed = rss(("new", "Thu, 11 Jan 2024 08:00:00 GMT"), ("late", "Tue, 09 Jan 2024 08:00:00 GMT"))
+    stored = set()
+    entries = list(stream_feed_entries(StreamReader(FakeResponse(feed)), is_seen=lambda e: e.link in stored,
+                                       is_older=older))
+    assert [entry.title for entry in entries] == ["new", "late"]
+
+def test_seen_entry_older_than_watermark_stops_reading():
+    feed = rss(("new", "Thu, 11 Jan 2024 08:00:00 GMT"), ("old", "Tue, 09 Jan 2024 08:00:00 GMT"),
+               ("after", "Mon, 08 Jan 2024 08:00:00 GMT"))
+    stored = {"https://example.com/old"}
+    entries = list(stream_feed_entries(StreamReader(FakeResponse(feed)), is_seen=lambda e: e.link in stored,
+                                       is_older=older))
+    assert [entry.title for entry in entries] == ["new"]
+
+def test_seen_entries_newer_than_watermark_need_a_streak():
+    feed = rss(("a", "Fri, 12 Jan 2024 08:00:00 GMT"), ("b", "Fri, 12 Jan 2024 07:00:00 GMT"),
+               ("c", "Fri, 12 Jan 2024 06:00:00 GMT"))
+    stored = {"https://example.com/a"}
+    entries = list(stream_feed_entries(StreamReader(FakeResponse(feed)), is_seen=lambda e: e.link in stored,
+                                       is_older=older))
+    assert [entry.title for entry in entries] == ["b", "c"]
@@ -0,0 +1,47 @@
+"""Entry points stay cheap to import: heavy backends load on first use"""
+
+import os
+import importlib.util
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+from bench_import_time import DEFAULT_MODULES, LAZY_BACKENDS, SCRIPTS_DIR, eager_backends, measure_import
+
+# Generous so a loaded CI box does not flake; the eager-import check is the strict part
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+@pytest.fixture(scope="module")
+def workdir(tmp_path_factory):
+    """Run the imports elsewhere: news_scheduler opens its log file in the cwd"""
+    return str(tmp_path_factory.mktemp("cwd"))
+
+@pytest.fixture(scope="module")
+def import_env(tmp_path_factory):
+    """Child environment where every lazy backend is importable
+
+    Backends that are not installed get an empty placeholder package, so an
+    eager import shows up in the import-time report instead of being hidden
+    by an ImportError fallback.
+    """
+    placeholders = tmp_path_factory.mktemp("backends")
+    for backend in LAZY_BACKENDS:
+        if importlib.util.find_spec(backend) is None:
+            package = placeholders / backend
+            package.mkdir()
+            (package / "__init__.py").write_text("")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(placeholders), SCRIPTS_DIR, env.get("PYTHONPATH")]))
+    return env
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_entry_point_does_not_import_backends(module, import_env, workdir):
+    _, entries = measure_import(module, env=import_env, cwd=workdir)
+    assert eager_backends(entries) == []
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_entry_point_import_time(module, import_env, workdir):
+    total = min(measure_import(module, env=import_env, cwd=workdir)[0] for _ in range(3))
+    assert total < IMPORT_BUDGET_MS, f"import {module} took {total:.1f} ms"
@@ -0,0 +1,47 @@
+"""find_media_urls against the page corpus in tests/fixtures/media_pages"""
+
+import glob
+import json
+import os
+import re
+
+import pytest
+
+import media_urls
+from bench_media_urls import synthetic_corpus
+from media_urls import find_media_urls
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "media_pages")
+
+def load_pages():
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+def test_corpus_pages_match_expected_urls():
+    with open(os.path.join(PAGES_DIR, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    assert {name: find_media_urls(page) for name, page in load_pages().items()} == expected
+
+@pytest.mark.parametrize("text, found", [
+    ("https://x.com/AP/status/1/video/1", ["https://twitter.com/i/status/1"]),
+    ("x.com/AP/status/2/video/1", ["https://twitter.com/i/status/2"]),
+    ("https://www.x.com/AP/status/3/video/1", ["https://twitter.com/i/status/3"]),
+    ("https://fox.com/news/status/4/video/1", []),
+    ("https://fox.com/news/status/4/video/1 https://x.com/AP/status/5/video/1", ["https://twitter.com/i/status/5"]),
+])
+def test_x_links_need_a_host_boundary(text, found):
+    assert find_media_urls(text, kinds=("twitter",))["twitter"] == found
+
+def test_merged_scan_matches_a_single_alternation():
+    # The straightforward (slow) pattern the per-branch scan must agree with
+    branches = [branch for kind in media_urls.MEDIA_KINDS for branch in media_urls._BRANCHES[kind]]
+    branches = [branch.replace(r"x\.com/", r"(?:^|(?<=[/.]))x\.com/", 1) if "x_tweet_id" in branch else branch
+                for branch in branches]
+    reference = re.compile("|".join(branches))
+    overlapping = "https://cdn.example.com/youtu.be/abcdefghijk.mp4 youtu.be/abcdefghijk twitter.com/a/status/1/video/1"
+    for text in [overlapping, *load_pages().values(), *synthetic_corpus(40)]:
+        expected = [(match.span(), match.lastgroup) for match in reference.finditer(text)]
+        assert [(match.span(), match.lastgroup) for match in media_urls.iter_media_matches(text)] == expected
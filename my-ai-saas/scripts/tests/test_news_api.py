@@ -0,0 +1,59 @@
+"""Read API response cache against a database written by EnhancedNewsScraper"""
+
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import news_api
+from enhanced_news_scraper import EnhancedNewsScraper, utc_now_naive
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    scraper = EnhancedNewsScraper(cache_dir=str(tmp_path))
+    monkeypatch.setattr(news_api, "NEWS_DB_PATH", scraper.db_path)
+    monkeypatch.setattr(news_api, "GENERATION_CHECK_SECONDS", 0)
+    news_api.invalidate_cache()
+    yield scraper
+    news_api.invalidate_cache()
+
+@pytest.fixture
+def client():
+    return TestClient(news_api.app)
+
+def insert_article(scraper, url: str, published_at: str):
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute(
+            'INSERT INTO news_articles (id, title, url, category, source, published_at, quality_score, content_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, url, url, "World", "Test", published_at, 5, url)
+        )
+
+def latest_urls(client):
+    return [article["url"] for article in client.get("/api/news/latest").json()["articles"]]
+
+def test_deletes_invalidate_cached_listings(scraper, client):
+    now = utc_now_naive()
+    insert_article(scraper, "https://example.com/old", (now - timedelta(days=30)).isoformat())
+    insert_article(scraper, "https://example.com/new", now.isoformat())
+    assert latest_urls(client) == ["https://example.com/new", "https://example.com/old"]
+
+    scraper.cleanup_old_articles(days_to_keep=7)
+    assert latest_urls(client) == ["https://example.com/new"]
+
+def test_generation_survives_change_log_pruning(scraper):
+    insert_article(scraper, "https://example.com/a", utc_now_naive().isoformat())
+    generation = news_api._read_generation()
+    assert generation > 0
+
+    # What news_pg_sync.prune_changes does once every target has caught up
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute('DELETE FROM news_changes')
+    assert news_api._read_generation() == generation
@@ -0,0 +1,108 @@
+"""Incremental sync against a throwaway local Postgres standing in for Supabase"""
+
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+psycopg2 = pytest.importorskip("psycopg2")
+pgserver = pytest.importorskip("pgserver")
+
+from enhanced_news_scraper import EnhancedNewsScraper, utc_now_naive
+from news_pg_sync import PostgresNewsSync
+
+UPSTREAM_TABLE = '''
+    CREATE TABLE news_articles (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        title TEXT NOT NULL,
+        summary TEXT,
+        url TEXT NOT NULL UNIQUE,
+        image_url TEXT,
+        video_url TEXT,
+        youtube_url TEXT,
+        category TEXT DEFAULT 'General',
+        source TEXT,
+        published_at TIMESTAMPTZ DEFAULT NOW(),
+        quality_score INTEGER DEFAULT 0,
+        content_hash TEXT,
+        created_at TIMESTAMPTZ DEFAULT NOW(),
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    )
+'''
+
+@pytest.fixture
+def upstream_dsn(tmp_path):
+    server = pgserver.get_server(str(tmp_path / "pg"), cleanup_mode="stop")
+    try:
+        dsn = server.get_uri()
+        with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+            cursor.execute(UPSTREAM_TABLE)
+        yield dsn
+    finally:
+        server.cleanup()
+
+def upstream_urls(dsn):
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+        cursor.execute('SELECT url FROM news_articles ORDER BY url')
+        return [row[0] for row in cursor.fetchall()]
+
+def insert_article(scraper, url: str, published_at: str):
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute(
+            'INSERT INTO news_articles (id, title, url, category, source, published_at, quality_score, content_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, url, url, "World", "Test", published_at, 5, url)
+        )
+
+def test_cleanup_deletes_reach_upstream(tmp_path, upstream_dsn):
+    scraper = EnhancedNewsScraper(cache_dir=str(tmp_path))
+    now = utc_now_naive()
+    insert_article(scraper, "https://example.com/old", (now - timedelta(days=30)).isoformat())
+    insert_article(scraper, "https://example.com/new", now.isoformat())
+
+    syncer = PostgresNewsSync(scraper.db_path, upstream_dsn)
+    try:
+        assert syncer.sync()["upserted"] == 2
+        assert upstream_urls(upstream_dsn) == ["https://example.com/new", "https://example.com/old"]
+
+        scraper.cleanup_old_articles(days_to_keep=7)
+        stats = syncer.sync()
+        assert stats["deleted"] == 1
+        assert upstream_urls(upstream_dsn) == ["https://example.com/new"]
+
+        # The tombstone was consumed; nothing is sent again
+        assert syncer.sync()["batches"] == 0
+    finally:
+        syncer.close()
+
+def test_deleted_then_reinserted_url_is_upserted(tmp_path, upstream_dsn):
+    scraper = EnhancedNewsScraper(cache_dir=str(tmp_path))
+    url = "https://example.com/back"
+    insert_article(scraper, url, utc_now_naive().isoformat())
+    with sqlite3.connect(scraper.db_path) as conn:
+        conn.execute('DELETE FROM news_articles WHERE url = ?', (url,))
+    insert_article(scraper, url, utc_now_naive().isoformat())
+
+    syncer = PostgresNewsSync(scraper.db_path, upstream_dsn)
+    try:
+        stats = syncer.sync()
+        assert (stats["upserted"], stats["deleted"]) == (1, 0)
+        assert upstream_urls(upstream_dsn) == [url]
+    finally:
+        syncer.close()
+
+def test_first_sync_backfills_a_trimmed_change_log(tmp_path, upstream_dsn):
+    scraper = EnhancedNewsScraper(cache_dir=str(tmp_path))
+    insert_article(scraper, "https://example.com/a", utc_now_naive().isoformat())
+    insert_article(scraper, "https://example.com/b", utc_now_naive().isoformat())
+    # No target registered yet, so cleanup empties the log
+    scraper.cleanup_old_articles(days_to_keep=7)
+
+    syncer = PostgresNewsSync(scraper.db_path, upstream_dsn)
+    try:
+        assert syncer.sync()["upserted"] == 2
+        assert upstream_urls(upstream_dsn) == ["https://example.com/a", "https://example.com/b"]
+    finally:
+        syncer.close()
@@ -0,0 +1,66 @@
+"""Process-mode scheduling: jobs run through the recycled worker, not an in-process scraper"""
+
+import signal
+import importlib
+
+import pytest
+
+pytest.importorskip("apscheduler")
+
+class StubScraper:
+    """Stands in for EnhancedNewsScraper inside the worker process"""
+
+    def __init__(self, cache_dir: str = "./data"):
+        self.cache_dir = cache_dir
+
+    def request_stop(self):
+        pass
+
+    async def run_full_scrape(self):
+        return None
+
+    def cleanup_old_articles(self):
+        return None
+
+@pytest.fixture
+def news_scheduler(tmp_path, monkeypatch):
+    # news_scheduler logs to news_scraper.log in the working directory
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("news_scheduler")
+    # Blocking/process modes install SIGINT/SIGTERM handlers; keep them out of the pytest process
+    monkeypatch.setattr(module.NewsScraperScheduler, "setup_signal_handlers", lambda self: None)
+    return module
+
+def test_process_mode_runs_jobs_in_worker(news_scheduler, tmp_path, monkeypatch):
+    from job_worker import RecyclingJobRunner
+
+    handlers = (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM))
+    scheduler = news_scheduler.NewsScraperScheduler(mode="process", cache_dir=str(tmp_path))
+    assert scheduler.scraper is None
+    scheduler.job_runner = RecyclingJobRunner(StubScraper, {"cache_dir": str(tmp_path)}, max_jobs_per_worker=1)
+
+    calls = []
+    real_run = scheduler.job_runner.run
+    def spy_run(job_id, func, *args, **kwargs):
+        report = real_run(job_id, func, *args, **kwargs)
+        calls.append((job_id, report))
+        return report
+    monkeypatch.setattr(scheduler.job_runner, "run", spy_run)
+    monkeypatch.setattr(scheduler.scheduler, "start", lambda: None)
+    monkeypatch.setattr(news_scheduler.NewsScraperScheduler, "run_async",
+                        lambda self: pytest.fail("process mode must not use the asyncio scheduler"))
+
+    try:
+        scheduler.start()
+    finally:
+        scheduler.job_runner.close()
+
+    # The initial scrape ran in the worker and the cron jobs are wired to the worker too
+    assert [job_id for job_id, _ in calls] == ["daily_full_scrape"]
+    assert calls[0][1]["ok"], calls[0][1]["error"]
+    assert calls[0][1]["pid"] is not None
+    jobs = {job.id: job.func for job in scheduler.scheduler.get_jobs()}
+    assert jobs["hourly_update"] == scheduler.run_hourly_update_in_worker
+    assert jobs["weekly_cleanup"] == scheduler.run_cleanup_in_worker
+    assert scheduler.job_runner.stats["recycled_max_jobs"] == 1
+    assert (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)) == handlers
@@ -0,0 +1,162 @@
+"""Leased work queue on SQLite and on fakeredis (the local stand-in for Redis)"""
+
+import sqlite3
+import sys
+import threading
+import types
+
+import pytest
+
+import news_work_queue
+from news_work_queue import DEFAULT_LEASE_SECONDS, RedisTaskQueue, SQLiteTaskQueue, run_worker
+
+class FakeClock:
+    """Replaces the queue module's time so lease expiry is deterministic"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(seconds, 0)
+
+    def strftime(self, fmt: str) -> str:
+        return "2024010100"
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(news_work_queue, "time", fake)
+    return fake
+
+@pytest.fixture(params=["sqlite", "fakeredis"])
+def queue(request, tmp_path, clock):
+    if request.param == "sqlite":
+        return SQLiteTaskQueue(str(tmp_path / "queue.db"))
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisTaskQueue(fakeredis.FakeRedis())
+
+def test_enqueue_deduplicates(queue):
+    assert queue.enqueue("article", {"n": 1}, "article:https://example.com/a")
+    assert not queue.enqueue("article", {"n": 2}, "article:https://example.com/a")
+    task = queue.lease("w1")
+    assert task.payload == {"n": 1}
+    queue.complete(task)
+    assert queue.lease("w1") is None
+    assert not queue.enqueue("article", {"n": 3}, "article:https://example.com/a")
+
+def test_expired_lease_is_handed_to_another_worker(queue, clock):
+    queue.enqueue("article", {}, "article:a")
+    task = queue.lease("w1")
+    clock.now += DEFAULT_LEASE_SECONDS + 1
+    retry = queue.lease("w2")
+    assert retry is not None and retry.id == task.id and retry.attempts == 2
+    # The first worker lost the task and cannot renew it
+    assert not queue.renew(task, "w1")
+
+def test_renew_keeps_the_lease(queue, clock):
+    queue.enqueue("article", {}, "article:a")
+    task = queue.lease("w1")
+    for _ in range(5):
+        clock.now += DEFAULT_LEASE_SECONDS * 0.75
+        assert queue.renew(task, "w1")
+        assert queue.lease("w2") is None
+
+def test_fail_parks_task_after_max_attempts(queue):
+    queue.enqueue("feed", {}, "feed:a")
+    for _ in range(news_work_queue.MAX_ATTEMPTS):
+        task = queue.lease("w1")
+        assert task is not None
+        queue.fail(task)
+    assert queue.lease("w1") is None
+
+def test_redis_prune_forgets_old_dedup_keys(clock):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    queue = RedisTaskQueue(client)
+    queue.enqueue("feed", {}, "feed:old")
+    clock.now += 8 * 86400
+    queue.enqueue("feed", {}, "feed:recent")
+    queue.prune(days=7)
+
+    assert client.zcard("news:seen_at") == 1
+    assert client.ttl("news:seen_at") == -1  # Aged out by score, not by expiring the whole key
+    assert queue.enqueue("feed", {}, "feed:old")
+    assert not queue.enqueue("feed", {}, "feed:recent")
+
+def test_worker_holds_leases_while_batch_fills(tmp_path, clock, monkeypatch):
+    """Slow article fetches must not let earlier tasks in the batch expire"""
+    queue_path = str(tmp_path / "queue.db")
+    queue = SQLiteTaskQueue(queue_path)
+    for index in range(6):
+        queue.enqueue("article", {"source": "Test", "entry": {"link": f"https://example.com/{index}", "title": "t"}},
+                      f"article:{index}")
+
+    built, saved, lapsed = [], [], []
+
+    class StubScraper:
+        def __init__(self, cache_dir: str):
+            self.stop_requested = threading.Event()
+
+        def build_article(self, source, entry):
+            clock.now += 50  # Six of these take far longer than one lease
+            with sqlite3.connect(queue_path) as conn:
+                lapsed.extend(conn.execute(
+                    "SELECT id FROM work_tasks WHERE status = 'leased' AND lease_expires < ?", (clock.now,)
+                ).fetchall())
+            built.append(entry.link)
+            return entry.link
+
+        def save_articles(self, articles):
+            saved.extend(articles)
+
+    monkeypatch.setitem(sys.modules, "enhanced_news_scraper", types.SimpleNamespace(EnhancedNewsScraper=StubScraper))
+    run_worker("sqlite", queue_path, None, str(tmp_path), host_interval=0, batch_size=10, idle_exit=0)
+
+    assert lapsed == []
+    assert sorted(built) == sorted(saved) == sorted(f"https://example.com/{index}" for index in range(6))
+    assert queue.stats() == {"done": 6}
+
+def run_stub_worker(tmp_path, monkeypatch, failures: int):
+    """Run a worker over three article tasks whose first `failures` saves raise"""
+    queue_path = str(tmp_path / "queue.db")
+    queue = SQLiteTaskQueue(queue_path)
+    for index in range(3):
+        queue.enqueue("article", {"source": "Test", "entry": {"link": f"https://example.com/{index}", "title": "t"}},
+                      f"article:{index}")
+    attempts, saved = [], []
+
+    class StubScraper:
+        def __init__(self, cache_dir: str):
+            self.stop_requested = threading.Event()
+
+        def build_article(self, source, entry):
+            return entry.link
+
+        def save_articles(self, articles):
+            attempts.append(list(articles))
+            if len(attempts) <= failures:
+                raise sqlite3.OperationalError("database is locked")
+            saved.extend(articles)
+            return len(articles)
+
+    monkeypatch.setitem(sys.modules, "enhanced_news_scraper", types.SimpleNamespace(EnhancedNewsScraper=StubScraper))
+    run_worker("sqlite", queue_path, None, str(tmp_path), host_interval=0, batch_size=10, idle_exit=0)
+    return queue, attempts, saved
+
+def test_failed_save_returns_tasks_to_the_queue(tmp_path, clock, monkeypatch):
+    queue, attempts, saved = run_stub_worker(tmp_path, monkeypatch, failures=1)
+    assert len(attempts) == 2
+    assert sorted(saved) == [f"https://example.com/{index}" for index in range(3)]
+    assert queue.stats() == {"done": 3}
+
+def test_tasks_whose_saves_keep_failing_are_parked(tmp_path, clock, monkeypatch):
+    queue, attempts, saved = run_stub_worker(tmp_path, monkeypatch, failures=100)
+    assert saved == []
+    assert len(attempts) == news_work_queue.MAX_ATTEMPTS
+    assert queue.stats() == {"failed": 3}
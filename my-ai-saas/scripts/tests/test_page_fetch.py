@@ -0,0 +1,62 @@
+"""Bounded and head-only page reads"""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from page_fetch import PAGE_READ_CHUNK, PageTooLarge, fetch_page
+
+HEAD = b"<html><head><title>t</title><meta property='og:title' content='t'></head>"
+
+class FakeResponse:
+    """A streamed response that records how many chunks were read"""
+
+    def __init__(self, body: bytes, headers=None):
+        self.body = body
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+        self.encoding = "utf-8"
+        self.chunks_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.body), chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + chunk_size]
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+def test_small_page_read_head_only_is_complete():
+    response = FakeResponse(HEAD + b"<body><p>short</p></body></html>")
+    html, complete = fetch_page("https://example.com/a", {}, head_only=True, session=FakeSession(response))
+    assert complete
+    assert html.endswith("</html>")
+
+def test_large_page_read_head_only_stops_early():
+    response = FakeResponse(HEAD + b"<body>" + b"x" * (PAGE_READ_CHUNK * 20) + b"</body></html>")
+    html, complete = fetch_page("https://example.com/a", {}, head_only=True, session=FakeSession(response))
+    assert not complete
+    assert "og:title" in html
+    assert response.chunks_read <= 2
+
+def test_declared_size_cap_applies_only_to_full_reads():
+    body = HEAD + b"<body>" + b"x" * (PAGE_READ_CHUNK * 4) + b"</body></html>"
+    headers = {"Content-Length": str(10 * 1024 * 1024)}
+    html, complete = fetch_page("https://example.com/a", {}, head_only=True, max_bytes=1024,
+                                session=FakeSession(FakeResponse(body, headers)))
+    assert "og:title" in html and not complete
+
+    with pytest.raises(PageTooLarge):
+        fetch_page("https://example.com/a", {}, max_bytes=1024, session=FakeSession(FakeResponse(body, headers)))
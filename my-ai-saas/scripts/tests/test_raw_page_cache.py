@@ -0,0 +1,38 @@
+"""Raw page cache: concurrent writers, round trips and eviction"""
+
+import threading
+
+from raw_page_cache import RawPageCache
+
+def test_concurrent_puts_of_same_body(tmp_path):
+    cache = RawPageCache(str(tmp_path))
+    body = b"<html>" + b"x" * 200_000 + b"</html>"
+    errors = []
+    start = threading.Barrier(8)
+
+    def put(index: int):
+        start.wait()
+        try:
+            for round_ in range(20):
+                cache.put(f"https://example.com/{index}/{round_}", body)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get("https://example.com/3/7") == body
+    assert cache.stats()["blobs"] == 1
+    assert not list(tmp_path.glob("objects/*/*.tmp"))
+
+def test_eviction_keeps_budget(tmp_path):
+    cache = RawPageCache(str(tmp_path), max_bytes=4096, compress_level=0)
+    for index in range(10):
+        cache.put(f"https://example.com/{index}", bytes([index]) * 1500)
+    assert cache.stats()["bytes"] <= 4096
+    assert cache.get("https://example.com/9") == bytes([9]) * 1500
+    assert cache.get("https://example.com/0") is None
@@ -0,0 +1,67 @@
+"""Which unfinished runs ScrapeRunJournal resumes"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from scrape_journal import ScrapeRunJournal
+
+@pytest.fixture
+def journal(tmp_path):
+    return ScrapeRunJournal(str(tmp_path / "news.db"))
+
+def set_owner(journal, run_id: int, host: str, pid: int, heartbeat_age_seconds: int = 0):
+    with sqlite3.connect(journal.db_path) as conn:
+        conn.execute(
+            "UPDATE scrape_runs SET owner_host = ?, owner_pid = ?, heartbeat_at = datetime('now', ?) WHERE run_id = ?",
+            (host, pid, f'-{heartbeat_age_seconds} seconds', run_id)
+        )
+
+def dead_pid() -> int:
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    return child.pid
+
+def test_run_owned_by_live_process_is_not_resumed(journal):
+    run_id, _ = journal.start_run()
+    set_owner(journal, run_id, journal.host, os.getppid())
+    new_run, resumed = journal.start_run()
+    assert (new_run != run_id, resumed) == (True, False)
+
+def test_run_of_exited_process_is_resumed(journal):
+    run_id, _ = journal.start_run()
+    set_owner(journal, run_id, journal.host, dead_pid())
+    assert journal.start_run() == (run_id, True)
+
+def test_run_on_other_host_is_resumed_once_heartbeat_is_stale(journal):
+    run_id, _ = journal.start_run()
+    set_owner(journal, run_id, "other-host", 1)
+    new_run, resumed = journal.start_run()
+    assert resumed is False
+    journal.finish_run(new_run)
+
+    set_owner(journal, run_id, "other-host", 1, heartbeat_age_seconds=journal.stale_after_seconds + 60)
+    assert journal.start_run() == (run_id, True)
+
+def test_interrupted_run_is_resumed(journal):
+    run_id, _ = journal.start_run()
+    set_owner(journal, run_id, "other-host", 1)
+    journal.mark_interrupted(run_id)
+    assert journal.start_run() == (run_id, True)
+
+def test_journal_created_before_run_owners_is_migrated(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE scrape_runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL DEFAULT 'running',
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        conn.execute("INSERT INTO scrape_runs (status) VALUES ('interrupted')")
+    assert ScrapeRunJournal(db_path).start_run() == (1, True)
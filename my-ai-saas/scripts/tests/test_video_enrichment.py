@@ -0,0 +1,63 @@
+"""YouTubeEnricher against recorded extract_info responses (tests/fixtures/youtube)"""
+
+import asyncio
+import os
+import sqlite3
+
+import pytest
+
+from video_enrichment import YouTubeEnricher, fixture_extractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "youtube")
+
+@pytest.fixture
+def enricher(tmp_path):
+    return YouTubeEnricher(str(tmp_path / "news.db"), extract_info=fixture_extractor(FIXTURES_DIR))
+
+def test_lookups_go_memory_then_sqlite_then_extractor(enricher):
+    results = asyncio.run(enricher.enrich_ids(["dQw4w9WgXcQ", "jNQXAC9IVRw", "unknown0000"]))
+    assert results["jNQXAC9IVRw"] == {"id": "jNQXAC9IVRw", "title": "Me at the zoo", "duration": 19,
+                                      "thumbnail": "https://i.ytimg.com/vi/jNQXAC9IVRw/maxresdefault.jpg",
+                                      "channel": "jawed"}
+    assert set(results) == {"dQw4w9WgXcQ", "jNQXAC9IVRw"}
+    assert enricher.stats == {"memory_hits": 0, "db_hits": 0, "lookups": 3, "failures": 1}
+
+    # Failures are cached too, so nothing is looked up again
+    asyncio.run(enricher.enrich_ids(["dQw4w9WgXcQ", "unknown0000"]))
+    assert enricher.stats["memory_hits"] == 1 and enricher.stats["lookups"] == 3
+
+    restarted = YouTubeEnricher(enricher.db_path, extract_info=fixture_extractor(FIXTURES_DIR))
+    assert asyncio.run(restarted.enrich_ids(["dQw4w9WgXcQ"]))["dQw4w9WgXcQ"]["duration"] == 213
+    assert restarted.stats["db_hits"] == 1 and restarted.stats["lookups"] == 0
+
+def article_videos(db_path: str):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT article_url, video_id, position FROM article_videos ORDER BY position').fetchall()
+
+def test_article_videos_are_written_with_the_article(tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("lxml")
+    from enhanced_news_scraper import EnhancedNewsArticle, EnhancedNewsScraper, new_article_id
+
+    scraper = EnhancedNewsScraper(cache_dir=str(tmp_path), enrich_videos=True)
+    scraper.video_enricher.extract_info = fixture_extractor(FIXTURES_DIR)
+    article = EnhancedNewsArticle(
+        id=new_article_id(), title="Zoo", summary="A video", url="https://example.com/zoo",
+        youtube_url="https://www.youtube.com/watch?v=jNQXAC9IVRw", video_ids=("dQw4w9WgXcQ",),
+        content_hash="zoo"
+    )
+
+    async def stream():
+        yield article
+
+    async def enrich_only():
+        return [item async for item in scraper.video_enricher.enrich_stream(stream())]
+
+    asyncio.run(enrich_only())
+    assert article.video_ids == ("jNQXAC9IVRw", "dQw4w9WgXcQ")
+    assert article_videos(scraper.db_path) == []  # Nothing is linked to an article that was never saved
+
+    assert scraper.save_articles([article]) == 1
+    assert article_videos(scraper.db_path) == [
+        ("https://example.com/zoo", "jNQXAC9IVRw", 0), ("https://example.com/zoo", "dQw4w9WgXcQ", 1)
+    ]
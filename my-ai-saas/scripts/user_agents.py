@@ -0,0 +1,30 @@
+"""
+User-Agent Pool
+Rotating browser User-Agent strings from the bundled user_agents.txt (no network access)
+"""
+
+import os
+import random
+from typing import List, Optional
+
+USER_AGENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "user_agents.txt")
+
+class UserAgentPool:
+    """Drop-in for fake_useragent.UserAgent().random, loaded once per process"""
+
+    def __init__(self, path: str = USER_AGENTS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.agents: List[str] = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    @property
+    def random(self) -> str:
+        return random.choice(self.agents)
+
+_pool: Optional[UserAgentPool] = None
+
+def get_user_agent_pool() -> UserAgentPool:
+    """Shared pool; the list is read on first use"""
+    global _pool
+    if _pool is None:
+        _pool = UserAgentPool()
+    return _pool
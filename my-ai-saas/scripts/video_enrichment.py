@@ -0,0 +1,269 @@
+"""
+YouTube Video Enrichment
+Resolves video ids found in articles to title, duration and thumbnail via yt_dlp (no download)
+
+Lookups go through an in-process TTL/LRU cache backed by a SQLite table, so
+popular videos are resolved once across articles and runs. Misses are looked
+up in batches with bounded concurrency. For offline runs, the extractor can be
+swapped for recorded JSON fixtures (see fixture_extractor / recording_extractor).
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import argparse
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from media_urls import youtube_video_id
+
+logger = logging.getLogger(__name__)
+
+ExtractInfo = Callable[[str], Optional[Dict[str, Any]]]
+
+def ytdlp_extractor(video_id: str) -> Optional[Dict[str, Any]]:
+    """Metadata-only lookup through yt_dlp"""
+    import yt_dlp
+
+    options = {"quiet": True, "no_warnings": True, "skip_download": True, "noplaylist": True}
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+
+def fixture_extractor(fixtures_dir: str) -> ExtractInfo:
+    """Replay recorded extract_info responses (<video_id>.json) without network access"""
+    def extract(video_id: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(fixtures_dir, f"{video_id}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return extract
+
+def recording_extractor(fixtures_dir: str, extract: ExtractInfo = ytdlp_extractor) -> ExtractInfo:
+    """Wrap a live extractor and save the fields we use as fixtures"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    def record(video_id: str) -> Optional[Dict[str, Any]]:
+        info = extract(video_id)
+        if info:
+            with open(os.path.join(fixtures_dir, f"{video_id}.json"), 'w', encoding='utf-8') as f:
+                json.dump(summarize_info(video_id, info), f, indent=2)
+        return info
+    return record
+
+def summarize_info(video_id: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields stored for a video"""
+    thumbnail = info.get("thumbnail")
+    if not thumbnail and info.get("thumbnails"):
+        thumbnail = info["thumbnails"][-1].get("url")
+    return {
+        "id": video_id,
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "thumbnail": thumbnail,
+        "channel": info.get("channel") or info.get("uploader"),
+    }
+
+class TTLCache:
+    """Small LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_items: int = 2048, ttl_seconds: float = 3600):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._items.get(key)
+        if item is None:
+            return default
+        if item[0] < time.monotonic():
+            del self._items[key]
+            return default
+        self._items.move_to_end(key)
+        return item[1]
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        self._items[key] = (time.monotonic() + (ttl_seconds or self.ttl_seconds), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+_MISSING = object()
+
+class YouTubeEnricher:
+    """Cached, concurrency-limited video metadata lookups"""
+
+    def __init__(self, db_path: str, extract_info: Optional[ExtractInfo] = None, max_concurrency: int = 4,
+                 ttl_seconds: int = 7 * 86400, negative_ttl_seconds: int = 3600, memory_items: int = 2048):
+        self.db_path = db_path
+        self.extract_info = extract_info or ytdlp_extractor
+        self.max_concurrency = max_concurrency
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.cache = TTLCache(memory_items, ttl_seconds)
+        self.stats = {"memory_hits": 0, "db_hits": 0, "lookups": 0, "failures": 0}
+        self.init_tables()
+
+    def init_tables(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS video_metadata (
+                    video_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    duration INTEGER,
+                    thumbnail TEXT,
+                    channel TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS article_videos (
+                    article_url TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    position INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (article_url, video_id)
+                )
+            ''')
+
+    def load_stored(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fresh rows from the persistent cache"""
+        if not video_ids:
+            return {}
+        cutoff = time.time() - self.ttl_seconds
+        placeholders = ", ".join("?" for _ in video_ids)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f'''
+                SELECT video_id AS id, title, duration, thumbnail, channel FROM video_metadata
+                WHERE video_id IN ({placeholders}) AND fetched_at >= ?
+            ''', (*video_ids, cutoff)).fetchall()
+        return {row["id"]: dict(row) for row in rows}
+
+    def store(self, results: Dict[str, Dict[str, Any]]):
+        if not results:
+            return
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO video_metadata (video_id, title, duration, thumbnail, channel, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (video_id, meta.get("title"), meta.get("duration"), meta.get("thumbnail"), meta.get("channel"), now)
+                for video_id, meta in results.items()
+            ])
+
+    def lookup(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Blocking metadata lookup for one video"""
+        self.stats["lookups"] += 1
+        try:
+            info = self.extract_info(video_id)
+        except Exception as e:
+            logger.debug(f"Video lookup failed for {video_id}: {e}")
+            info = None
+        if not info:
+            self.stats["failures"] += 1
+            return None
+        return summarize_info(video_id, info)
+
+    async def enrich_ids(self, video_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve ids through memory cache, then SQLite, then batched yt_dlp lookups"""
+        results: Dict[str, Dict[str, Any]] = {}
+        misses = []
+        for video_id in dict.fromkeys(video_ids):
+            cached = self.cache.get(video_id, _MISSING)
+            if cached is _MISSING:
+                misses.append(video_id)
+            elif cached is not None:
+                self.stats["memory_hits"] += 1
+                results[video_id] = cached
+
+        stored = await asyncio.to_thread(self.load_stored, misses)
+        for video_id, meta in stored.items():
+            self.stats["db_hits"] += 1
+            self.cache.put(video_id, meta)
+            results[video_id] = meta
+
+        to_fetch = [video_id for video_id in misses if video_id not in stored]
+        if to_fetch:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch(video_id: str):
+                async with semaphore:
+                    return video_id, await asyncio.to_thread(self.lookup, video_id)
+
+            fetched = {}
+            for video_id, meta in await asyncio.gather(*(fetch(video_id) for video_id in to_fetch)):
+                if meta:
+                    fetched[video_id] = meta
+                    self.cache.put(video_id, meta)
+                else:
+                    # Remember failures briefly so broken ids are not retried per article
+                    self.cache.put(video_id, None, self.negative_ttl_seconds)
+            await asyncio.to_thread(self.store, fetched)
+            results.update(fetched)
+
+        return results
+
+    def record_article_videos(self, conn: sqlite3.Connection, article: Any):
+        """Link an article to its videos on the connection (and transaction) that saves the article"""
+        conn.executemany(
+            'INSERT OR IGNORE INTO article_videos (article_url, video_id, position) VALUES (?, ?, ?)',
+            [(article.url, video_id, position) for position, video_id in enumerate(article.video_ids or ())]
+        )
+
+    async def enrich_stream(self, articles: AsyncIterator[Any], batch_size: int = 10) -> AsyncIterator[Any]:
+        """Pipeline stage: resolve each micro-batch's videos, then pass the articles on
+
+        Each article's video_ids is completed with the id of its youtube_url;
+        the article_videos links are written when the article itself is saved.
+        """
+        batch: List[Any] = []
+
+        async def flush(batch: List[Any]):
+            video_ids = []
+            for article in batch:
+                first_id = youtube_video_id(article.youtube_url)
+                if first_id and first_id not in (article.video_ids or ()):
+                    article.video_ids = (first_id, *(article.video_ids or ()))
+                video_ids.extend(article.video_ids or ())
+            if video_ids:
+                await self.enrich_ids(video_ids)
+
+        async for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                for item in batch:
+                    yield item
+                batch = []
+
+        if batch:
+            await flush(batch)
+            for item in batch:
+                yield item
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Resolve YouTube video metadata (no download)")
+    parser.add_argument("videos", nargs="+", help="Video ids or URLs")
+    parser.add_argument("--db", default=os.path.join("./data", "enhanced_news.db"))
+    parser.add_argument("--fixtures", default=None, help="Replay recorded responses from this directory (offline)")
+    parser.add_argument("--record", default=None, help="Record live responses into this directory")
+    args = parser.parse_args()
+
+    extract = None
+    if args.fixtures:
+        extract = fixture_extractor(args.fixtures)
+    elif args.record:
+        extract = recording_extractor(args.record)
+
+    enricher = YouTubeEnricher(args.db, extract_info=extract)
+    video_ids = [youtube_video_id(value) or value for value in args.videos]
+    results = asyncio.run(enricher.enrich_ids(video_ids))
+    print(json.dumps(results, indent=2))
+    logger.info(f"Lookup stats: {enricher.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,26 @@
 RunPod LoRA Discovery API
 Add this to your RunPod ComfyUI setup to enable LoRA discovery and thumbnails
 
-Place this file in your ComfyUI directory and modify your server to include these endpoints.
+Place this file (and runpod_lora_api.py) in your ComfyUI directory and include the router in your server.
 """
 
 import os
+import re
 import json
+import mmap
+import sqlite3
+import struct
 import hashlib
+import bisect
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import closing
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import quote
 import safetensors.torch
-from PIL import Image
+from PIL import Image, ImageOps
 import base64
 from io import BytesIO
 
@@ -19,11 +29,201 @@ from io import BytesIO
 LORA_DIR = "/workspace/ComfyUI/models/loras"
 THUMBNAIL_CACHE_DIR = "/workspace/ComfyUI/thumbnails/loras"
 THUMBNAIL_SIZE = (64, 64)
+THUMBNAIL_SIZES = [(64, 64), (128, 128), (256, 256)]
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_MEDIA_TYPE = "image/webp"
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Disk budget for rendered thumbnails
+THUMBNAIL_HOT_CACHE_MAX_BYTES = 16 * 1024 * 1024  # In-memory cache for repeat requests
+THUMBNAIL_WORKERS = min(8, (os.cpu_count() or 2))
+HASH_DB_PATH = "/workspace/ComfyUI/thumbnails/lora_hashes.db"
+HASH_WORKERS = 2  # Hashing is disk-bound; hashlib releases the GIL on large buffers
+HASH_CHUNK_SIZE = 16 * 1024 * 1024
+TAG_TOP_K = 10
+LORA_SNAPSHOT_PATH = "/workspace/ComfyUI/thumbnails/lora_catalog.snapshot.db"
+
+# Preview sources, in priority order
+PREVIEW_SIDECAR_SUFFIXES = [".preview.png", ".preview.jpg", ".preview.jpeg", ".preview.webp", ".png", ".jpg", ".jpeg", ".webp"]
+PREVIEW_METADATA_KEYS = ["modelspec.thumbnail", "ss_thumbnail", "thumbnail", "preview"]
+
+_thumbnail_pool: Optional[ThreadPoolExecutor] = None
+_thumbnail_lock = threading.RLock()
+_thumbnail_inflight: Dict[str, Future] = {}
+_thumbnail_sources: Dict[str, Tuple[Tuple[int, ...], str, Optional[str]]] = {}
+_hot_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_hot_cache_bytes = 0
+_disk_cache_bytes: Optional[int] = None
+_hash_pool: Optional[ThreadPoolExecutor] = None
+_hash_lock = threading.RLock()
+_hash_inflight: Dict[str, Future] = {}
+_hash_index: Optional[Dict[str, Tuple[int, int, str]]] = None
 
 def ensure_cache_dir():
     """Ensure thumbnail cache directory exists"""
     Path(THUMBNAIL_CACHE_DIR).mkdir(parents=True, exist_ok=True)
 
+def get_thumbnail_pool() -> ThreadPoolExecutor:
+    """Shared worker pool used to decode and resize preview images"""
+    global _thumbnail_pool
+    with _thumbnail_lock:
+        if _thumbnail_pool is None:
+            _thumbnail_pool = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="lora-thumb")
+        return _thumbnail_pool
+
+def read_safetensors_header(lora_path: str) -> Dict[str, Any]:
+    """Read the JSON header of a safetensors file without loading any tensors"""
+    with open(lora_path, "rb") as f:
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(header_len))
+
+def compute_sha256(file_path: str) -> str:
+    """Stream a file through SHA-256 using mmap, falling back to large buffered reads"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, size, HASH_CHUNK_SIZE):
+                        digest.update(view[offset:offset + HASH_CHUNK_SIZE])
+                finally:
+                    view.release()
+        except (OSError, ValueError):
+            # mmap is unavailable on some network filesystems
+            digest = hashlib.sha256()
+            f.seek(0)
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            buffer_view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(buffer_view[:read])
+    return digest.hexdigest()
+
+def autov2_hash(sha256: str) -> str:
+    """Short model hash as shown by A1111/Civitai (first 10 hex chars of the SHA-256)"""
+    return sha256[:10].upper()
+
+def _hash_db() -> sqlite3.Connection:
+    """Open the hash cache; callers close it with contextlib.closing"""
+    Path(HASH_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(HASH_DB_PATH, timeout=30)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS lora_hashes (
+            path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        )
+    ''')
+    return conn
+
+def _load_hash_index() -> Dict[str, Tuple[int, int, str]]:
+    """Load persisted hashes once per process"""
+    global _hash_index
+    with _hash_lock:
+        if _hash_index is None:
+            index = {}
+            try:
+                with closing(_hash_db()) as conn:
+                    for path, file_size, mtime_ns, sha256 in conn.execute(
+                        'SELECT path, file_size, mtime_ns, sha256 FROM lora_hashes'
+                    ):
+                        index[path] = (file_size, mtime_ns, sha256)
+            except sqlite3.Error as e:
+                print(f"Error loading LoRA hash cache: {e}")
+            _hash_index = index
+        return _hash_index
+
+def lookup_lora_hash(lora_path: str, stat: Optional[os.stat_result] = None) -> Optional[Dict[str, str]]:
+    """Return the persisted hash for this exact file version without hashing anything"""
+    stat = stat or os.stat(lora_path)
+    entry = _load_hash_index().get(lora_path)
+    if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return {"sha256": entry[2], "autov2": autov2_hash(entry[2])}
+    return None
+
+def hash_lora_file(lora_path: str) -> Dict[str, str]:
+    """Hash a LoRA file and persist the result against its size and mtime"""
+    before = os.stat(lora_path)
+    known = lookup_lora_hash(lora_path, before)
+    if known:
+        return known
+
+    sha256 = compute_sha256(lora_path)
+    after = os.stat(lora_path)
+    if (before.st_size, before.st_mtime_ns) == (after.st_size, after.st_mtime_ns):
+        # Only persist if the file was not modified while we were reading it
+        with _hash_lock:
+            _load_hash_index()[lora_path] = (after.st_size, after.st_mtime_ns, sha256)
+            try:
+                with closing(_hash_db()) as conn, conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO lora_hashes (path, file_size, mtime_ns, sha256) VALUES (?, ?, ?, ?)',
+                        (lora_path, after.st_size, after.st_mtime_ns, sha256)
+                    )
+            except sqlite3.Error as e:
+                print(f"Error saving LoRA hash for {lora_path}: {e}")
+    return {"sha256": sha256, "autov2": autov2_hash(sha256)}
+
+def submit_lora_hash(lora_path: str) -> Future:
+    """Hash a LoRA on the background pool, reusing persisted or in-flight results"""
+    global _hash_pool
+    known = lookup_lora_hash(lora_path)
+    if known:
+        done: Future = Future()
+        done.set_result(known)
+        return done
+
+    with _hash_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="lora-hash")
+        future = _hash_inflight.get(lora_path)
+        if future is None:
+            future = _hash_pool.submit(hash_lora_file, lora_path)
+            _hash_inflight[lora_path] = future
+            future.add_done_callback(lambda _f: _hash_inflight.pop(lora_path, None))
+    return future
+
+def normalize_tag(tag: str) -> str:
+    """Canonical form used for tag lookup"""
+    return " ".join(tag.replace("_", " ").split()).lower()
+
+def extract_tag_weights(tags: Any, top_k: int = TAG_TOP_K) -> Dict[str, float]:
+    """Flatten ss_tag_frequency (or a comma separated tag string) into top-K tag weights
+
+    kohya's ss_tag_frequency is {dataset_dir: {tag: count}}; counts are summed
+    across datasets so the dataset folder names never end up as tags. Weights
+    are each tag's share of all tag occurrences in the LoRA, ordered by count.
+    """
+    counts: Counter = Counter()
+    if isinstance(tags, str) and tags.startswith('{'):
+        try:
+            tag_data = json.loads(tags)
+        except ValueError:
+            tag_data = {}
+        for key, value in tag_data.items():
+            if isinstance(value, dict):
+                for tag, count in value.items():
+                    if isinstance(count, (int, float)) and normalize_tag(tag):
+                        counts[normalize_tag(tag)] += count
+            elif isinstance(value, (int, float)) and normalize_tag(key):
+                # Flat {tag: count} mapping
+                counts[normalize_tag(key)] += value
+    elif isinstance(tags, str):
+        for tag in tags.split(','):
+            if normalize_tag(tag):
+                counts[normalize_tag(tag)] += 1
+
+    total = sum(counts.values())
+    if not total:
+        return {}
+    return {tag: round(count / total, 4) for tag, count in counts.most_common(top_k)}
+
 def get_lora_metadata(lora_path: str) -> Dict[str, Any]:
     """Extract metadata from LoRA safetensors file"""
     try:
@@ -46,21 +246,14 @@ def get_lora_metadata(lora_path: str) -> Dict[str, Any]:
         elif any(word in filename_lower for word in ["concept", "background", "environment", "scene"]):
             lora_type = "concept"
             
-        # Parse tags if it's a JSON string
-        parsed_tags = []
-        if isinstance(tags, str) and tags.startswith('{'):
-            try:
-                tag_data = json.loads(tags)
-                parsed_tags = list(tag_data.keys())[:10]  # Limit to 10 tags
-            except:
-                pass
-        elif isinstance(tags, str):
-            parsed_tags = [tag.strip() for tag in tags.split(',')][:10]
+        # Aggregate tag frequencies and keep the most used ones
+        tag_weights = extract_tag_weights(tags)
             
         return {
             "name": name or Path(lora_path).stem,
             "description": description[:200] if description else f"LoRA model for {name or 'custom'} generation",
-            "tags": parsed_tags,
+            "tags": list(tag_weights),
+            "tag_weights": tag_weights,
             "type": lora_type,
             "file_size": os.path.getsize(lora_path),
             "modified_time": os.path.getmtime(lora_path)
@@ -72,38 +265,204 @@ def get_lora_metadata(lora_path: str) -> Dict[str, Any]:
             "name": Path(lora_path).stem,
             "description": f"LoRA model",
             "tags": [],
+            "tag_weights": {},
             "type": "other",
             "file_size": os.path.getsize(lora_path) if os.path.exists(lora_path) else 0,
             "modified_time": os.path.getmtime(lora_path) if os.path.exists(lora_path) else 0
         }
 
-def generate_lora_thumbnail(lora_path: str) -> Optional[str]:
-    """Generate a thumbnail for the LoRA (placeholder for now)"""
+def find_sidecar_preview(lora_path: str) -> Optional[str]:
+    """Find a preview image stored next to the LoRA file (e.g. model.preview.png)"""
+    base = os.path.splitext(lora_path)[0]
+    for suffix in PREVIEW_SIDECAR_SUFFIXES:
+        candidate = base + suffix
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+def extract_embedded_preview(metadata: Dict[str, str]) -> Optional[bytes]:
+    """Decode a base64 preview image embedded in safetensors metadata"""
+    for key in PREVIEW_METADATA_KEYS:
+        value = metadata.get(key)
+        if not value:
+            continue
+        if value.startswith("data:"):
+            value = value.split(",", 1)[-1]
+        try:
+            return base64.b64decode(value, validate=False)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+def get_thumbnail_source(lora_path: str) -> Tuple[str, Optional[str]]:
+    """Return (content key, sidecar path) describing the preview for a LoRA
+
+    The key is derived from the safetensors header (tensor layout and metadata)
+    and file size, plus the sidecar image's bytes; it does not depend on whether
+    the file has been hashed yet, so each thumbnail is rendered once. A replaced
+    file or a new preview image produces a new key while renames and moves keep
+    hitting the same cache entry. Results
+    are memoized per file version; the memo also records the folder's mtime
+    (which changes when a preview is added, removed or renamed in) and the
+    sidecar's size/mtime, so repeat requests only cost a few stat() calls.
+    """
+    stat = os.stat(lora_path)
+    version = (stat.st_size, stat.st_mtime_ns, os.stat(os.path.dirname(lora_path)).st_mtime_ns)
+    cached = _thumbnail_sources.get(lora_path)
+    if cached and cached[0][:len(version)] == version:
+        sidecar = cached[2]
+        try:
+            sidecar_version = _file_version(sidecar) if sidecar else ()
+        except OSError:
+            sidecar_version = None
+        if cached[0][len(version):] == sidecar_version:
+            return cached[1], sidecar
+
+    with open(lora_path, "rb") as f:
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header_bytes = f.read(header_len)
+    digest = hashlib.sha256(header_bytes)
+    digest.update(str(stat.st_size).encode())
+
+    sidecar = find_sidecar_preview(lora_path)
+    sidecar_version = _file_version(sidecar) if sidecar else ()
+    if sidecar:
+        # Hash the image rather than its mtime so copies on other pods get the same key
+        with open(sidecar, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+    content_key = digest.hexdigest()[:32]
+    _thumbnail_sources[lora_path] = (version + sidecar_version, content_key, sidecar)
+    return content_key, sidecar
+
+def _file_version(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def thumbnail_cache_path(content_key: str, size: Tuple[int, int]) -> str:
+    """Cache location for a rendered thumbnail of the given size"""
+    ext = THUMBNAIL_FORMAT.lower()
+    return os.path.join(THUMBNAIL_CACHE_DIR, f"{content_key}_{size[0]}x{size[1]}.{ext}")
+
+def render_thumbnail(lora_path: str, sidecar: Optional[str], size: Tuple[int, int], out_path: str) -> str:
+    """Decode the preview image, resize it and write it atomically to the cache"""
+    img = None
     try:
-        ensure_cache_dir()
-        
-        # Create a unique filename for the thumbnail
-        lora_hash = hashlib.md5(lora_path.encode()).hexdigest()[:8]
-        thumbnail_path = os.path.join(THUMBNAIL_CACHE_DIR, f"{lora_hash}.png")
-        
-        # Check if thumbnail already exists
-        if os.path.exists(thumbnail_path):
-            return thumbnail_path
-            
-        # Generate a simple thumbnail (you can enhance this with actual preview generation)
-        img = Image.new('RGB', THUMBNAIL_SIZE, color='#374151')
-        
-        # Save thumbnail
-        img.save(thumbnail_path, 'PNG')
-        return thumbnail_path
-        
+        if sidecar:
+            img = Image.open(sidecar)
+        else:
+            metadata = read_safetensors_header(lora_path).get("__metadata__", {}) or {}
+            embedded = extract_embedded_preview(metadata)
+            if embedded:
+                img = Image.open(BytesIO(embedded))
+        if img is not None:
+            img.draft("RGB", (size[0] * 2, size[1] * 2))  # Cheap JPEG downscale on decode
+            img = ImageOps.fit(img.convert("RGB"), size, Image.LANCZOS)
+    except Exception as e:
+        print(f"Error decoding preview image ({sidecar or 'embedded'}): {e}")
+        img = None
+
+    if img is None:
+        # No usable preview: fall back to the flat placeholder
+        img = Image.new('RGB', size, color='#374151')
+
+    tmp_path = f"{out_path}.{threading.get_ident()}.tmp"
+    img.save(tmp_path, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=4)
+    os.replace(tmp_path, out_path)
+    _account_disk_cache(os.path.getsize(out_path))
+    return out_path
+
+def _cached_thumbnails() -> List[os.DirEntry]:
+    """Finished content-keyed thumbnails; other threads' in-progress *.tmp files are left alone"""
+    name_pattern = re.compile(rf"[0-9a-f]{{32}}_\d+x\d+\.{re.escape(THUMBNAIL_FORMAT.lower())}")
+    return [entry for entry in os.scandir(THUMBNAIL_CACHE_DIR)
+            if name_pattern.fullmatch(entry.name) and entry.is_file()]
+
+def _account_disk_cache(added_bytes: int):
+    """Track disk usage of the thumbnail cache and evict least recently used files"""
+    global _disk_cache_bytes
+    with _thumbnail_lock:
+        if _disk_cache_bytes is None:
+            _disk_cache_bytes = sum(entry.stat().st_size for entry in _cached_thumbnails())
+        else:
+            _disk_cache_bytes += added_bytes
+        if _disk_cache_bytes <= THUMBNAIL_CACHE_MAX_BYTES:
+            return
+
+        # mtime doubles as last-access time (refreshed on every cache hit)
+        entries = sorted(_cached_thumbnails(), key=lambda entry: entry.stat().st_mtime)
+        target = int(THUMBNAIL_CACHE_MAX_BYTES * 0.9)
+        for entry in entries:
+            if _disk_cache_bytes <= target:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+                _disk_cache_bytes -= entry_size
+            except OSError:
+                continue
+
+def _hot_cache_get(cache_path: str) -> Optional[bytes]:
+    with _thumbnail_lock:
+        data = _hot_cache.get(cache_path)
+        if data is not None:
+            _hot_cache.move_to_end(cache_path)
+        return data
+
+def _hot_cache_put(cache_path: str, data: bytes):
+    global _hot_cache_bytes
+    with _thumbnail_lock:
+        if cache_path in _hot_cache:
+            _hot_cache.move_to_end(cache_path)
+            return
+        _hot_cache[cache_path] = data
+        _hot_cache_bytes += len(data)
+        while _hot_cache_bytes > THUMBNAIL_HOT_CACHE_MAX_BYTES and _hot_cache:
+            _, evicted = _hot_cache.popitem(last=False)
+            _hot_cache_bytes -= len(evicted)
+
+def submit_lora_thumbnail(lora_path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Future:
+    """Schedule thumbnail rendering on the worker pool, reusing cached or in-flight work"""
+    ensure_cache_dir()
+    content_key, sidecar = get_thumbnail_source(lora_path)
+    cache_path = thumbnail_cache_path(content_key, size)
+
+    if os.path.exists(cache_path):
+        try:
+            os.utime(cache_path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        done: Future = Future()
+        done.set_result(cache_path)
+        return done
+
+    with _thumbnail_lock:
+        future = _thumbnail_inflight.get(cache_path)
+        if future is None:
+            future = get_thumbnail_pool().submit(render_thumbnail, lora_path, sidecar, size, cache_path)
+            _thumbnail_inflight[cache_path] = future
+            future.add_done_callback(lambda _f: _thumbnail_inflight.pop(cache_path, None))
+    return future
+
+def generate_lora_thumbnail(lora_path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Optional[str]:
+    """Generate a thumbnail for the LoRA from its preview image and return the cached path"""
+    try:
+        return submit_lora_thumbnail(lora_path, size).result()
     except Exception as e:
         print(f"Error generating thumbnail for {lora_path}: {e}")
         return None
 
-def discover_loras() -> List[Dict[str, Any]]:
-    """Discover all LoRA files in the models directory"""
+def discover_loras(wait_for_hashes: bool = False) -> List[Dict[str, Any]]:
+    """Discover all LoRA files in the models directory
+
+    Content hashes are filled in when already known (or finished during the
+    scan); new files keep hashing in the background and show up with their
+    sha256 on a later scan. Pass wait_for_hashes=True to block until every
+    file is hashed.
+    """
     loras = []
+    hash_jobs = []
+    thumbnail_jobs = []
     
     if not os.path.exists(LORA_DIR):
         print(f"LoRA directory not found: {LORA_DIR}")
@@ -115,82 +474,285 @@ def discover_loras() -> List[Dict[str, Any]]:
                 lora_path = os.path.join(root, file)
                 relative_path = os.path.relpath(lora_path, LORA_DIR)
                 
+                # Start content hashing in the background while we read metadata
+                try:
+                    hash_future = submit_lora_hash(lora_path)
+                except Exception as e:
+                    print(f"Error hashing {lora_path}: {e}")
+                    hash_future = None
+                
                 # Get metadata
                 metadata = get_lora_metadata(lora_path)
                 
-                # Generate thumbnail
-                thumbnail_path = generate_lora_thumbnail(lora_path)
-                
                 lora_info = {
                     "name": metadata["name"],
                     "filename": relative_path,
                     "type": metadata["type"],
                     "description": metadata["description"],
                     "tags": metadata["tags"],
-                    "thumbnail": f"/api/lora-thumbnail?file={relative_path}" if thumbnail_path else None,
+                    "tag_weights": metadata["tag_weights"],
+                    "thumbnail": f"/api/lora-thumbnail?file={quote(relative_path)}",
                     "strength_recommended": 0.8 if metadata["type"] == "character" else 0.6,
                     "file_size": metadata["file_size"],
-                    "modified_time": metadata["modified_time"]
+                    "modified_time": metadata["modified_time"],
+                    "sha256": None,
+                    "autov2": None,
+                    "duplicates": []
                 }
                 
                 loras.append(lora_info)
+                hash_jobs.append((lora_info, lora_path, hash_future))
+    
+    # Collect hashes; duplicates are reported by content
+    by_hash: Dict[str, List[str]] = {}
+    for lora_info, lora_path, hash_future in hash_jobs:
+        if hash_future is not None and (wait_for_hashes or hash_future.done()):
+            try:
+                file_hash = hash_future.result()
+                lora_info["sha256"] = file_hash["sha256"]
+                lora_info["autov2"] = file_hash["autov2"]
+                by_hash.setdefault(file_hash["sha256"], []).append(lora_info["filename"])
+            except Exception as e:
+                print(f"Error hashing {lora_path}: {e}")
+        
+        # Queue thumbnail rendering on the worker pool; v= is the thumbnail's content key
+        try:
+            content_key, _ = get_thumbnail_source(lora_path)
+            thumbnail_jobs.append((lora_info, submit_lora_thumbnail(lora_path)))
+            lora_info["thumbnail"] += f"&v={content_key}"
+        except Exception as e:
+            print(f"Error generating thumbnail for {lora_path}: {e}")
+            lora_info["thumbnail"] = None
+    
+    # Report identical files uploaded under different names
+    for lora_info in loras:
+        if lora_info["sha256"]:
+            lora_info["duplicates"] = [f for f in by_hash[lora_info["sha256"]] if f != lora_info["filename"]]
+    
+    # Wait for thumbnails rendered in parallel
+    for lora_info, thumbnail_future in thumbnail_jobs:
+        try:
+            if not thumbnail_future.result():
+                lora_info["thumbnail"] = None
+        except Exception as e:
+            print(f"Error generating thumbnail for {lora_info['filename']}: {e}")
+            lora_info["thumbnail"] = None
                 
     # Sort by type and name
     loras.sort(key=lambda x: (x["type"], x["name"]))
     return loras
 
-def get_lora_thumbnail(filename: str) -> Optional[bytes]:
+def build_tag_index(loras: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a tag -> [(filename, weight)] inverted index over a discovery listing
+
+    Lookup by tag is a dict hit; "tags" is kept sorted so prefix suggestions
+    are a bisect instead of a scan over every LoRA.
+    """
+    postings: Dict[str, List[Tuple[str, float]]] = {}
+    for lora_info in loras:
+        for tag, weight in (lora_info.get("tag_weights") or {}).items():
+            postings.setdefault(tag, []).append((lora_info["filename"], weight))
+    for entries in postings.values():
+        entries.sort(key=lambda entry: -entry[1])
+    return {"postings": postings, "tags": sorted(postings)}
+
+def find_loras_by_tag(tag_index: Dict[str, Any], tag: str) -> List[Tuple[str, float]]:
+    """LoRA filenames carrying this tag, strongest first"""
+    return tag_index["postings"].get(normalize_tag(tag), [])
+
+def suggest_tags(tag_index: Dict[str, Any], prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Tags starting with prefix, ranked by how many LoRAs use them"""
+    prefix = normalize_tag(prefix)
+    tags = tag_index["tags"]
+    start = bisect.bisect_left(tags, prefix)
+    end = bisect.bisect_left(tags, prefix + "\uffff") if prefix else len(tags)
+    matches = [(tag, len(tag_index["postings"][tag])) for tag in tags[start:end]]
+    matches.sort(key=lambda match: -match[1])
+    return [{"tag": tag, "count": count} for tag, count in matches[:limit]]
+
+def read_lora_thumbnail(lora_path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Optional[Tuple[str, str, bytes]]:
+    """Thumbnail bytes for a LoRA path; returns (content key, cache path, data)
+
+    Repeat requests are served from memory without touching the cache dir.
+    """
+    content_key, _ = get_thumbnail_source(lora_path)
+    cache_path = thumbnail_cache_path(content_key, size)
+    data = _hot_cache_get(cache_path)
+    if data is not None:
+        return content_key, cache_path, data
+
+    # Generate or get cached thumbnail
+    thumbnail_path = generate_lora_thumbnail(lora_path, size)
+    if not thumbnail_path or not os.path.exists(thumbnail_path):
+        return None
+    with open(thumbnail_path, 'rb') as f:
+        data = f.read()
+    _hot_cache_put(thumbnail_path, data)
+    return content_key, thumbnail_path, data
+
+def get_lora_thumbnail(filename: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Optional[bytes]:
     """Get thumbnail for a specific LoRA file"""
     try:
         lora_path = os.path.join(LORA_DIR, filename)
         if not os.path.exists(lora_path):
             return None
-            
-        # Generate or get cached thumbnail
-        thumbnail_path = generate_lora_thumbnail(lora_path)
-        if thumbnail_path and os.path.exists(thumbnail_path):
-            with open(thumbnail_path, 'rb') as f:
-                return f.read()
-                
-        return None
+        thumbnail = read_lora_thumbnail(lora_path, size)
+        return thumbnail[2] if thumbnail else None
         
     except Exception as e:
         print(f"Error getting thumbnail for {filename}: {e}")
         return None
 
-# FastAPI endpoints (add these to your ComfyUI server)
-"""
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+def export_catalog_snapshot(snapshot_path: Optional[str] = None, loras: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Write the catalog, content hashes and rendered thumbnails into one SQLite file
 
-router = APIRouter()
+    A fresh pod can load this with load_catalog_snapshot() and serve the listing
+    immediately instead of rescanning and re-rendering everything.
+    """
+    snapshot_path = snapshot_path or LORA_SNAPSHOT_PATH
+    if loras is None:
+        loras = discover_loras(wait_for_hashes=True)
 
-@router.get("/api/loras")
-async def get_loras():
-    try:
-        loras = discover_loras()
-        return {"success": True, "loras": loras, "count": len(loras)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Path(snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    exported = 0
+    with closing(sqlite3.connect(tmp_path)) as conn, conn:
+        conn.execute('''
+            CREATE TABLE loras (
+                filename TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT,
+                content_key TEXT,
+                thumbnails TEXT NOT NULL,
+                info TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE thumbnails (
+                cache_name TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        ''')
+
+        for lora_info in loras:
+            lora_path = os.path.join(LORA_DIR, lora_info["filename"])
+            try:
+                stat = os.stat(lora_path)
+            except OSError:
+                continue
+            # Pack every rendered size of this LoRA's thumbnail (shared by duplicates)
+            content_key = None
+            cache_names = []
+            try:
+                content_key, _ = get_thumbnail_source(lora_path)
+                for size in THUMBNAIL_SIZES:
+                    cache_path = thumbnail_cache_path(content_key, size)
+                    if os.path.exists(cache_path):
+                        cache_names.append(os.path.basename(cache_path))
+                        with open(cache_path, 'rb') as f:
+                            conn.execute(
+                                'INSERT OR IGNORE INTO thumbnails (cache_name, data) VALUES (?, ?)',
+                                (cache_names[-1], f.read())
+                            )
+            except Exception as e:
+                print(f"Error packing thumbnails for {lora_path}: {e}")
 
-@router.get("/api/lora-thumbnail")
-async def get_lora_thumbnail_endpoint(file: str):
+            conn.execute(
+                'INSERT OR REPLACE INTO loras (filename, file_size, mtime_ns, sha256, content_key, thumbnails, info) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (lora_info["filename"], stat.st_size, stat.st_mtime_ns, lora_info.get("sha256"), content_key,
+                 json.dumps(cache_names), json.dumps(lora_info))
+            )
+            exported += 1
+
+    os.replace(tmp_path, snapshot_path)
+    print(f"Exported {exported} LoRA entries to {snapshot_path}")
+    return exported
+
+def load_catalog_snapshot(snapshot_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Load a catalog snapshot, keeping only entries that still describe the files on disk
+
+    Entries whose size and mtime match are trusted as-is and seed the hash
+    index. Files copied to another pod usually get new mtimes; those are kept
+    when their thumbnail content key (header, size and preview image) still
+    matches, but without the exported hash, which a later scan recomputes.
+    Kept entries seed the thumbnail cache. Returns the listing plus the
+    filenames that were stale or missing, or None when no snapshot is available.
+    """
+    snapshot_path = snapshot_path or LORA_SNAPSHOT_PATH
+    if not os.path.exists(snapshot_path):
+        return None
+
+    loras = []
+    stale = []
+    wanted_thumbnails = set()
     try:
-        thumbnail_data = get_lora_thumbnail(file)
-        if thumbnail_data:
-            return Response(content=thumbnail_data, media_type="image/png")
-        else:
-            raise HTTPException(status_code=404, detail="Thumbnail not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        with closing(sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)) as conn:
+            for filename, file_size, mtime_ns, sha256, content_key, thumbnails, info in conn.execute(
+                'SELECT filename, file_size, mtime_ns, sha256, content_key, thumbnails, info FROM loras'
+            ):
+                lora_path = os.path.join(LORA_DIR, filename)
+                try:
+                    stat = os.stat(lora_path)
+                    unchanged = (stat.st_size, stat.st_mtime_ns) == (file_size, mtime_ns)
+                    if not unchanged and (stat.st_size != file_size or not content_key
+                                          or get_thumbnail_source(lora_path)[0] != content_key):
+                        stale.append(filename)
+                        continue
+                except (OSError, struct.error):
+                    stale.append(filename)
+                    continue
 
-# Add router to your main FastAPI app
-# app.include_router(router)
-"""
+                lora_info = json.loads(info)
+                wanted_thumbnails.update(json.loads(thumbnails))
+                if unchanged and sha256:
+                    with _hash_lock:
+                        _load_hash_index()[lora_path] = (file_size, mtime_ns, sha256)
+                elif not unchanged:
+                    lora_info.update(sha256=None, autov2=None, duplicates=[], modified_time=stat.st_mtime)
+                loras.append(lora_info)
+
+            # Unpack thumbnails that are not already in the local cache
+            ensure_cache_dir()
+            for cache_name, data in conn.execute('SELECT cache_name, data FROM thumbnails'):
+                cache_path = os.path.join(THUMBNAIL_CACHE_DIR, cache_name)
+                if cache_name not in wanted_thumbnails or os.path.exists(cache_path):
+                    continue
+                tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+                _account_disk_cache(len(data))
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error loading LoRA catalog snapshot {snapshot_path}: {e}")
+        return None
+
+    loras.sort(key=lambda x: (x["type"], x["name"]))
+    return {"loras": loras, "stale": stale}
+
+# FastAPI endpoints live in runpod_lora_api.py, which runs this module's
+# blocking functions on executor threads:
+#
+#   from runpod_lora_api import router
+#   app.include_router(router)
 
 if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "--export-snapshot":
+        # Build a snapshot for new pods: python runpod-lora-discovery.py --export-snapshot [path]
+        export_catalog_snapshot(sys.argv[2] if len(sys.argv) > 2 else LORA_SNAPSHOT_PATH)
+        sys.exit(0)
+    
     # Test the discovery
-    loras = discover_loras()
+    loras = discover_loras(wait_for_hashes=True)
     print(f"Found {len(loras)} LoRA files:")
     for lora in loras[:5]:  # Show first 5
-        print(f"  - {lora['name']} ({lora['type']}) - {lora['filename']}")
+        print(f"  - {lora['name']} ({lora['type']}) - {lora['filename']} [{lora['autov2']}]")
+    duplicates = [lora for lora in loras if lora["duplicates"]]
+    if duplicates:
+        print(f"{len(duplicates)} LoRA files have identical content under another name")
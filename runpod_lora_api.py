@@ -0,0 +1,203 @@
+"""
+RunPod LoRA Discovery Router
+Async FastAPI endpoints for LoRA discovery and thumbnails
+
+Mount it on your ComfyUI/FastAPI app:
+
+    from runpod_lora_api import router
+    app.include_router(router)
+
+include_router() also adopts the router's lifespan, which warm-starts the
+listing from the catalog snapshot. On FastAPI releases that predate router
+lifespans, pass it to the app instead: FastAPI(lifespan=lifespan).
+
+All blocking work (directory walks, safetensors header reads, hashing and
+thumbnail rendering) runs on executor threads so the server's event loop keeps
+serving other requests during a scan.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import importlib.util
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+# runpod-lora-discovery.py is not importable by name, so load it from this directory
+_spec = importlib.util.spec_from_file_location(
+    "runpod_lora_discovery", os.path.join(os.path.dirname(os.path.abspath(__file__)), "runpod-lora-discovery.py")
+)
+lora_discovery = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(lora_discovery)
+
+# Configuration
+SCAN_CACHE_SECONDS = 10  # Serve a finished scan to follow-up requests for this long
+LIST_CACHE_CONTROL = "no-cache"  # Clients must revalidate, but get 304s via ETag
+THUMBNAIL_CACHE_CONTROL = "public, max-age=3600"
+THUMBNAIL_VERSIONED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+_scan_task: Optional[asyncio.Task] = None
+_scan_result: Optional[Tuple[float, bytes, str]] = None
+_snapshot_result: Optional[Tuple[bytes, str]] = None
+_tag_index: Optional[Dict[str, Any]] = None  # Built by the first scan (or the snapshot)
+
+async def _run_blocking(func, *args):
+    """Run blocking discovery code on the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+def _encode_listing(loras: List[Dict[str, Any]]) -> Tuple[bytes, str]:
+    """Serialize the listing once and derive its ETag from the body"""
+    body = json.dumps({"success": True, "loras": loras, "count": len(loras)}).encode("utf-8")
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def _scan_and_encode() -> Tuple[bytes, str]:
+    global _tag_index
+    loras = lora_discovery.discover_loras()
+    _tag_index = lora_discovery.build_tag_index(loras)
+    return _encode_listing(loras)
+
+async def scan_loras() -> Tuple[bytes, str]:
+    """Return the encoded listing, coalescing concurrent requests into one in-flight scan"""
+    global _scan_task, _scan_result, _snapshot_result
+    loop = asyncio.get_running_loop()
+
+    if _scan_result and loop.time() - _scan_result[0] < SCAN_CACHE_SECONDS:
+        return _scan_result[1], _scan_result[2]
+
+    if _scan_task is None or _scan_task.done():
+        _scan_task = asyncio.ensure_future(_run_blocking(_scan_and_encode))
+
+    task = _scan_task
+    if _snapshot_result is not None:
+        # Warm-started pod: answer from the snapshot until the first full scan lands
+        if not task.done():
+            return _snapshot_result
+        _snapshot_result = None
+    # Shield so a disconnecting client does not cancel the scan others are awaiting
+    body, etag = await asyncio.shield(task)
+    if task is _scan_task:
+        _scan_result = (loop.time(), body, etag)
+    return body, etag
+
+async def get_tag_index() -> Dict[str, Any]:
+    """The tag index, running (or joining) the first scan when nothing has built it yet"""
+    if _tag_index is None:
+        await scan_loras()
+    return _tag_index
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+def _resolve_lora_path(filename: str) -> Optional[str]:
+    """Map a relative filename onto LORA_DIR, rejecting paths that escape it
+
+    Symlinks are left unresolved so the path matches the one discover_loras()
+    uses as the hash index and thumbnail memo key.
+    """
+    lora_dir = os.path.normpath(lora_discovery.LORA_DIR)
+    lora_path = os.path.normpath(os.path.join(lora_dir, filename))
+    if os.path.commonpath([lora_dir, lora_path]) != lora_dir or lora_path == lora_dir or not os.path.isfile(lora_path):
+        return None
+    return lora_path
+
+def _prepare_thumbnail(filename: str, size: Tuple[int, int]) -> Optional[Tuple[bytes, str, str]]:
+    """Resolve the LoRA and read its thumbnail (hot cache, disk cache or a fresh render)
+
+    Returns (data, etag, content key).
+    """
+    lora_path = _resolve_lora_path(filename)
+    if not lora_path:
+        return None
+    thumbnail = lora_discovery.read_lora_thumbnail(lora_path, size)
+    if not thumbnail:
+        return None
+    content_key, thumbnail_path, data = thumbnail
+    # Cache files are content-addressed, so the name is a strong validator
+    return data, '"' + Path(thumbnail_path).stem + '"', content_key
+
+async def warm_start_from_snapshot():
+    """Load the catalog snapshot (if any) and refresh it with a background scan"""
+    global _scan_task, _snapshot_result, _tag_index
+    try:
+        snapshot = await _run_blocking(lora_discovery.load_catalog_snapshot)
+    except Exception as e:
+        print(f"Error loading LoRA catalog snapshot: {e}")
+        return
+    if not snapshot:
+        return
+
+    _snapshot_result = _encode_listing(snapshot["loras"])
+    _tag_index = lora_discovery.build_tag_index(snapshot["loras"])
+    _scan_task = asyncio.ensure_future(_run_blocking(_scan_and_encode))
+    print(f"Loaded {len(snapshot['loras'])} LoRAs from snapshot ({len(snapshot['stale'])} stale), refreshing in background")
+
+@asynccontextmanager
+async def lifespan(app):
+    await warm_start_from_snapshot()
+    yield
+
+router = APIRouter(lifespan=lifespan)
+
+@router.get("/api/loras")
+async def get_loras(request: Request):
+    try:
+        body, etag = await scan_loras()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/api/lora-tags")
+async def suggest_lora_tags(prefix: str = "", limit: int = 10):
+    """Tag suggestions for the UI, answered from the in-memory inverted index"""
+    try:
+        tag_index = await get_tag_index()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "tags": lora_discovery.suggest_tags(tag_index, prefix, max(1, min(limit, 100)))}
+
+@router.get("/api/loras/by-tag")
+async def get_loras_by_tag(tag: str):
+    try:
+        tag_index = await get_tag_index()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    matches = lora_discovery.find_loras_by_tag(tag_index, tag)
+    return {
+        "success": True,
+        "tag": tag,
+        "loras": [{"filename": filename, "weight": weight} for filename, weight in matches],
+        "count": len(matches),
+    }
+
+@router.get("/api/lora-thumbnail")
+async def get_lora_thumbnail_endpoint(request: Request, file: str, size: int = 64, v: Optional[str] = None):
+    thumb_size = (size, size) if (size, size) in lora_discovery.THUMBNAIL_SIZES else lora_discovery.THUMBNAIL_SIZE
+    try:
+        prepared = await _run_blocking(_prepare_thumbnail, file, thumb_size)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not prepared:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+
+    data, etag, content_key = prepared
+    # Listing URLs carry the thumbnail's content key in v; only a current key may be cached forever
+    headers = {
+        "ETag": etag,
+        "Cache-Control": THUMBNAIL_VERSIONED_CACHE_CONTROL if v == content_key else THUMBNAIL_CACHE_CONTROL,
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Thumbnails are a few KiB, so they are answered from the in-memory hot cache
+    return Response(content=data, media_type=lora_discovery.THUMBNAIL_MEDIA_TYPE, headers=headers)
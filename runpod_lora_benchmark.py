@@ -0,0 +1,526 @@
+"""
+RunPod LoRA Benchmark
+Load-test harness for runpod-lora-discovery.py and the runpod_lora_api router
+
+Generates synthetic .safetensors LoRAs (realistic headers, kohya-style
+ss_tag_frequency metadata, sidecar and embedded previews) in nested folders and
+measures, for each library size:
+
+    - cold scan (empty hash DB and thumbnail cache), restart scan (caches on
+      disk, fresh process state) and warm scan (same process)
+    - per-file header read and get_lora_metadata latency
+    - peak RSS of each scan, and peak Python heap (tracemalloc) during a cold scan
+    - thumbnail render and cached-read throughput
+
+With --http it also serves the router with uvicorn on a local port and load-tests
+/api/loras and /api/lora-thumbnail with concurrent keep-alive clients.
+
+Usage:
+    python runpod_lora_benchmark.py --counts 10 500 5000
+    python runpod_lora_benchmark.py --counts 1000 --http --concurrency 32 --json results.json
+
+The OS page cache is not dropped between runs, so "cold" means cold application
+caches; drop caches as root (echo 3 > /proc/sys/vm/drop_caches) for a disk-cold run.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import base64
+import random
+import shutil
+import socket
+import struct
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import http.client
+import importlib.util
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CATEGORIES = {
+    "characters": ["character", "girl", "boy", "woman", "man", "char"],
+    "styles": ["style", "anime", "realistic", "painting", "art"],
+    "concepts": ["concept", "background", "environment", "scene"],
+    "misc": ["detail", "lighting", "pose", "outfit", "misc"],
+}
+TAG_VOCABULARY_SIZE = 600
+UNET_BLOCKS = ["down_blocks_0", "down_blocks_1", "down_blocks_2", "mid_block", "up_blocks_1", "up_blocks_2", "up_blocks_3"]
+ATTENTION_LAYERS = ["attn1_to_q", "attn1_to_k", "attn1_to_v", "attn1_to_out_0", "attn2_to_q", "attn2_to_k", "attn2_to_v", "ff_net_0_proj"]
+
+_module_counter = 0
+
+def load_module(filename: str, name: str):
+    """Load a fresh copy of a repo module so each run starts with empty in-process caches"""
+    global _module_counter
+    _module_counter += 1
+    spec = importlib.util.spec_from_file_location(f"{name}_{_module_counter}", os.path.join(BASE_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def configure_discovery(discovery, workdir: str):
+    """Point a discovery module at the benchmark's LoRA folder and caches"""
+    discovery.LORA_DIR = os.path.join(workdir, "loras")
+    discovery.THUMBNAIL_CACHE_DIR = os.path.join(workdir, "thumbnails")
+    discovery.HASH_DB_PATH = os.path.join(workdir, "lora_hashes.db")
+    discovery.LORA_SNAPSHOT_PATH = os.path.join(workdir, "lora_catalog.snapshot.db")
+
+def close_discovery(discovery):
+    """Stop the worker pools owned by a discovery module instance"""
+    for pool in (discovery._thumbnail_pool, discovery._hash_pool):
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+def clear_disk_caches(workdir: str):
+    shutil.rmtree(os.path.join(workdir, "thumbnails"), ignore_errors=True)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(os.path.join(workdir, "lora_hashes.db" + suffix))
+        except FileNotFoundError:
+            pass
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of latency samples in seconds, reported in milliseconds"""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(ordered[-1] * 1000, 3)}
+
+def _read_status_kb(field: str) -> Optional[int]:
+    """A VmRSS/VmHWM value from /proc/self/status (Linux only)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark so VmHWM covers only what runs next"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def scan_peak_rss_mb(reset: bool) -> Optional[float]:
+    """Peak RSS since reset_peak_rss(), or None where it could not be reset"""
+    peak_kb = _read_status_kb("VmHWM") if reset else None
+    return round(peak_kb / 1024, 1) if peak_kb is not None else None
+
+def peak_rss_mb() -> Optional[float]:
+    """Process lifetime high-water RSS (Linux reports ru_maxrss in KiB)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_kb //= 1024  # Reported in bytes on macOS
+    return round(peak_kb / 1024, 1)
+
+# --- Synthetic library -------------------------------------------------------
+
+def make_preview_images(size: int, variants: int = 8) -> List[Tuple[bytes, bytes]]:
+    """(png, jpeg) encodings of a few gradient images, reused across files"""
+    from PIL import Image
+
+    images = []
+    for variant in range(variants):
+        hue = variant * 255 // variants
+        img = Image.new("RGB", (size, size * 3 // 2))
+        img.putdata([((x + hue) % 256, (y * 255) // img.height, (x * y + hue) % 256)
+                     for y in range(img.height) for x in range(img.width)])
+        png, jpeg = io.BytesIO(), io.BytesIO()
+        img.save(png, "PNG")
+        img.save(jpeg, "JPEG", quality=85)
+        images.append((png.getvalue(), jpeg.getvalue()))
+    return images
+
+def make_tag_frequency(rng: random.Random, vocabulary: List[str]) -> str:
+    """kohya-style ss_tag_frequency: {"<repeats>_<dataset>": {tag: count}} as a JSON string"""
+    datasets = {}
+    for index in range(rng.randint(1, 3)):
+        images = rng.randint(15, 300)
+        tags = {}
+        for _ in range(rng.randint(20, 150)):
+            # Zipf-ish: a few common tags, a long tail of rare ones
+            tag = vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)]
+            tags[tag] = min(images, tags.get(tag, 0) + rng.randint(1, images))
+        datasets[f"{rng.choice([5, 10, 20])}_dataset{index}"] = tags
+    return json.dumps(datasets)
+
+def write_safetensors(path: str, metadata: Dict[str, str], tensor_count: int, payload_bytes: int, salt: bytes):
+    """Write a safetensors file: u64 header length, JSON header, then tensor data"""
+    header: Dict[str, Any] = {"__metadata__": metadata}
+    tensor_bytes = max(2, payload_bytes // max(1, tensor_count)) // 2 * 2
+    offset = 0
+    for index in range(tensor_count):
+        block = UNET_BLOCKS[index % len(UNET_BLOCKS)]
+        layer = ATTENTION_LAYERS[(index // len(UNET_BLOCKS)) % len(ATTENTION_LAYERS)]
+        name = f"lora_unet_{block}_attentions_{index // 56}_transformer_blocks_0_{layer}"
+        suffix = ("lora_down.weight", "lora_up.weight", "alpha")[index % 3]
+        if suffix == "alpha":
+            header[f"{name}.{suffix}"] = {"dtype": "F16", "shape": [], "data_offsets": [offset, offset + 2]}
+            offset += 2
+        else:
+            header[f"{name}.{suffix}"] = {"dtype": "F16", "shape": [tensor_bytes // 2], "data_offsets": [offset, offset + tensor_bytes]}
+            offset += tensor_bytes
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 8)  # Keep tensor data 8-byte aligned
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(salt[:offset])
+        if offset > len(salt):
+            f.truncate(8 + len(header_bytes) + offset)
+
+def generate_library(lora_dir: str, count: int, seed: int = 42, tensor_count: int = 192,
+                     payload_kb: int = 256, preview_size: int = 256) -> Dict[str, int]:
+    """Create count synthetic LoRAs under lora_dir; returns counts of each preview kind"""
+    rng = random.Random(seed)
+    vocabulary = [f"tag_{index}" for index in range(TAG_VOCABULARY_SIZE)]
+    vocabulary[:12] = ["1girl", "solo", "smile", "long hair", "looking at viewer", "outdoors",
+                       "simple background", "upper body", "blue eyes", "masterpiece", "best quality", "detailed"]
+    previews = make_preview_images(preview_size)
+    kinds: Counter = Counter()
+
+    for index in range(count):
+        category = rng.choice(list(CATEGORIES))
+        keyword = rng.choice(CATEGORIES[category])
+        folders = [category] + [f"set{rng.randint(0, 9):02d}" for _ in range(rng.randint(0, 2))]
+        folder = os.path.join(lora_dir, *folders)
+        os.makedirs(folder, exist_ok=True)
+        stem = f"{keyword}_{index:05d}_v{rng.randint(1, 4)}"
+        path = os.path.join(folder, stem + ".safetensors")
+
+        metadata = {
+            "ss_output_name": stem,
+            "ss_network_module": "networks.lora",
+            "ss_network_dim": str(rng.choice([8, 16, 32, 64, 128])),
+            "ss_network_alpha": str(rng.choice([1, 8, 16, 32])),
+            "ss_base_model_version": rng.choice(["sd_v1", "sdxl_base_v1-0"]),
+            "ss_learning_rate": "0.0001",
+            "ss_num_train_images": str(rng.randint(15, 900)),
+            "ss_dataset_dirs": json.dumps({f"{rng.choice([5, 10])}_{keyword}": {"n_repeats": 10, "img_count": rng.randint(15, 300)}}),
+            "ss_tag_frequency": make_tag_frequency(rng, vocabulary),
+            "modelspec.title": stem.replace("_", " "),
+        }
+
+        png, jpeg = rng.choice(previews)
+        preview_kind = rng.choice(["sidecar", "embedded", "none"])
+        if preview_kind == "sidecar":
+            with open(os.path.join(folder, stem + ".preview.png"), "wb") as f:
+                f.write(png)
+        elif preview_kind == "embedded":
+            metadata["modelspec.thumbnail"] = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("ascii")
+        kinds[preview_kind] += 1
+
+        write_safetensors(path, metadata, tensor_count, payload_kb * 1024, rng.randbytes(64))
+
+    return dict(kinds)
+
+def list_lora_files(lora_dir: str) -> List[str]:
+    return sorted(
+        os.path.join(root, file)
+        for root, _, files in os.walk(lora_dir) for file in files if file.endswith(".safetensors")
+    )
+
+# --- In-process measurements -------------------------------------------------
+
+def timed_scan(workdir: str, discovery=None, trace_memory: bool = False) -> Tuple[Any, Dict[str, Any]]:
+    """Run discover_loras on a given (or fresh) module; returns (module, result)"""
+    if discovery is None:
+        discovery = load_module("runpod-lora-discovery.py", "lora_discovery_bench")
+        configure_discovery(discovery, workdir)
+
+    if trace_memory:
+        tracemalloc.start()
+    # Per-scan peak: the lifetime peak would only ever report the largest scan so far
+    reset = reset_peak_rss()
+    rss_before_kb = _read_status_kb("VmRSS")
+    start = time.perf_counter()
+    # Wait for hashes so cold scans include the full hashing cost
+    loras = discovery.discover_loras(wait_for_hashes=True)
+    elapsed = time.perf_counter() - start
+    result: Dict[str, Any] = {"seconds": round(elapsed, 3), "loras": len(loras), "peak_rss_mb": scan_peak_rss_mb(reset)}
+    # Imported libraries (torch, PIL) dominate the absolute figure; growth is what the scan added
+    result["peak_rss_growth_mb"] = (round(result["peak_rss_mb"] - rss_before_kb / 1024, 1)
+                                    if result["peak_rss_mb"] is not None and rss_before_kb is not None else None)
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_heap_mb"] = round(peak / (1024 * 1024), 2)
+    return discovery, result
+
+def measure_header_latency(discovery, files: List[str]) -> Dict[str, Any]:
+    """Per-file latency of the raw header read and of get_lora_metadata"""
+    header_samples, metadata_samples = [], []
+    header_bytes = 0
+    for path in files:
+        start = time.perf_counter()
+        discovery.read_safetensors_header(path)
+        header_samples.append(time.perf_counter() - start)
+        with open(path, "rb") as f:
+            header_bytes += struct.unpack("<Q", f.read(8))[0]
+
+        start = time.perf_counter()
+        discovery.get_lora_metadata(path)
+        metadata_samples.append(time.perf_counter() - start)
+
+    return {
+        "avg_header_kb": round(header_bytes / max(1, len(files)) / 1024, 1),
+        "read_safetensors_header": percentiles(header_samples),
+        "get_lora_metadata": percentiles(metadata_samples),
+    }
+
+def measure_thumbnails(discovery, files: List[str], size: Tuple[int, int] = (128, 128)) -> Dict[str, Any]:
+    """Render throughput on the worker pool, then cached reads via get_lora_thumbnail"""
+    lora_dir = discovery.LORA_DIR
+
+    start = time.perf_counter()
+    futures = [discovery.submit_lora_thumbnail(path, size) for path in files]
+    rendered = sum(1 for future in futures if future.result())
+    render_seconds = time.perf_counter() - start
+
+    relative = [os.path.relpath(path, lora_dir) for path in files]
+    timings = {}
+    for label in ("disk", "memory"):
+        # First pass reads cache files from disk, second is served from the hot cache
+        samples = []
+        start = time.perf_counter()
+        for filename in relative:
+            request_start = time.perf_counter()
+            discovery.get_lora_thumbnail(filename, size)
+            samples.append(time.perf_counter() - request_start)
+        elapsed = time.perf_counter() - start
+        timings[label] = {"per_second": round(len(relative) / elapsed, 1), **percentiles(samples)}
+
+    return {
+        "size": f"{size[0]}x{size[1]}",
+        "workers": discovery.THUMBNAIL_WORKERS,
+        "rendered": rendered,
+        "render_per_second": round(rendered / render_seconds, 1) if render_seconds else None,
+        "cached_disk": timings["disk"],
+        "cached_memory": timings["memory"],
+    }
+
+# --- HTTP load test ----------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class LocalServer:
+    """uvicorn serving a fresh copy of runpod_lora_api.router on a background thread"""
+
+    def __init__(self, workdir: str):
+        import uvicorn
+        from fastapi import FastAPI
+
+        self.api = load_module("runpod_lora_api.py", "runpod_lora_api_bench")
+        configure_discovery(self.api.lora_discovery, workdir)
+        app = FastAPI()
+        app.include_router(self.api.router)
+
+        self.port = free_port()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "LocalServer":
+        self.thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+        close_discovery(self.api.lora_discovery)
+
+def load_test(port: int, paths: List[str], total_requests: int, concurrency: int,
+              headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Issue total_requests GETs over `concurrency` keep-alive connections, cycling through paths"""
+
+    def client(worker: int) -> Tuple[List[float], Counter, int]:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        samples: List[float] = []
+        statuses: Counter = Counter()
+        received = 0
+        try:
+            for index in range(worker, total_requests, concurrency):
+                start = time.perf_counter()
+                conn.request("GET", paths[index % len(paths)], headers=headers or {})
+                response = conn.getresponse()
+                received += len(response.read())
+                samples.append(time.perf_counter() - start)
+                statuses[response.status] += 1
+        finally:
+            conn.close()
+        return samples, statuses, received
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for result in results for sample in result[0]]
+    statuses: Counter = sum((result[1] for result in results), Counter())
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "requests_per_second": round(len(samples) / elapsed, 1),
+        "mb_received": round(sum(result[2] for result in results) / (1024 * 1024), 2),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        **percentiles(samples),
+    }
+
+def run_http_benchmark(workdir: str, total_requests: int, concurrency: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with LocalServer(workdir) as server:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=600)
+        start = time.perf_counter()
+        conn.request("GET", "/api/loras")
+        response = conn.getresponse()
+        listing = json.loads(response.read())
+        etag = response.getheader("ETag")
+        conn.close()
+        results["first_listing_seconds"] = round(time.perf_counter() - start, 3)
+
+        results["listing"] = load_test(server.port, ["/api/loras"], total_requests, concurrency)
+        results["listing_304"] = load_test(server.port, ["/api/loras"], total_requests, concurrency,
+                                           headers={"If-None-Match": etag})
+
+        # 256px has not been rendered by the in-process phase, so the first pass renders
+        thumbnail_paths = [lora["thumbnail"] + "&size=256" for lora in listing["loras"] if lora["thumbnail"]]
+        results["thumbnails_render"] = load_test(server.port, thumbnail_paths, len(thumbnail_paths), concurrency)
+        results["thumbnails_cached"] = load_test(server.port, thumbnail_paths, max(total_requests, len(thumbnail_paths)), concurrency)
+        results["tag_suggestions"] = load_test(server.port, ["/api/lora-tags?prefix=ta", "/api/lora-tags?prefix=1"],
+                                               total_requests, concurrency)
+    return results
+
+# --- Driver ------------------------------------------------------------------
+
+def benchmark_library(count: int, args: argparse.Namespace, base_dir: str) -> Dict[str, Any]:
+    workdir = os.path.join(base_dir, f"loras_{count}")
+    lora_dir = os.path.join(workdir, "loras")
+    print(f"\n=== {count} LoRAs ({workdir}) ===")
+
+    start = time.perf_counter()
+    kinds = generate_library(lora_dir, count, seed=args.seed, tensor_count=args.tensors,
+                             payload_kb=args.payload_kb, preview_size=args.preview_size)
+    files = list_lora_files(lora_dir)
+    result: Dict[str, Any] = {"count": count, "previews": kinds,
+                              "generate_seconds": round(time.perf_counter() - start, 3)}
+    print(f"Generated in {result['generate_seconds']}s, previews: {kinds}")
+
+    # Cold: empty hash DB and thumbnail cache, so every file is hashed and rendered
+    clear_disk_caches(workdir)
+    discovery, result["cold_scan"] = timed_scan(workdir)
+    close_discovery(discovery)
+    print(f"Cold scan:    {result['cold_scan']['seconds']:8.3f}s  peak RSS {result['cold_scan']['peak_rss_mb']} MiB (+{result['cold_scan']['peak_rss_growth_mb']})")
+
+    # Restart: fresh process state, hashes and thumbnails already on disk
+    discovery, result["restart_scan"] = timed_scan(workdir)
+    print(f"Restart scan: {result['restart_scan']['seconds']:8.3f}s  peak RSS {result['restart_scan']['peak_rss_mb']} MiB (+{result['restart_scan']['peak_rss_growth_mb']})")
+
+    # Warm: same module again, per-file memos populated
+    _, result["warm_scan"] = timed_scan(workdir, discovery)
+    print(f"Warm scan:    {result['warm_scan']['seconds']:8.3f}s  peak RSS {result['warm_scan']['peak_rss_mb']} MiB (+{result['warm_scan']['peak_rss_growth_mb']})")
+
+    result["header_latency"] = measure_header_latency(discovery, files)
+    latency = result["header_latency"]
+    print(f"Header read:  p50 {latency['read_safetensors_header']['p50_ms']} ms, "
+          f"p95 {latency['read_safetensors_header']['p95_ms']} ms (avg header {latency['avg_header_kb']} KiB)")
+    print(f"Metadata:     p50 {latency['get_lora_metadata']['p50_ms']} ms, p95 {latency['get_lora_metadata']['p95_ms']} ms")
+
+    result["thumbnails"] = measure_thumbnails(discovery, files)
+    thumbnails = result["thumbnails"]
+    print(f"Thumbnails:   render {thumbnails['render_per_second']}/s on {thumbnails['workers']} workers, "
+          f"disk hit {thumbnails['cached_disk']['per_second']}/s, memory hit {thumbnails['cached_memory']['per_second']}/s")
+    close_discovery(discovery)
+
+    # Memory: a separate traced cold scan, since tracemalloc slows the timed runs
+    clear_disk_caches(workdir)
+    discovery, memory_scan = timed_scan(workdir, trace_memory=True)
+    close_discovery(discovery)
+    result["memory"] = {"cold_scan_peak_heap_mb": memory_scan["peak_heap_mb"],
+                        "cold_scan_peak_rss_mb": result["cold_scan"]["peak_rss_mb"],
+                        "process_peak_rss_mb": peak_rss_mb()}
+    print(f"Memory:       peak heap {memory_scan['peak_heap_mb']} MiB during cold scan, "
+          f"process lifetime peak RSS {result['memory']['process_peak_rss_mb']} MiB")
+
+    if args.http:
+        result["http"] = run_http_benchmark(workdir, args.requests, args.concurrency)
+        for name, stats in result["http"].items():
+            if isinstance(stats, dict):
+                print(f"HTTP {name:18s} {stats['requests_per_second']:8.1f} req/s  p50 {stats['p50_ms']} ms  "
+                      f"p95 {stats['p95_ms']} ms  p99 {stats['p99_ms']} ms  {stats['statuses']}")
+            else:
+                print(f"HTTP {name:18s} {stats}s")
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LoRA discovery, metadata reads and thumbnails")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 500, 5000], help="Library sizes to test")
+    parser.add_argument("--workdir", default=None, help="Where to generate libraries (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="Keep generated libraries")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tensors", type=int, default=192, help="Tensor entries per safetensors header")
+    parser.add_argument("--payload-kb", type=int, default=256, help="Tensor data per file")
+    parser.add_argument("--preview-size", type=int, default=256, help="Width of generated preview images")
+    parser.add_argument("--http", action="store_true", help="Also load-test the HTTP endpoints")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per HTTP scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    base_dir = args.workdir or tempfile.mkdtemp(prefix="lora-bench-")
+    os.makedirs(base_dir, exist_ok=True)
+    results = []
+    try:
+        for count in args.counts:
+            results.append(benchmark_library(count, args, base_dir))
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    print("\n  count   cold s  restart s   warm s  hdr p95 ms  meta p95 ms  render/s  heap MiB  RSS MiB")
+    for result in results:
+        cold_rss = result['memory']['cold_scan_peak_rss_mb']
+        print(f"{result['count']:7d} {result['cold_scan']['seconds']:8.3f} {result['restart_scan']['seconds']:10.3f} "
+              f"{result['warm_scan']['seconds']:8.3f} {result['header_latency']['read_safetensors_header']['p95_ms']:11.3f} "
+              f"{result['header_latency']['get_lora_metadata']['p95_ms']:12.3f} "
+              f"{result['thumbnails']['render_per_second'] or 0:9.1f} {result['memory']['cold_scan_peak_heap_mb']:9.2f} "
+              f"{cold_rss if cold_rss is not None else '-':>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Shared pytest setup for the RunPod LoRA modules at the repository root"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+@pytest.fixture
+def lora_api(tmp_path):
+    """A fresh runpod_lora_api (and discovery module) pointed at tmp_path"""
+    pytest.importorskip("safetensors.torch")
+    pytest.importorskip("PIL")
+    pytest.importorskip("fastapi")
+    from runpod_lora_benchmark import close_discovery, configure_discovery, load_module
+
+    api = load_module("runpod_lora_api.py", "runpod_lora_api_test")
+    configure_discovery(api.lora_discovery, str(tmp_path))
+    os.makedirs(api.lora_discovery.LORA_DIR)
+    yield api
+    close_discovery(api.lora_discovery)
+
+@pytest.fixture
+def client(lora_api):
+    pytest.importorskip("httpx")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(lora_api.router)
+    with TestClient(app) as client:
+        yield client
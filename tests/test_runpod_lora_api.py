@@ -0,0 +1,89 @@
+"""HTTP behaviour of runpod_lora_api against a synthetic LoRA folder"""
+
+import os
+
+from runpod_lora_benchmark import write_safetensors
+
+def add_lora(lora_api, name: str, salt: bytes = b"lora") -> str:
+    path = os.path.join(lora_api.lora_discovery.LORA_DIR, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_safetensors(path, {"ss_output_name": name}, tensor_count=6, payload_bytes=1024, salt=salt * 64)
+    return path
+
+def listed_thumbnail(client, filename: str) -> str:
+    loras = client.get("/api/loras").json()["loras"]
+    return next(lora["thumbnail"] for lora in loras if lora["filename"] == filename)
+
+def test_only_current_thumbnail_version_is_immutable(lora_api, client):
+    add_lora(lora_api, "style.safetensors")
+    url = listed_thumbnail(client, "style.safetensors")
+    assert "immutable" in client.get(url).headers["cache-control"]
+
+    # An autov2 hash or any other stale version must revalidate instead of pinning a picture
+    assert "immutable" not in client.get("/api/lora-thumbnail?file=style.safetensors&v=ABCDEF0123").headers["cache-control"]
+    assert "immutable" not in client.get("/api/lora-thumbnail?file=style.safetensors").headers["cache-control"]
+
+def test_symlinked_lora_uses_listing_cache_keys(lora_api, client, tmp_path):
+    target = add_lora(lora_api, "../shared/char.safetensors")
+    os.symlink(target, os.path.join(lora_api.lora_discovery.LORA_DIR, "char.safetensors"))
+    url = listed_thumbnail(client, "char.safetensors")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+    assert os.path.join(lora_api.lora_discovery.LORA_DIR, "char.safetensors") in lora_api.lora_discovery._thumbnail_sources
+
+def test_thumbnail_rejects_paths_outside_lora_dir(lora_api, client):
+    add_lora(lora_api, "../outside.safetensors")
+    assert client.get("/api/lora-thumbnail?file=../outside.safetensors").status_code == 404
+
+def write_preview(path: str, color: str):
+    from PIL import Image
+    Image.new("RGB", (32, 32), color=color).save(path, "PNG")
+
+def test_thumbnail_follows_added_and_replaced_previews(lora_api, client):
+    discovery = lora_api.lora_discovery
+    lora_path = add_lora(lora_api, "style.safetensors")
+    placeholder_key, _ = discovery.get_thumbnail_source(lora_path)
+
+    preview = os.path.join(discovery.LORA_DIR, "style.preview.png")
+    write_preview(preview, "red")
+    sidecar_key, sidecar = discovery.get_thumbnail_source(lora_path)
+    assert (sidecar, sidecar_key != placeholder_key) == (preview, True)
+
+    write_preview(preview + ".tmp", "blue")
+    os.utime(preview + ".tmp", ns=(1, 1))
+    os.replace(preview + ".tmp", preview)
+    assert discovery.get_thumbnail_source(lora_path)[0] not in (placeholder_key, sidecar_key)
+
+def test_repeat_thumbnail_requests_are_served_from_memory(lora_api, client, monkeypatch):
+    add_lora(lora_api, "style.safetensors")
+    url = listed_thumbnail(client, "style.safetensors")
+    first = client.get(url)
+
+    def no_render(*args):
+        raise AssertionError("hot cache missed")
+    monkeypatch.setattr(lora_api.lora_discovery, "generate_lora_thumbnail", no_render)
+    second = client.get(url)
+    assert (second.status_code, second.content) == (200, first.content)
+
+def test_tag_endpoints_scan_on_first_use(lora_api, client):
+    path = os.path.join(lora_api.lora_discovery.LORA_DIR, "style.safetensors")
+    write_safetensors(path, {"ss_tag_frequency": '{"img": {"blue_sky": 3, "cloud": 1}}'},
+                      tensor_count=6, payload_bytes=1024, salt=b"lora" * 64)
+
+    assert client.get("/api/lora-tags?prefix=blu").json()["tags"] == [{"tag": "blue sky", "count": 1}]
+    assert client.get("/api/loras/by-tag?tag=cloud").json()["loras"] == [{"filename": "style.safetensors", "weight": 0.25}]
+
+def test_included_router_warm_starts_from_snapshot(lora_api):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    add_lora(lora_api, "style.safetensors")
+    lora_api.lora_discovery.export_catalog_snapshot()
+
+    app = FastAPI()
+    app.include_router(lora_api.router)
+    with TestClient(app):
+        assert lora_api._snapshot_result is not None or lora_api._scan_task.done()
+        assert lora_api._tag_index is not None
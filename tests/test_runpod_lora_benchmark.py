@@ -0,0 +1,21 @@
+"""Per-scan measurements in runpod_lora_benchmark.py"""
+
+import pytest
+
+from runpod_lora_benchmark import peak_rss_mb, reset_peak_rss, timed_scan
+from test_runpod_lora_api import add_lora
+
+def test_scan_peak_rss_excludes_earlier_peaks(lora_api, tmp_path):
+    if not reset_peak_rss():
+        pytest.skip("VmHWM cannot be reset on this kernel")
+    add_lora(lora_api, "style.safetensors")
+
+    # An earlier, larger peak in the same process must not show up as the scan's
+    block = b"\x01" * (256 * 1024 * 1024)
+    del block
+    lifetime_peak = peak_rss_mb()
+
+    _, result = timed_scan(str(tmp_path), lora_api.lora_discovery)
+    assert result["loras"] == 1
+    assert result["peak_rss_mb"] < lifetime_peak - 128
+    assert result["peak_rss_growth_mb"] >= 0
@@ -0,0 +1,122 @@
+"""Hashing and thumbnail keys in runpod-lora-discovery.py"""
+
+import os
+import shutil
+import sqlite3
+import threading
+
+import pytest
+
+from test_runpod_lora_api import add_lora
+
+def test_thumbnail_key_does_not_change_once_hashed(lora_api):
+    discovery = lora_api.lora_discovery
+    lora_path = add_lora(lora_api, "style.safetensors")
+    before, _ = discovery.get_thumbnail_source(lora_path)
+    discovery.hash_lora_file(lora_path)
+    assert discovery.get_thumbnail_source(lora_path)[0] == before
+
+def test_discovery_does_not_wait_for_new_hashes(lora_api, monkeypatch):
+    discovery = lora_api.lora_discovery
+    add_lora(lora_api, "style.safetensors")
+    release = threading.Event()
+    compute_sha256 = discovery.compute_sha256
+
+    def slow_sha256(path):
+        release.wait(30)
+        return compute_sha256(path)
+    monkeypatch.setattr(discovery, "compute_sha256", slow_sha256)
+
+    try:
+        (lora,) = discovery.discover_loras()
+        assert lora["sha256"] is None and lora["thumbnail"]
+    finally:
+        release.set()
+    discovery._hash_pool.shutdown(wait=True)
+    (lora,) = discovery.discover_loras()
+    assert lora["sha256"]
+
+def test_hash_db_connections_are_closed(lora_api, monkeypatch):
+    discovery = lora_api.lora_discovery
+    opened = []
+    hash_db = discovery._hash_db
+
+    def tracking_hash_db():
+        opened.append(hash_db())
+        return opened[-1]
+    monkeypatch.setattr(discovery, "_hash_db", tracking_hash_db)
+
+    discovery.hash_lora_file(add_lora(lora_api, "style.safetensors"))
+    assert len(opened) == 2
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+def export_library(lora_api, count: int = 3) -> str:
+    discovery = lora_api.lora_discovery
+    for index in range(count):
+        lora_path = add_lora(lora_api, f"style_{index}.safetensors", salt=bytes([index + 1]) * 4)
+    with open(lora_path.replace(".safetensors", ".preview.png"), "wb") as f:
+        from PIL import Image
+        Image.new("RGB", (32, 32), color="red").save(f, "PNG")
+    discovery.export_catalog_snapshot()
+    return discovery.LORA_SNAPSHOT_PATH
+
+def test_snapshot_connections_are_closed(lora_api, monkeypatch):
+    discovery = lora_api.lora_discovery
+    export_library(lora_api)
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(discovery.sqlite3, "connect", tracking_connect)
+
+    discovery.export_catalog_snapshot()
+    assert discovery.load_catalog_snapshot()["stale"] == []
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+def test_snapshot_thumbnails_survive_copy_to_another_pod(lora_api, tmp_path):
+    from runpod_lora_benchmark import close_discovery, configure_discovery, load_module
+
+    snapshot_path = export_library(lora_api)
+    other_pod = tmp_path / "other-pod"
+    shutil.copytree(lora_api.lora_discovery.LORA_DIR, other_pod / "loras", copy_function=shutil.copy)
+    for path in (other_pod / "loras").iterdir():
+        os.utime(path, ns=(1, 1))  # A copy gets new mtimes
+
+    discovery = load_module("runpod-lora-discovery.py", "lora_discovery_pod")
+    configure_discovery(discovery, str(other_pod))
+    try:
+        snapshot = discovery.load_catalog_snapshot(snapshot_path)
+        assert (len(snapshot["loras"]), snapshot["stale"]) == (3, [])
+        assert all(lora["sha256"] is None for lora in snapshot["loras"])
+        rendered = set(os.listdir(discovery.THUMBNAIL_CACHE_DIR))
+        for lora in snapshot["loras"]:
+            content_key, _ = discovery.get_thumbnail_source(os.path.join(discovery.LORA_DIR, lora["filename"]))
+            assert os.path.basename(discovery.thumbnail_cache_path(content_key, discovery.THUMBNAIL_SIZE)) in rendered
+    finally:
+        close_discovery(discovery)
+
+def test_eviction_skips_in_progress_temp_files(lora_api, monkeypatch):
+    discovery = lora_api.lora_discovery
+    discovery.ensure_cache_dir()
+    for index in range(4):
+        with open(discovery.thumbnail_cache_path(f"{index:032x}", (64, 64)), "wb") as f:
+            f.write(b"x" * 1000)
+    # Another render thread's file between img.save() and os.replace()
+    in_progress = discovery.thumbnail_cache_path("f" * 32, (64, 64)) + ".1234.tmp"
+    with open(in_progress, "wb") as f:
+        f.write(b"x" * 100_000)
+
+    monkeypatch.setattr(discovery, "THUMBNAIL_CACHE_MAX_BYTES", 2500)
+    monkeypatch.setattr(discovery, "_disk_cache_bytes", None)
+    discovery._account_disk_cache(0)
+
+    assert os.path.exists(in_progress)
+    assert len(discovery._cached_thumbnails()) == 2
+    assert discovery._disk_cache_bytes == 2000